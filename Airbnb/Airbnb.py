@@ -1,23 +1,83 @@
 import pandas as pd
-import json
+import numpy as np
+import glob
+import hashlib
+import os
+import tempfile
 import streamlit as st
 import folium
+from folium.plugins import FastMarkerCluster, HeatMap
 from streamlit_folium import st_folium
 import plotly.express as px
+from listings_reader import iter_listings
+from listings_store import build_store, load_listings
+from location_index import LocationIndex
 
-# Load data from JSON file
+# Listings parsed per DataFrame chunk in load_data and per row group of the listings store
+CHUNK_SIZE = 10_000
+
+# The listings store is written here as Parquet, keyed on the source file
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cache')
+
+# Bump when the store's columns or flattening change, so existing store files are not reused
+STORE_VERSION = 1
+
+# Store columns the app reads; the rest stay on disk
+LISTING_COLUMNS = ['_id', 'name', 'property_type', 'room_type', 'accommodates', 'bedrooms', 'beds', 'bathrooms',
+                   'price', 'cleaning_fee', 'extra_people', 'last_scraped', 'picture_url', 'review_scores_rating',
+                   'country', 'market', 'suburb', 'latitude', 'longitude']
+
+# Most individual markers drawn on the map at once
+MAX_MARKERS = 500
+
+# Most listings shown for a location search
+MAX_MATCHES = 1000
+
+# Zoom levels below which the map aggregates instead of clustering / drawing markers
+GRID_MAX_ZOOM = 8
+CLUSTER_MAX_ZOOM = 13
+
+# Load data from a JSON array or newline-delimited JSON file, streamed in chunks
 def load_data(json_file):
-    with open(json_file, 'r') as f:
-        data = json.load(f)
-    return pd.DataFrame(data)
+    chunks = []
+    chunk = []
+    for listing in iter_listings(json_file):
+        chunk.append(listing)
+        if len(chunk) == CHUNK_SIZE:
+            chunks.append(pd.DataFrame(chunk))
+            chunk = []
+    if chunk or not chunks:
+        chunks.append(pd.DataFrame(chunk))
+    return pd.concat(chunks, ignore_index=True)
+
+# Host fields kept in the host table
+HOST_FIELDS = ['host_id', 'host_name', 'host_since', 'host_response_rate', 'host_is_superhost']
+
+# Nested documents as a list of dicts, {} where the value is missing or not a dict
+def nested_records(series):
+    return [value if isinstance(value, dict) else {} for value in series]
 
 # Clean and preprocess the dataset
 def clean_data(data):
+    """
+    Flatten the nested fields, convert prices and deduplicate listings.
+
+    Nested fields are expanded once with pd.json_normalize instead of
+    building a Series per row, only the columns that actually hold lists or
+    dicts are stringified, and duplicates are found by row hash. The address
+    is additionally split into country/market/suburb and latitude/longitude.
+
+    Returns:
+        tuple: (listings DataFrame, host DataFrame)
+    """
+    data = data.copy()
+
     # Extract nested picture_url
-    data['picture_url'] = data['images'].apply(
-        lambda x: x.get('picture_url') if isinstance(x, dict) else None
-    )
-    data.drop(columns=['images'], inplace=True, errors='ignore')
+    if 'images' in data.columns:
+        images = pd.json_normalize(nested_records(data['images']), max_level=0)
+        picture_url = images['picture_url'] if 'picture_url' in images.columns else pd.Series(None, index=images.index)
+        data = data.drop(columns=['images'])
+        data['picture_url'] = picture_url.astype(object).where(picture_url.notna(), None).to_numpy()
 
     # Convert price fields to numeric
     for col in ['price', 'cleaning_fee', 'extra_people']:
@@ -32,48 +92,223 @@ def clean_data(data):
 
     # Handle nested host details
     if 'host' in data.columns:
-        host_details = data['host'].apply(
-            lambda x: pd.Series(x) if isinstance(x, dict) else pd.Series()
-        )
-        host_fields = ['host_id', 'host_name', 'host_since', 'host_response_rate', 'host_is_superhost']
-        
-        # Ensure only existing columns are selected
-        available_host_fields = [field for field in host_fields if field in host_details.columns]
+        host_details = pd.json_normalize(nested_records(data['host']), max_level=0)
+        host_details.index = data.index
+        available_host_fields = [field for field in HOST_FIELDS if field in host_details.columns]
         host_data = host_details[available_host_fields].drop_duplicates()
-        
+
         # Fill missing fields with None for consistency
-        for field in host_fields:
+        for field in HOST_FIELDS:
             if field not in host_data.columns:
                 host_data[field] = None
     else:
-        host_data = pd.DataFrame(columns=['host_id', 'host_name', 'host_since', 'host_response_rate', 'host_is_superhost'])
+        host_data = pd.DataFrame(columns=HOST_FIELDS)
 
     # Drop host column after processing
-    data.drop(columns=['host'], inplace=True, errors='ignore')
+    data = data.drop(columns=['host'], errors='ignore')
+
+    # Address parts and GeoJSON [longitude, latitude] as plain columns
+    if 'address' in data.columns:
+        address = pd.json_normalize(nested_records(data['address']), max_level=1)
+        for field in ['country', 'market', 'suburb']:
+            data[field] = address[field].to_numpy() if field in address.columns else None
+        coordinates = address['location.coordinates'] if 'location.coordinates' in address.columns else []
+        points = np.array([point if isinstance(point, list) and len(point) == 2 else (np.nan, np.nan)
+                           for point in coordinates], dtype=float).reshape(-1, 2)
+        data['longitude'] = points[:, 0] if len(points) else np.nan
+        data['latitude'] = points[:, 1] if len(points) else np.nan
 
-    # Convert non-hashable data (e.g., lists or dictionaries) to strings before deduplication
-    data = data.applymap(lambda x: str(x) if isinstance(x, (list, dict)) else x)
+    # Convert non-hashable data (lists or dictionaries) to strings, only where a column holds them
+    for col in data.columns[data.dtypes == object]:
+        nested = data[col].map(type).isin([list, dict])
+        if nested.any():
+            data[col] = data[col].where(~nested, data[col][nested].map(str))
 
-    # Remove duplicates
-    data = data.drop_duplicates()
+    # Remove duplicates by row hash
+    data = data[~pd.util.hash_pandas_object(data, index=False).duplicated()]
 
     return data, host_data
 
+# Hash of the source file's path, size and mtime and of STORE_VERSION, used to name the store
+def source_signature(path):
+    stat = os.stat(path)
+    key = f"{os.path.abspath(path)}:{stat.st_size}:{stat.st_mtime_ns}:{STORE_VERSION}"
+    return hashlib.sha1(key.encode()).hexdigest()[:12]
+
+# Listings and hosts from the already flattened store columns
+def clean_listings(data):
+    for col in ['price', 'beds', 'bedrooms', 'bathrooms']:
+        data[col] = data[col].fillna(0)
+    host_data = data[HOST_FIELDS].drop_duplicates(ignore_index=True)
+    return data.drop(columns=HOST_FIELDS[1:]), host_data
+
+# Cleaned listings and hosts, read from the Parquet store, which is built when the source is new or changed
+def load_clean_listings(json_file, cache_dir=CACHE_DIR):
+    """
+    Load a listings export through the on-disk listings store.
+
+    The first start with a source file streams it into a Parquet store, one
+    flattened chunk at a time, so the nested documents are never all in
+    memory. Every start then reads only LISTING_COLUMNS and the host fields
+    from the store. A store is written under a temporary name and renamed
+    when complete, and one that cannot be read is rebuilt. Building a new
+    store removes all others from `cache_dir`.
+
+    Returns:
+        tuple: (listings DataFrame, host DataFrame)
+    """
+    signature = source_signature(json_file)
+    store_path = os.path.join(cache_dir, f'listings_{signature}.parquet')
+    columns = LISTING_COLUMNS + HOST_FIELDS
+    if os.path.exists(store_path):
+        try:
+            return clean_listings(load_listings(store_path, columns=columns))
+        except (OSError, ValueError):
+            # A damaged store is a cache miss: rebuild it below
+            pass
+
+    os.makedirs(cache_dir, exist_ok=True)
+    handle, temp_path = tempfile.mkstemp(dir=cache_dir, suffix='.tmp')
+    os.close(handle)
+    try:
+        build_store(json_file, temp_path, CHUNK_SIZE)
+        os.replace(temp_path, store_path)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+    # Stores for earlier versions of the file, and files left by interrupted builds, are never read again
+    for path in glob.glob(os.path.join(cache_dir, '*.parquet')) + glob.glob(os.path.join(cache_dir, '*.tmp')):
+        if path != store_path:
+            os.remove(path)
+    return clean_listings(load_listings(store_path, columns=columns))
+
+# Cleaned data shared by every rerun and session; the signature argument makes a changed file a new cache entry
+@st.cache_resource(max_entries=2, show_spinner="Loading listings...")
+def get_listings(json_file, signature):
+    return load_clean_listings(json_file)
+
+# Location index over the cached listings, built once per source file
+@st.cache_resource(max_entries=2, show_spinner="Indexing locations...")
+def get_location_index(json_file, signature):
+    data, _ = get_listings(json_file, signature)
+    return LocationIndex.from_frame(data)
+
+# Latitude/longitude/price arrays of the listings that have coordinates
+def map_points(data):
+    if 'latitude' not in data.columns or 'longitude' not in data.columns:
+        return data.iloc[0:0], np.empty(0), np.empty(0)
+    lat = pd.to_numeric(data['latitude'], errors='coerce').to_numpy(dtype=float)
+    lon = pd.to_numeric(data['longitude'], errors='coerce').to_numpy(dtype=float)
+    valid = np.isfinite(lat) & np.isfinite(lon) & (np.abs(lat) <= 90) & (np.abs(lon) <= 180)
+    return data[valid], lat[valid], lon[valid]
+
+# Center and zoom level that fit all the points
+def map_view(lat, lon):
+    if len(lat) == 0:
+        return [0.0, 0.0], 2
+    center = [float(np.median(lat)), float(np.median(lon))]
+    # Ignore the outermost 1% of listings so a few stray coordinates don't zoom out to the whole world
+    lat_lo, lat_hi = np.percentile(lat, [1, 99])
+    lon_lo, lon_hi = np.percentile(lon, [1, 99])
+    extent = max(lat_hi - lat_lo, lon_hi - lon_lo, 1e-3)
+    zoom = int(np.clip(np.floor(np.log2(360 / extent)), 2, 16))
+    return center, zoom
+
+# Map mode for a zoom level: aggregated grid when zoomed out, clusters in between, markers up close
+def map_mode(zoom):
+    if zoom <= GRID_MAX_ZOOM:
+        return 'Grid'
+    if zoom <= CLUSTER_MAX_ZOOM:
+        return 'Clusters'
+    return 'Markers'
+
+# Aggregate points into square grid cells sized for the zoom level
+def grid_aggregate(lat, lon, price, zoom, cells_per_tile=8):
+    """
+    Count listings and average their price per grid cell.
+
+    Cells are 360 / 2**zoom / cells_per_tile degrees wide, so a map tile at
+    the current zoom holds about cells_per_tile x cells_per_tile cells.
+
+    Returns:
+        pd.DataFrame: latitude, longitude (cell centroids), count, mean_price
+    """
+    cell = 360 / 2 ** zoom / cells_per_tile
+    keys = np.column_stack([np.floor(lat / cell), np.floor(lon / cell)]).astype(np.int64)
+    _, cell_ids = np.unique(keys, axis=0, return_inverse=True)
+    cell_ids = cell_ids.ravel()
+    counts = np.bincount(cell_ids)
+    return pd.DataFrame({
+        'latitude': np.bincount(cell_ids, weights=lat) / counts,
+        'longitude': np.bincount(cell_ids, weights=lon) / counts,
+        'count': counts,
+        'mean_price': np.bincount(cell_ids, weights=price) / counts,
+    })
+
+# Points inside the bounds returned by st_folium
+def in_bounds(lat, lon, bounds):
+    if not bounds or not bounds.get('_southWest') or not bounds.get('_northEast'):
+        return np.ones(len(lat), dtype=bool)
+    south, west = bounds['_southWest']['lat'], bounds['_southWest']['lng']
+    north, east = bounds['_northEast']['lat'], bounds['_northEast']['lng']
+    return (lat >= south) & (lat <= north) & (lon >= west) & (lon <= east)
+
 # Generate an interactive map
 def display_map(data):
     st.header("Airbnb Listings Map")
-    map_center = [37.7749, -122.4194]  # Default center (San Francisco)
-    m = folium.Map(location=map_center, zoom_start=12)
+    points, lat, lon = map_points(data)
+    if len(points) == 0:
+        st.warning("Latitude/Longitude data is not available for the map.")
+        return
+
+    # Keep the view the user panned/zoomed to across reruns
+    view = st.session_state.get('map_view', {})
+    center, zoom = map_view(lat, lon)
+    center = view.get('center', center)
+    zoom = view.get('zoom', zoom)
 
-    for _, row in data.iterrows():
-        if 'latitude' in row and 'longitude' in row:
+    mode = st.sidebar.selectbox("Map Mode", ['Auto', 'Grid', 'Clusters', 'Heatmap', 'Markers'])
+    if mode == 'Auto':
+        mode = map_mode(zoom)
+
+    m = folium.Map(location=center, zoom_start=zoom)
+    price = points['price'].to_numpy(dtype=float) if 'price' in points.columns else np.zeros(len(points))
+    if mode == 'Grid':
+        cells = grid_aggregate(lat, lon, price, zoom)
+        radius = 4 + 16 * np.sqrt(cells['count'] / cells['count'].max())
+        for cell, r in zip(cells.itertuples(index=False), radius):
+            folium.CircleMarker(
+                location=[cell.latitude, cell.longitude],
+                radius=float(r),
+                fill=True,
+                fill_opacity=0.6,
+                tooltip=f"{cell.count} listings, avg ${cell.mean_price:.0f}"
+            ).add_to(m)
+    elif mode == 'Clusters':
+        # Clustering happens in the browser from one coordinate array
+        FastMarkerCluster(np.column_stack([lat, lon]).tolist()).add_to(m)
+    elif mode == 'Heatmap':
+        HeatMap(np.column_stack([lat, lon]).tolist(), radius=12).add_to(m)
+    else:
+        visible = np.flatnonzero(in_bounds(lat, lon, view.get('bounds')))
+        if len(visible) > MAX_MARKERS:
+            st.info(f"Showing {MAX_MARKERS} of {len(visible)} listings in view. Zoom in to see the rest.")
+            visible = visible[:MAX_MARKERS]
+        names = points['name'].astype(str).to_numpy() if 'name' in points.columns else np.full(len(points), '')
+        for i in visible:
             folium.Marker(
-                location=[row['latitude'], row['longitude']],
-                popup=f"Name: {row['name']}\nPrice: ${row['price']}",
-                tooltip=row['name']
+                location=[lat[i], lon[i]],
+                popup=f"Name: {names[i]}\nPrice: ${price[i]}",
+                tooltip=names[i]
             ).add_to(m)
 
-    st_folium(m, width=700, height=500)
+    state = st_folium(m, width=700, height=500, key='listings_map')
+    if state and state.get('zoom') is not None and state.get('center'):
+        st.session_state['map_view'] = {
+            'center': [state['center']['lat'], state['center']['lng']],
+            'zoom': state['zoom'],
+            'bounds': state.get('bounds'),
+        }
 
 # Perform price analysis
 def price_analysis(data):
@@ -89,21 +324,39 @@ def price_analysis(data):
 def seasonal_availability(data):
     st.header("Seasonal Availability")
     if 'last_scraped' in data.columns:
-        data['last_scraped'] = pd.to_datetime(data['last_scraped'], errors='coerce')
-        availability_by_month = data.groupby(data['last_scraped'].dt.month).size().reset_index(name='count')
+        # Parsed into a local series: the cached listings are shared between reruns and must not be modified
+        last_scraped = pd.to_datetime(data['last_scraped'], errors='coerce', utc=True)
+        availability_by_month = last_scraped.groupby(last_scraped.dt.month).size().reset_index(name='count')
         fig = px.line(availability_by_month, x='last_scraped', y='count', title="Availability Over Time")
         st.plotly_chart(fig)
     else:
         st.warning("Last Scraped data is not available for analysis.")
 
 # Display location-based insights
-def location_insights(data):
+def location_insights(data, index):
     st.header("Location-Based Insights")
-    if 'address' in data.columns:
+    if any(field in data.columns for field in ['country', 'market', 'suburb']):
         region = st.text_input("Enter a region or city (e.g., San Francisco):")
         if region:
-            location_data = data[data['address'].str.contains(region, na=False, case=False)]
+            # Matches country/market/suburb words through the index; the last word may be partial
+            matches = index.count(region)
+            location_data = data.iloc[index.search(region, limit=MAX_MATCHES)]
+            if matches > MAX_MATCHES:
+                st.write(f"{matches} listings match \"{region}\", showing the first {MAX_MATCHES}")
+            else:
+                st.write(f"{matches} listings match \"{region}\"")
             st.dataframe(location_data)
+
+            radius = st.slider("Also show listings within (km) of the matches", min_value=0, max_value=50, value=0)
+            if radius and matches:
+                rows = index.search(region)
+                lat = np.nanmedian(index.lat[rows])
+                lon = np.nanmedian(index.lon[rows])
+                if np.isfinite(lat) and np.isfinite(lon):
+                    nearby, distances = index.within(lat, lon, radius)
+                    nearby_data = data.iloc[nearby].assign(distance_km=distances.round(2))
+                    st.write(f"{len(nearby_data)} listings within {radius} km of the center of the matches")
+                    st.dataframe(nearby_data)
     else:
         st.warning("Address data is not available for analysis.")
 
@@ -112,12 +365,11 @@ def main():
     st.title("Airbnb Analysis Dashboard")
     st.sidebar.header("Filters")
 
-    # Step 1: Load Data
+    # Step 1-2: Load and Clean Data (cached across reruns and restarts)
     json_file_path = "J:\\Studies\\GUVI\\projects\\capstone\\Airbnb\\sample_airbnb.json"
-    data = load_data(json_file_path)
-
-    # Step 2: Clean Data
-    data, host_data = clean_data(data)
+    signature = source_signature(json_file_path)
+    data, host_data = get_listings(json_file_path, signature)
+    location_index = get_location_index(json_file_path, signature)
 
     # Step 3: Sidebar Filters
     if 'price' in data.columns:
@@ -131,7 +383,7 @@ def main():
     display_map(filtered_data)
     price_analysis(data)
     seasonal_availability(data)
-    location_insights(data)
+    location_insights(data, location_index)
 
     # Step 5: Display Host Details (Optional)
     st.header("Host Details")
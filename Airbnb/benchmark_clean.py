@@ -0,0 +1,200 @@
+import pandas as pd
+import numpy as np
+import argparse
+import json
+import multiprocessing
+import os
+import shutil
+import tempfile
+import time
+
+from Airbnb import load_data, clean_data, load_clean_listings
+
+# clean_data as it was before it was vectorized, kept as the reference implementation
+def legacy_clean_data(data):
+    data['picture_url'] = data['images'].apply(
+        lambda x: x.get('picture_url') if isinstance(x, dict) else None
+    )
+    data.drop(columns=['images'], inplace=True, errors='ignore')
+
+    for col in ['price', 'cleaning_fee', 'extra_people']:
+        if col in data.columns:
+            data[col] = data[col].replace('[\$,]', '', regex=True).astype(float, errors='ignore')
+
+    numeric_cols = ['price', 'beds', 'bedrooms', 'bathrooms']
+    for col in numeric_cols:
+        if col in data.columns:
+            data[col] = data[col].fillna(0)
+
+    if 'host' in data.columns:
+        host_details = data['host'].apply(
+            lambda x: pd.Series(x) if isinstance(x, dict) else pd.Series()
+        )
+        host_fields = ['host_id', 'host_name', 'host_since', 'host_response_rate', 'host_is_superhost']
+        available_host_fields = [field for field in host_fields if field in host_details.columns]
+        host_data = host_details[available_host_fields].drop_duplicates()
+        for field in host_fields:
+            if field not in host_data.columns:
+                host_data[field] = None
+    else:
+        host_data = pd.DataFrame(columns=['host_id', 'host_name', 'host_since', 'host_response_rate', 'host_is_superhost'])
+
+    data.drop(columns=['host'], inplace=True, errors='ignore')
+    data = data.applymap(lambda x: str(x) if isinstance(x, (list, dict)) else x)
+    data = data.drop_duplicates()
+    return data, host_data
+
+def synthetic_listings(n, duplicate_fraction=0.05, seed=42):
+    """
+    Listings shaped like sample_airbnb.json, with some exact duplicates,
+    listings without images and hosts shared between listings.
+    """
+    rng = np.random.default_rng(seed)
+    markets = ['New York', 'Istanbul', 'Sydney', 'Porto', 'Hong Kong', 'Barcelona', 'Montreal', 'Rio De Janeiro']
+    countries = ['United States', 'Turkey', 'Australia', 'Portugal', 'Hong Kong', 'Spain', 'Canada', 'Brazil']
+    property_types = ['Apartment', 'House', 'Condominium', 'Loft', 'Guesthouse']
+    n_hosts = max(1, n // 3)
+    listings = []
+    for i in range(n):
+        m = int(rng.integers(0, len(markets)))
+        host = int(rng.integers(0, n_hosts))
+        listing = {
+            '_id': str(10_000_000 + i),
+            'listing_url': f'https://www.airbnb.com/rooms/{10_000_000 + i}',
+            'name': f'Listing {i}',
+            'property_type': property_types[int(rng.integers(0, len(property_types)))],
+            'room_type': 'Entire home/apt' if rng.random() < 0.6 else 'Private room',
+            'minimum_nights': int(rng.integers(1, 30)),
+            'last_scraped': f'2019-{int(rng.integers(1, 13)):02d}-{int(rng.integers(1, 28)):02d}T05:00:00.000Z',
+            'accommodates': int(rng.integers(1, 10)),
+            'bedrooms': float(rng.integers(0, 5)) if rng.random() > 0.01 else None,
+            'beds': float(rng.integers(1, 6)) if rng.random() > 0.01 else None,
+            'bathrooms': float(rng.integers(1, 4)),
+            'price': float(rng.integers(20, 1000)),
+            'cleaning_fee': float(rng.integers(0, 200)) if rng.random() > 0.3 else None,
+            'extra_people': float(rng.integers(0, 50)),
+            'amenities': ['Wifi', 'Kitchen', 'Heating'][:int(rng.integers(0, 4))],
+            'images': {'picture_url': f'https://a0.muscache.com/im/{i}.jpg', 'thumbnail_url': ''}
+            if rng.random() > 0.1 else None,
+            'host': {
+                'host_id': str(host),
+                'host_name': f'Host {host}',
+                'host_since': '2015-06-01T04:00:00.000Z',
+                'host_is_superhost': bool(host % 4 == 0),
+                'host_verifications': ['email', 'phone'],
+            },
+            'address': {
+                'street': f'{markets[m]}, {countries[m]}',
+                'suburb': f'Suburb {int(rng.integers(0, 20))}',
+                'market': markets[m],
+                'country': countries[m],
+                'location': {
+                    'type': 'Point',
+                    'coordinates': [float(rng.uniform(-180, 180)), float(rng.uniform(-60, 60))],
+                    'is_location_exact': bool(rng.random() < 0.5),
+                },
+            },
+            'review_scores': {'review_scores_rating': int(rng.integers(60, 101))},
+        }
+        listings.append(listing)
+    # Exact copies of random listings, as duplicated exports produce
+    for i in rng.integers(0, n, int(n * duplicate_fraction)):
+        listings.append(json.loads(json.dumps(listings[i])))
+    return listings
+
+def check_equivalent(data):
+    """Run both implementations on copies of `data`, assert equal output and return the timings."""
+    start = time.perf_counter()
+    expected, expected_hosts = legacy_clean_data(data.copy())
+    legacy_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    actual, actual_hosts = clean_data(data)
+    vectorized_s = time.perf_counter() - start
+
+    # The vectorized version adds address columns after the ones the legacy version returns
+    pd.testing.assert_frame_equal(actual[expected.columns], expected, check_dtype=False)
+    pd.testing.assert_frame_equal(actual_hosts, expected_hosts, check_dtype=False)
+    return legacy_s, vectorized_s
+
+# Ways to load a listings file whose peak memory --memory compares
+LOADERS = {
+    'json.load + DataFrame': lambda path, cache_dir: pd.DataFrame(json.load(open(path))),
+    'load_data + clean_data': lambda path, cache_dir: clean_data(load_data(path)),
+    'listings store, first start': lambda path, cache_dir: load_clean_listings(path, cache_dir),
+    'listings store, later starts': lambda path, cache_dir: load_clean_listings(path, cache_dir),
+}
+
+def _max_rss_mb():
+    # VmHWM starts over when a process execs; ru_maxrss keeps the peak of the process that started it
+    if os.path.exists('/proc/self/status'):
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) / 1024
+    import resource
+    # ru_maxrss is in bytes on macOS and in kilobytes elsewhere
+    unit = 1 if os.uname().sysname == 'Darwin' else 1024
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * unit / 2 ** 20
+
+def _peak_rss(name, path, cache_dir, queue):
+    before = _max_rss_mb()
+    LOADERS[name](path, cache_dir)
+    queue.put((before, _max_rss_mb()))
+
+def peak_memory(path):
+    """
+    Peak resident memory of each loader, each run in a fresh process.
+
+    Needs Linux or another Unix system. The store loaders run in
+    LOADERS order against one temporary cache directory, so the second one
+    reads the store the first one built.
+
+    Returns:
+        dict: loader name -> (peak MB, MB above the process after imports)
+    """
+    context = multiprocessing.get_context('spawn')
+    cache_dir = tempfile.mkdtemp()
+    results = {}
+    try:
+        for name in LOADERS:
+            queue = context.Queue()
+            process = context.Process(target=_peak_rss, args=(name, path, cache_dir, queue))
+            process.start()
+            before, after = queue.get()
+            process.join()
+            results[name] = (after, after - before)
+    finally:
+        shutil.rmtree(cache_dir)
+    return results
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Compare the vectorized clean_data with the original.")
+    parser.add_argument('--rows', type=int, default=100_000, help="Synthetic listings to generate")
+    parser.add_argument('--json', help="Use an existing listings file instead of synthetic data")
+    parser.add_argument('--memory', action='store_true',
+                        help="Also compare the peak memory of loading the file with json.load and with the listings store")
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+    path = args.json
+    if path is None:
+        handle, path = tempfile.mkstemp(suffix='.json')
+        with os.fdopen(handle, 'w') as f:
+            json.dump(synthetic_listings(args.rows), f)
+    try:
+        data = load_data(path)
+        legacy_s, vectorized_s = check_equivalent(data)
+        memory = peak_memory(path) if args.memory else {}
+    finally:
+        if args.json is None:
+            os.remove(path)
+    print(f"{len(data)} listings: outputs are identical")
+    print(f"legacy clean_data:     {legacy_s:8.2f}s")
+    print(f"vectorized clean_data: {vectorized_s:8.2f}s ({legacy_s / vectorized_s:.1f}x faster)")
+    for name, (peak_mb, loaded_mb) in memory.items():
+        print(f"{name:30} peak RSS {peak_mb:7.0f} MB ({loaded_mb:+.0f} MB over imports)")
+
+if __name__ == "__main__":
+    main()
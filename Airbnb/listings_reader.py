@@ -0,0 +1,70 @@
+import json
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+# Largest amount of unparsed text held while waiting for one array element to complete
+MAX_ELEMENT_SIZE = 64 << 20
+
+def _iter_array(f, buffer_size=1 << 16, max_element_size=MAX_ELEMENT_SIZE):
+    """
+    Yield the elements of a top-level JSON array without parsing it all at once.
+
+    Raises ValueError when one element is still incomplete after
+    `max_element_size` characters, so a malformed file fails early instead of
+    being read into memory up to its end.
+    """
+    decoder = json.JSONDecoder()
+    buffer = f.read(buffer_size).lstrip()
+    if not buffer.startswith('['):
+        raise ValueError("Expected a JSON array of listings")
+    pos = 1
+    while True:
+        while pos < len(buffer) and buffer[pos] in ' \t\r\n,':
+            pos += 1
+        if pos < len(buffer) and buffer[pos] == ']':
+            return
+        try:
+            if pos >= len(buffer):
+                raise ValueError
+            listing, end = decoder.raw_decode(buffer, pos)
+        except ValueError:
+            # The next element is not complete yet: read more
+            if len(buffer) - pos > max_element_size:
+                raise ValueError(f"Malformed JSON array: an element is not complete "
+                                 f"after {max_element_size:,} characters")
+            chunk = f.read(buffer_size)
+            if not chunk:
+                raise ValueError("Unexpected end of JSON array")
+            buffer = buffer[pos:] + chunk
+            pos = 0
+            continue
+        yield listing
+        pos = end
+        if pos > buffer_size:
+            buffer = buffer[pos:]
+            pos = 0
+
+def iter_listings(path):
+    """
+    Yield listing documents one at a time.
+
+    Handles a JSON array (streamed with ijson when installed, otherwise with
+    an incremental decoder) and newline-delimited JSON.
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        first = f.read(1)
+        while first and first.isspace():
+            first = f.read(1)
+        f.seek(0)
+        if first == '[':
+            if ijson is not None:
+                yield from ijson.items(f, 'item', use_float=True)
+            else:
+                yield from _iter_array(f)
+        else:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
@@ -0,0 +1,182 @@
+import pandas as pd
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+import argparse
+import json
+import time
+
+from listings_reader import iter_listings
+
+# Flattened listing columns: name -> (path in the listing document, type)
+FIELDS = {
+    '_id': (('_id',), 'str'),
+    'listing_url': (('listing_url',), 'str'),
+    'name': (('name',), 'str'),
+    'property_type': (('property_type',), 'str'),
+    'room_type': (('room_type',), 'str'),
+    'bed_type': (('bed_type',), 'str'),
+    'minimum_nights': (('minimum_nights',), 'int'),
+    'maximum_nights': (('maximum_nights',), 'int'),
+    'cancellation_policy': (('cancellation_policy',), 'str'),
+    'last_scraped': (('last_scraped',), 'date'),
+    'calendar_last_scraped': (('calendar_last_scraped',), 'date'),
+    'first_review': (('first_review',), 'date'),
+    'last_review': (('last_review',), 'date'),
+    'accommodates': (('accommodates',), 'int'),
+    'bedrooms': (('bedrooms',), 'float'),
+    'beds': (('beds',), 'float'),
+    'bathrooms': (('bathrooms',), 'float'),
+    'number_of_reviews': (('number_of_reviews',), 'int'),
+    'price': (('price',), 'float'),
+    'security_deposit': (('security_deposit',), 'float'),
+    'cleaning_fee': (('cleaning_fee',), 'float'),
+    'extra_people': (('extra_people',), 'float'),
+    'guests_included': (('guests_included',), 'int'),
+    'amenities': (('amenities',), 'json'),
+    'picture_url': (('images', 'picture_url'), 'str'),
+    'host_id': (('host', 'host_id'), 'str'),
+    'host_name': (('host', 'host_name'), 'str'),
+    'host_since': (('host', 'host_since'), 'date'),
+    'host_response_rate': (('host', 'host_response_rate'), 'float'),
+    'host_is_superhost': (('host', 'host_is_superhost'), 'bool'),
+    'street': (('address', 'street'), 'str'),
+    'suburb': (('address', 'suburb'), 'str'),
+    'government_area': (('address', 'government_area'), 'str'),
+    'market': (('address', 'market'), 'str'),
+    'country': (('address', 'country'), 'str'),
+    'country_code': (('address', 'country_code'), 'str'),
+    # GeoJSON point: [longitude, latitude]
+    'longitude': (('address', 'location', 'coordinates', 0), 'float'),
+    'latitude': (('address', 'location', 'coordinates', 1), 'float'),
+    'availability_30': (('availability', 'availability_30'), 'int'),
+    'availability_365': (('availability', 'availability_365'), 'int'),
+    'review_scores_rating': (('review_scores', 'review_scores_rating'), 'float'),
+}
+
+ARROW_TYPES = {
+    'str': pa.string(),
+    'int': pa.int64(),
+    'float': pa.float64(),
+    'date': pa.timestamp('ns', tz='UTC'),
+    'bool': pa.bool_(),
+    'json': pa.string(),
+}
+# Each listing also stores a hash of its flattened fields, used to drop exact duplicates on load
+SCHEMA = pa.schema([(name, ARROW_TYPES[kind]) for name, (_, kind) in FIELDS.items()] + [('row_hash', pa.uint64())])
+
+# MongoDB extended JSON wrappers, e.g. {"$numberDecimal": "80.00"}
+EXTENDED_JSON_KEYS = ('$numberDecimal', '$numberDouble', '$numberInt', '$numberLong', '$date', '$oid')
+
+def _unwrap(value):
+    while isinstance(value, dict) and len(value) == 1:
+        key = next(iter(value))
+        if key not in EXTENDED_JSON_KEYS:
+            break
+        value = value[key]
+    return value
+
+def _get(document, path):
+    """Value at a key/index path of a listing, None when any step is missing."""
+    value = document
+    for step in path:
+        value = _unwrap(value)
+        try:
+            value = value[step]
+        except (KeyError, IndexError, TypeError):
+            return None
+    return _unwrap(value)
+
+def _chunks(iterable, size):
+    chunk = []
+    for item in iterable:
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+def flatten(listings):
+    """
+    Flatten a chunk of listing documents into typed columns.
+
+    Args:
+        listings: list of listing dicts
+
+    Returns:
+        pd.DataFrame: one column per entry of FIELDS, plus row_hash
+    """
+    columns = {}
+    for name, (path, kind) in FIELDS.items():
+        values = pd.Series([_get(listing, path) for listing in listings], dtype=object)
+        if kind == 'str':
+            columns[name] = values.where(values.isna(), values.astype(str))
+        elif kind in ('int', 'float'):
+            # Prices may arrive as "$1,234.00"
+            cleaned = values.astype(str).str.replace(r'[\$,%]', '', regex=True).where(values.notna())
+            numbers = pd.to_numeric(cleaned, errors='coerce')
+            columns[name] = numbers.round().astype('Int64') if kind == 'int' else numbers.astype(np.float64)
+        elif kind == 'date':
+            numeric = pd.to_numeric(values, errors='coerce')
+            dates = pd.to_datetime(values.where(numeric.isna()), errors='coerce', utc=True)
+            columns[name] = dates.fillna(pd.to_datetime(numeric, unit='ms', errors='coerce', utc=True))
+        elif kind == 'bool':
+            columns[name] = values.map({True: True, False: False, 't': True, 'f': False,
+                                        'true': True, 'false': False}).astype('boolean')
+        else:
+            columns[name] = values.map(lambda value: None if value is None else json.dumps(value))
+    frame = pd.DataFrame(columns)
+    frame['row_hash'] = pd.util.hash_pandas_object(frame, index=False).to_numpy()
+    return frame
+
+def build_store(source, store_path, chunksize=10_000):
+    """
+    Stream a listings export into a Parquet file, one row group per chunk.
+
+    Only one chunk of documents is held in memory at a time: each chunk is
+    flattened, written and dropped before the next one is parsed.
+
+    Args:
+        source: JSON array or newline-delimited JSON file
+        store_path: Parquet file to write
+        chunksize: listings per chunk / row group
+
+    Returns:
+        int: number of listings written
+    """
+    rows = 0
+    with pq.ParquetWriter(store_path, SCHEMA) as writer:
+        for chunk in _chunks(iter_listings(source), chunksize):
+            table = pa.Table.from_pandas(flatten(chunk), schema=SCHEMA, preserve_index=False)
+            writer.write_table(table)
+            rows += len(chunk)
+    return rows
+
+def load_listings(store_path, columns=None):
+    """
+    Read listings from the Parquet store, optionally only some columns.
+
+    Exact duplicate listings, as repeated exports contain, are dropped by
+    their row_hash, so only the requested columns need to be read.
+    """
+    read = None if columns is None else list(columns) + ['row_hash']
+    data = pd.read_parquet(store_path, columns=read)
+    data = data[~data['row_hash'].duplicated()]
+    return data.drop(columns='row_hash').reset_index(drop=True)
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Stream an Airbnb listings export into a Parquet store.")
+    parser.add_argument('source', help="JSON array or newline-delimited JSON file")
+    parser.add_argument('--store', default='listings.parquet', help="Parquet file to write")
+    parser.add_argument('--chunksize', type=int, default=10_000, help="Listings per chunk")
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+    start = time.perf_counter()
+    rows = build_store(args.source, args.store, args.chunksize)
+    print(f"Wrote {rows} listings to {args.store} in {time.perf_counter() - start:.1f}s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,310 @@
+import pandas as pd
+import numpy as np
+import argparse
+import bisect
+import re
+import time
+
+# Address columns searched by text, as split out of `address` by clean_data
+LOCATION_FIELDS = ['country', 'market', 'suburb']
+
+# Prefixes up to this many characters have their matching rows precomputed
+PREFIX_LENGTH = 3
+
+# Tokens and prefixes matching at least this share of rows also get a bitmap, which
+# costs no more memory than their row list
+BITMAP_MIN_FRACTION = 1 / 64
+
+# Spatial grid cell size in degrees (about 1.1 km of latitude)
+CELL_DEG = 0.01
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEG = np.pi * EARTH_RADIUS_KM / 180
+
+TOKEN_PATTERN = re.compile(r'\w+')
+
+# Set bits per byte value, for counting bits without np.bitwise_count (NumPy < 2.0)
+POPCOUNT = np.unpackbits(np.arange(256, dtype=np.uint8)[:, None], axis=1).sum(axis=1)
+
+def tokenize(text):
+    return TOKEN_PATTERN.findall(str(text).lower())
+
+def popcount(words):
+    """Set bits of each uint64 word."""
+    if hasattr(np, 'bitwise_count'):
+        return np.bitwise_count(words)
+    return POPCOUNT[words.view(np.uint8).reshape(-1, 8)].sum(axis=1)
+
+def haversine_km(lat, lon, lats, lons):
+    """Great-circle distance in km from one point to arrays of points."""
+    lat, lon, lats, lons = map(np.radians, (lat, lon, lats, lons))
+    a = np.sin((lats - lat) / 2) ** 2 + np.cos(lat) * np.cos(lats) * np.sin((lons - lon) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+class LocationIndex:
+    """
+    Text and radius search over listing locations, built once at load.
+
+    Text: every token of the country, market and suburb values maps to the
+    sorted row positions that contain it. Tokens are also kept in a sorted
+    list so the last, possibly unfinished, word of a query matches by prefix
+    with bisect. Prefixes of up to PREFIX_LENGTH characters match many
+    tokens, so their merged rows are computed at build time instead. A query
+    returns the rows that match all of its words. Tokens and prefixes that
+    match many rows also keep a packed bitmap, so intersecting them is a
+    bitwise AND, and a short list is checked against them by bit tests.
+    Listing every row of a large match costs more than finding it, so
+    `search` can stop after `limit` rows and `count` counts set bits.
+
+    Radius: listings are bucketed into CELL_DEG grid cells, with rows sorted
+    by cell key. A radius query reads the cells overlapping the circle with
+    one searchsorted per grid row, then filters those candidates by exact
+    distance.
+    """
+
+    def __init__(self, locations, lat, lon, cell_deg=CELL_DEG):
+        self.n_rows = len(lat)
+        self._build_tokens(locations)
+        self._build_grid(np.asarray(lat, dtype=float), np.asarray(lon, dtype=float), cell_deg)
+
+    @classmethod
+    def from_frame(cls, data):
+        """Index the location columns of cleaned listings; missing columns index as empty."""
+        locations = [data[field].to_numpy(dtype=object) if field in data.columns else np.full(len(data), None)
+                     for field in LOCATION_FIELDS]
+        lat = pd.to_numeric(data['latitude'], errors='coerce') if 'latitude' in data.columns else np.full(len(data), np.nan)
+        lon = pd.to_numeric(data['longitude'], errors='coerce') if 'longitude' in data.columns else np.full(len(data), np.nan)
+        return cls(locations, lat, lon)
+
+    def _build_tokens(self, locations):
+        postings = {}
+        for values in locations:
+            # Tokenize each distinct value once, not once per listing
+            codes, uniques = pd.factorize(pd.Series(values, dtype=object))
+            order = np.argsort(codes, kind='stable')
+            bounds = np.searchsorted(codes[order], np.arange(len(uniques) + 1))
+            for code, value in enumerate(uniques):
+                rows = order[bounds[code]:bounds[code + 1]]
+                for token in set(tokenize(value)):
+                    postings.setdefault(token, []).append(rows)
+        self.postings = {token: np.unique(np.concatenate(rows)) for token, rows in postings.items()}
+        self.tokens = sorted(self.postings)
+        groups = {}
+        for token in self.tokens:
+            for length in range(1, min(len(token), PREFIX_LENGTH) + 1):
+                groups.setdefault(token[:length], []).append(self.postings[token])
+        self.prefix_postings = {prefix: rows[0] if len(rows) == 1 else np.unique(np.concatenate(rows))
+                                for prefix, rows in groups.items()}
+        min_rows = max(1, int(self.n_rows * BITMAP_MIN_FRACTION))
+        self.token_bitmaps = {token: self._bitmap(rows) for token, rows in self.postings.items() if len(rows) >= min_rows}
+        self.prefix_bitmaps = {prefix: self._bitmap(rows) for prefix, rows in self.prefix_postings.items()
+                               if len(rows) >= min_rows}
+
+    def _bitmap(self, rows):
+        # Padded to whole 64-bit words, so search can skip empty words
+        mask = np.zeros(-(-self.n_rows // 64) * 64, dtype=bool)
+        mask[rows] = True
+        return np.packbits(mask, bitorder='little')
+
+    def _build_grid(self, lat, lon, cell_deg):
+        self.lat, self.lon, self.cell_deg = lat, lon, cell_deg
+        self.n_lon_cells = int(np.ceil(360 / cell_deg)) + 1
+        valid = np.flatnonzero(np.isfinite(lat) & np.isfinite(lon))
+        keys = self._cell_lat(lat[valid]) * self.n_lon_cells + self._cell_lon(lon[valid])
+        order = np.argsort(keys, kind='stable')
+        self.cell_keys = keys[order]
+        self.cell_rows = valid[order]
+
+    def _cell_lat(self, lat):
+        return np.floor((np.asarray(lat) + 90) / self.cell_deg).astype(np.int64)
+
+    def _cell_lon(self, lon):
+        return np.floor((np.asarray(lon) + 180) / self.cell_deg).astype(np.int64)
+
+    def _prefix_term(self, prefix):
+        """Rows of the tokens starting with `prefix`, and their bitmap or None."""
+        if len(prefix) <= PREFIX_LENGTH:
+            return self.prefix_postings.get(prefix, np.empty(0, dtype=np.int64)), self.prefix_bitmaps.get(prefix)
+        start = bisect.bisect_left(self.tokens, prefix)
+        end = bisect.bisect_left(self.tokens, prefix + '\uffff', start)
+        if end - start == 1:
+            token = self.tokens[start]
+            return self.postings[token], self.token_bitmaps.get(token)
+        if start == end:
+            return np.empty(0, dtype=np.int64), None
+        return np.unique(np.concatenate([self.postings[token] for token in self.tokens[start:end]])), None
+
+    def prefix(self, prefix):
+        """Row positions whose location has a token starting with `prefix`."""
+        return self._prefix_term(prefix)[0]
+
+    def _match(self, query):
+        """
+        Rows matching every word of `query`.
+
+        Returns:
+            tuple: (sorted row positions, None), or (None, bitmap) when every
+                word has a bitmap
+        """
+        words = tokenize(query)
+        if not words:
+            return np.empty(0, dtype=np.int64), None
+        # (rows, bitmap or None) per word
+        terms = [(self.postings.get(word, np.empty(0, dtype=np.int64)), self.token_bitmaps.get(word))
+                 for word in words[:-1]]
+        terms.append(self._prefix_term(words[-1]))
+        terms.sort(key=lambda term: len(term[0]))
+
+        if all(bits is not None for _, bits in terms):
+            bits = terms[0][1]
+            for _, other in terms[1:]:
+                bits = bits & other
+            return None, bits
+
+        # Not every word has a bitmap: filter the smallest list by the others
+        rows = terms[0][0]
+        for other, bits in terms[1:]:
+            if len(rows) == 0:
+                break
+            if bits is not None:
+                rows = rows[(bits[rows >> 3] >> (rows & 7)) & 1 == 1]
+            else:
+                # Look the smaller list up in the larger one instead of sorting both together
+                found = np.minimum(np.searchsorted(other, rows), len(other) - 1)
+                rows = rows[other[found] == rows]
+        return rows, None
+
+    def search(self, query, limit=None):
+        """
+        Row positions matching every word of `query`.
+
+        All words but the last must match a token exactly, and the last
+        matches by prefix, so "san fr" finds San Francisco.
+
+        Args:
+            query: free text
+            limit: return only the first `limit` matching rows
+
+        Returns:
+            np.ndarray: sorted row positions
+        """
+        rows, bits = self._match(query)
+        if bits is None:
+            return rows[:limit]
+        if limit is None:
+            return np.flatnonzero(np.unpackbits(bits, count=self.n_rows, bitorder='little'))
+        # Unpack only the first non-empty 64-bit words that hold `limit` matches
+        words = np.flatnonzero(bits.view(np.uint64))[:limit]
+        words = words[:np.searchsorted(np.cumsum(popcount(bits.view(np.uint64)[words])), limit) + 1]
+        word_bits = np.unpackbits(bits.reshape(-1, 8)[words], axis=1, bitorder='little')
+        return (words[:, None] * 64 + np.arange(64))[word_bits == 1][:limit]
+
+    def count(self, query):
+        """Number of rows matching `query`, see `search`."""
+        rows, bits = self._match(query)
+        return len(rows) if bits is None else int(popcount(bits.view(np.uint64)).sum())
+
+    def within(self, lat, lon, radius_km):
+        """
+        Listings within `radius_km` of a point.
+
+        Returns:
+            tuple: (row positions, distances in km), nearest first
+        """
+        lat_span = radius_km / KM_PER_DEG
+        lon_span = radius_km / (KM_PER_DEG * max(np.cos(np.radians(lat)), 1e-6))
+        lat_cells = np.arange(self._cell_lat(max(lat - lat_span, -90)), self._cell_lat(min(lat + lat_span, 90)) + 1)
+        # The box is clipped at the antimeridian rather than wrapped around it
+        lon_lo = self._cell_lon(max(lon - lon_span, -180))
+        lon_hi = self._cell_lon(min(lon + lon_span, 180))
+        starts = np.searchsorted(self.cell_keys, lat_cells * self.n_lon_cells + lon_lo, side='left')
+        ends = np.searchsorted(self.cell_keys, lat_cells * self.n_lon_cells + lon_hi, side='right')
+        if not np.any(ends > starts):
+            return np.empty(0, dtype=np.int64), np.empty(0)
+        candidates = np.concatenate([self.cell_rows[s:e] for s, e in zip(starts, ends) if e > s])
+        distances = haversine_km(lat, lon, self.lat[candidates], self.lon[candidates])
+        inside = distances <= radius_km
+        order = np.argsort(distances[inside], kind='stable')
+        return candidates[inside][order], distances[inside][order]
+
+def synthetic_locations(n, seed=42):
+    """Random listings with location columns, for benchmarking."""
+    rng = np.random.default_rng(seed)
+    markets = np.array(['New York', 'Istanbul', 'Sydney', 'Porto', 'Hong Kong', 'Barcelona', 'Montreal',
+                        'Rio De Janeiro', 'Oahu', 'Maui', 'The Big Island', 'Kauai'])
+    countries = np.array(['United States', 'Turkey', 'Australia', 'Portugal', 'Hong Kong', 'Spain', 'Canada',
+                          'Brazil', 'United States', 'United States', 'United States', 'United States'])
+    centers = np.array([[40.7, -74.0], [41.0, 29.0], [-33.9, 151.2], [41.1, -8.6], [22.3, 114.2], [41.4, 2.2],
+                        [45.5, -73.6], [-22.9, -43.2], [21.5, -158.0], [20.8, -156.3], [19.6, -155.5], [22.1, -159.5]])
+    m = rng.integers(0, len(markets), n)
+    suburb = np.char.add('Suburb ', rng.integers(0, 200, n).astype(str))
+    return pd.DataFrame({
+        'name': np.char.add('Listing ', np.arange(n).astype(str)),
+        'country': countries[m],
+        'market': markets[m],
+        'suburb': np.char.add(np.char.add(markets[m], ' '), suburb),
+        'latitude': centers[m, 0] + rng.normal(0, 0.1, n),
+        'longitude': centers[m, 1] + rng.normal(0, 0.1, n),
+    })
+
+def benchmark(n=1_000_000, queries=('new york', 'united st', 'porto', 'rio de', 'oahu suburb 1', 'suburb 1'),
+              repeats=20, limit=1000):
+    """
+    Time index build, text search and radius search against a str.contains scan.
+
+    Text search is timed returning the first `limit` rows, counting all
+    matches, and returning every matching row.
+
+    Returns:
+        dict: timings in milliseconds
+    """
+    data = synthetic_locations(n)
+    start = time.perf_counter()
+    index = LocationIndex.from_frame(data)
+    results = {'rows': n, 'build_ms': (time.perf_counter() - start) * 1000}
+
+    address = data['country'] + ', ' + data['market'] + ', ' + data['suburb']
+    start = time.perf_counter()
+    for query in queries:
+        address.str.contains(query, case=False, regex=False)
+    results['scan_ms'] = (time.perf_counter() - start) / len(queries) * 1000
+
+    for key, run in [('search_ms', lambda query: index.search(query, limit=limit)),
+                     ('count_ms', index.count),
+                     ('search_all_ms', index.search)]:
+        times = []
+        for query in queries:
+            start = time.perf_counter()
+            for _ in range(repeats):
+                run(query)
+            times.append((time.perf_counter() - start) / repeats * 1000)
+        results[key] = np.mean(times)
+        results[key.replace('_ms', '_max_ms')] = np.max(times)
+    results['limit'] = limit
+
+    start = time.perf_counter()
+    for _ in range(repeats):
+        index.within(40.7, -74.0, 2.0)
+    results['radius_ms'] = (time.perf_counter() - start) / repeats * 1000
+    return results
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark the listing location index.")
+    parser.add_argument('--rows', type=int, default=1_000_000, help="Synthetic listings to index")
+    parser.add_argument('--limit', type=int, default=1000, help="Rows returned per limited text search")
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+    results = benchmark(args.rows, limit=args.limit)
+    print(f"Indexed {results['rows']:,} listings in {results['build_ms']:.0f} ms")
+    print(f"str.contains scan: {results['scan_ms']:8.2f} ms per query")
+    print(f"Text search, first {results['limit']} rows: {results['search_ms']:8.3f} ms per query "
+          f"(slowest query {results['search_max_ms']:.3f} ms)")
+    print(f"Text match count:       {results['count_ms']:8.3f} ms per query (slowest query {results['count_max_ms']:.3f} ms)")
+    print(f"Text search, all rows:  {results['search_all_ms']:8.3f} ms per query "
+          f"(slowest query {results['search_all_max_ms']:.3f} ms)")
+    print(f"2 km radius:       {results['radius_ms']:8.3f} ms per query")
+
+if __name__ == "__main__":
+    main()
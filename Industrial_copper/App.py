@@ -9,11 +9,29 @@ from sklearn.preprocessing import LabelBinarizer
 import streamlit as st
 import re
 import os
-import joblib
+from model_store import ModelStore
+from batch import score_orders
+from server import remote_predict
+from metadata import range_label, out_of_range, unknown_categories
 
 # Streamlit Page Configurations
 st.set_page_config(layout="wide")
 
+# When set, predictions come from a running server.py instead of in-process models
+PREDICTION_URL = os.environ.get('COPPER_PREDICTION_URL')
+
+# Models are loaded once per process and shared by all sessions and reruns
+@st.cache_resource
+def get_model_store():
+    store = ModelStore()
+    if not PREDICTION_URL:
+        store.warm()
+    return store
+
+model_store = get_model_store()
+# Vocabularies and numeric ranges written by train.py, reloaded with the models when it changes
+metadata = model_store.metadata()
+
 # Application Header
 st.write("""
 <div style='text-align:center'>
@@ -22,20 +40,16 @@ st.write("""
 """, unsafe_allow_html=True)
 
 # Tabs for Selling Price and Status Prediction
-tab1, tab2 = st.tabs(["PREDICT SELLING PRICE", "PREDICT STATUS"])
+tab1, tab2, tab3 = st.tabs(["PREDICT SELLING PRICE", "PREDICT STATUS", "BATCH PRICING"])
 
 # Tab 1: Selling Price Prediction
 with tab1:
     # Dropdown Menu Options
-    status_options = ['Won', 'Draft', 'To be approved', 'Lost', 'Not lost for AM', 'Wonderful', 'Revised', 'Offered', 'Offerable']
-    item_type_options = ['W', 'WI', 'S', 'Others', 'PL', 'IPL', 'SLAWR']
-    country_options = [28., 25., 30., 32., 38., 78., 27., 77., 113., 79., 26., 39., 40., 84., 80., 107., 89.]
-    application_options = [10., 41., 28., 59., 15., 4., 38., 56., 42., 26., 27., 19., 20., 66., 29., 22., 40., 25., 67., 79., 3., 99., 2., 5., 39., 69., 70., 65., 58., 68.]
-    product = ['611112', '611728', '628112', '628117', '628377', '640400', '640405', '640665',
-               '611993', '929423819', '1282007633', '1332077137', '164141591', '164336407',
-               '164337175', '1665572032', '1665572374', '1665584320', '1665584642', '1665584662',
-               '1668701376', '1668701698', '1668701718', '1668701725', '1670798778', '1671863738',
-               '1671876026', '1690738206', '1690738219', '1693867550', '1693867563', '1721130331', '1722207579']
+    status_options = metadata['categories']['status']
+    item_type_options = metadata['categories']['item type']
+    country_options = metadata['categories']['country']
+    application_options = metadata['categories']['application']
+    product = metadata['categories']['product_ref']
 
     # User Input Form
     with st.form("selling_price_form"):
@@ -49,10 +63,10 @@ with tab1:
 
         with col3:
             st.write(f'<h5 style="color:rgb(0, 153, 153,0.4);">NOTE: Min & Max given for reference, you can enter any value</h5>', unsafe_allow_html=True)
-            quantity_tons = st.text_input("Enter Quantity Tons (Min:611728 & Max:1722207579)")
-            thickness = st.text_input("Enter thickness (Min:0.18 & Max:400)")
-            width = st.text_input("Enter width (Min:1, Max:2990)")
-            customer = st.text_input("Customer ID (Min:12458, Max:30408185)")
+            quantity_tons = st.text_input(range_label(metadata, 'quantity tons', "Enter Quantity Tons"))
+            thickness = st.text_input(range_label(metadata, 'thickness', "Enter thickness"))
+            width = st.text_input(range_label(metadata, 'width', "Enter width"))
+            customer = st.text_input(range_label(metadata, 'customer', "Customer ID"))
             submit_button = st.form_submit_button(label="PREDICT SELLING PRICE")
             st.markdown("""
                 <style>
@@ -71,30 +85,59 @@ with tab1:
             if not re.match(pattern, i):
                 flag = 1
                 break
+        unknown = unknown_categories(metadata, {'status': status, 'item type': item_type, 'country': country,
+                                                'application': application, 'product_ref': product_ref})
 
     # Selling Price Prediction
     if submit_button:
         if flag == 1:
             st.error(f"Invalid input detected: {i}. Please enter valid numbers.")
+        elif unknown:
+            st.error(f"Values not seen in training: {unknown}")
         else:
+            outside = out_of_range(metadata, {'quantity tons': float(quantity_tons), 'thickness': float(thickness),
+                                              'width': float(width), 'customer': float(customer)})
+            if outside:
+                st.warning(f"Outside the training range: {', '.join(outside)}. The prediction may be unreliable.")
             try:
-                with open("model.pkl", 'rb') as file:
-                    loaded_model = joblib.load(file)
-                with open("scaler.pkl", 'rb') as f:
-                    scaler_loaded = joblib.load(f)
-                with open("t.pkl", 'rb') as f:
-                    t_loaded = joblib.load(f)
-                with open("s.pkl", 'rb') as f:
-                    s_loaded = joblib.load(f)
-
-                new_sample = np.array([[np.log(float(quantity_tons)), application, np.log(float(thickness)), float(width),
-                                        country, float(customer), int(product_ref), item_type, status]])
-                new_sample_ohe = t_loaded.transform(new_sample[:, [7]]).toarray()
-                new_sample_be = s_loaded.transform(new_sample[:, [8]]).toarray()
-                new_sample = np.concatenate((new_sample[:, [0, 1, 2, 3, 4, 5, 6]], new_sample_ohe, new_sample_be), axis=1)
-                new_sample_scaled = scaler_loaded.transform(new_sample)
-                new_pred = loaded_model.predict(new_sample_scaled)[0]
-                st.write('## :green[Predicted Selling Price:] ', np.exp(new_pred))
+                if PREDICTION_URL:
+                    price = remote_predict(PREDICTION_URL, 'price', [{
+                        'quantity tons': float(quantity_tons), 'application': application,
+                        'thickness': float(thickness), 'width': float(width), 'country': country,
+                        'customer': float(customer), 'product_ref': float(product_ref),
+                        'item type': item_type, 'status': status,
+                    }])[0]
+                    st.write('## :green[Predicted Selling Price:] ', price)
+                elif model_store.current('price_pipeline'):
+                    # Fused pipeline: typed input, one artifact
+                    pipeline = model_store.get('price_pipeline')['pipeline']
+                    price = pipeline.predict({
+                        'quantity tons': np.array([float(quantity_tons)]),
+                        'application': np.array([application]),
+                        'thickness': np.array([float(thickness)]),
+                        'width': np.array([float(width)]),
+                        'country': np.array([country]),
+                        'customer': np.array([float(customer)]),
+                        'product_ref': np.array([float(product_ref)]),
+                        'item type': np.array([item_type]),
+                        'status': np.array([status]),
+                    })[0]
+                    st.write('## :green[Predicted Selling Price:] ', price)
+                else:
+                    artifacts = model_store.get('price')
+                    loaded_model = artifacts['model']
+                    scaler_loaded = artifacts['scaler']
+                    t_loaded = artifacts['item_type_encoder']
+                    s_loaded = artifacts['status_encoder']
+
+                    new_sample = np.array([[np.log(float(quantity_tons)), application, np.log(float(thickness)), float(width),
+                                            country, float(customer), int(product_ref), item_type, status]])
+                    new_sample_ohe = t_loaded.transform(new_sample[:, [7]]).toarray()
+                    new_sample_be = s_loaded.transform(new_sample[:, [8]]).toarray()
+                    new_sample = np.concatenate((new_sample[:, [0, 1, 2, 3, 4, 5, 6]], new_sample_ohe, new_sample_be), axis=1)
+                    new_sample_scaled = scaler_loaded.transform(new_sample)
+                    new_pred = loaded_model.predict(new_sample_scaled)[0]
+                    st.write('## :green[Predicted Selling Price:] ', np.exp(new_pred))
             except Exception as e:
                 st.error(f"An error occurred during prediction: {e}")
 
@@ -103,11 +146,11 @@ with tab2:
     with st.form("status_prediction_form"):
         col1, col2, col3 = st.columns([5, 1, 5])
         with col1:
-            cquantity_tons = st.text_input("Enter Quantity Tons (Min:611728 & Max:1722207579)")
-            cthickness = st.text_input("Enter thickness (Min:0.18 & Max:400)")
-            cwidth = st.text_input("Enter width (Min:1, Max:2990)")
-            ccustomer = st.text_input("Customer ID (Min:12458, Max:30408185)")
-            cselling = st.text_input("Selling Price (Min:1, Max:100001015)")
+            cquantity_tons = st.text_input(range_label(metadata, 'quantity tons', "Enter Quantity Tons"))
+            cthickness = st.text_input(range_label(metadata, 'thickness', "Enter thickness"))
+            cwidth = st.text_input(range_label(metadata, 'width', "Enter width"))
+            ccustomer = st.text_input(range_label(metadata, 'customer', "Customer ID"))
+            cselling = st.text_input(range_label(metadata, 'selling_price', "Selling Price"))
 
         with col3:
             citem_type = st.selectbox("Item Type", item_type_options, key=21)
@@ -121,27 +164,58 @@ with tab2:
             if not re.match(pattern, k):
                 cflag = 1
                 break
+        cunknown = unknown_categories(metadata, {'item type': citem_type, 'country': ccountry,
+                                                 'application': capplication, 'product_ref': cproduct_ref})
 
     # Status Prediction
     if csubmit_button:
         if cflag == 1:
             st.error(f"Invalid input detected: {k}. Please enter valid numbers.")
+        elif cunknown:
+            st.error(f"Values not seen in training: {cunknown}")
         else:
+            outside = out_of_range(metadata, {'quantity tons': float(cquantity_tons), 'thickness': float(cthickness),
+                                              'width': float(cwidth), 'customer': float(ccustomer),
+                                              'selling_price': float(cselling)})
+            if outside:
+                st.warning(f"Outside the training range: {', '.join(outside)}. The prediction may be unreliable.")
             try:
-                with open("clsmodel.pkl", 'rb') as file:
-                    cloaded_model = joblib.load(file)
-                with open("cscaler.pkl", 'rb') as f:
-                    cscaler_loaded = joblib.load(f)
-                with open("ct.pkl", 'rb') as f:
-                    ct_loaded = joblib.load(f)
-
-                new_sample = np.array([[np.log(float(cquantity_tons)), np.log(float(cselling)), capplication,
-                                        np.log(float(cthickness)), float(cwidth), ccountry, int(ccustomer), cproduct_ref,
-                                        citem_type]])
-                new_sample_ohe = ct_loaded.transform(new_sample[:, [8]]).toarray()
-                new_sample = np.concatenate((new_sample[:, [0, 1, 2, 3, 4, 5, 6, 7]], new_sample_ohe), axis=1)
-                new_sample_scaled = cscaler_loaded.transform(new_sample)
-                new_pred = cloaded_model.predict(new_sample)
+                if PREDICTION_URL:
+                    predicted_status = remote_predict(PREDICTION_URL, 'status', [{
+                        'quantity tons': float(cquantity_tons), 'selling_price': float(cselling),
+                        'application': capplication, 'thickness': float(cthickness), 'width': float(cwidth),
+                        'country': ccountry, 'customer': float(ccustomer), 'product_ref': float(cproduct_ref),
+                        'item type': citem_type,
+                    }])[0]
+                    new_pred = 1 if predicted_status == 'Won' else 0
+                elif model_store.current('status_pipeline'):
+                    # Fused pipeline: typed input, one artifact
+                    pipeline = model_store.get('status_pipeline')['pipeline']
+                    predicted_status = pipeline.predict({
+                        'quantity tons': np.array([float(cquantity_tons)]),
+                        'selling_price': np.array([float(cselling)]),
+                        'application': np.array([capplication]),
+                        'thickness': np.array([float(cthickness)]),
+                        'width': np.array([float(cwidth)]),
+                        'country': np.array([ccountry]),
+                        'customer': np.array([float(ccustomer)]),
+                        'product_ref': np.array([float(cproduct_ref)]),
+                        'item type': np.array([citem_type]),
+                    })[0]
+                    new_pred = 1 if predicted_status == 'Won' else 0
+                else:
+                    artifacts = model_store.get('status')
+                    cloaded_model = artifacts['model']
+                    cscaler_loaded = artifacts['scaler']
+                    ct_loaded = artifacts['item_type_encoder']
+
+                    new_sample = np.array([[np.log(float(cquantity_tons)), np.log(float(cselling)), capplication,
+                                            np.log(float(cthickness)), float(cwidth), ccountry, int(ccustomer), cproduct_ref,
+                                            citem_type]])
+                    new_sample_ohe = ct_loaded.transform(new_sample[:, [8]]).toarray()
+                    new_sample = np.concatenate((new_sample[:, [0, 1, 2, 3, 4, 5, 6, 7]], new_sample_ohe), axis=1)
+                    new_sample_scaled = cscaler_loaded.transform(new_sample)
+                    new_pred = cloaded_model.predict(new_sample_scaled)
                 if new_pred == 1:
                     st.write('## :green[The Status is Won] ')
                 else:
@@ -149,5 +223,30 @@ with tab2:
             except Exception as e:
                 st.error(f"An error occurred during prediction: {e}")
 
-
-
+# Tab 3: Batch Pricing
+with tab3:
+    st.write("Upload an order book (CSV or Excel) with the columns: quantity tons, thickness, width, customer, "
+             "country, application, product_ref, item type, and status (for price) and/or selling_price (for status).")
+    uploaded_file = st.file_uploader("Order book", type=["csv", "xlsx"])
+    batch_task = st.radio("Predict", ["Selling price and status", "Selling price", "Status"], horizontal=True)
+
+    if uploaded_file is not None:
+        try:
+            if uploaded_file.name.lower().endswith(".xlsx"):
+                orders = pd.read_excel(uploaded_file)
+            else:
+                orders = pd.read_csv(uploaded_file)
+            tasks = {"Selling price and status": ("price", "status"),
+                     "Selling price": ("price",),
+                     "Status": ("status",)}[batch_task]
+            scored = score_orders(orders, model_store, tasks)
+
+            error_columns = [col for col in ["price_error", "status_error"] if col in scored.columns]
+            n_invalid = int((scored[error_columns] != "").any(axis=1).sum())
+            if n_invalid:
+                st.warning(f"{n_invalid} of {len(scored)} rows have invalid values, see the error columns.")
+            st.dataframe(scored)
+            st.download_button("Download predictions", scored.to_csv(index=False), file_name="scored_orders.csv",
+                               mime="text/csv")
+        except Exception as e:
+            st.error(f"An error occurred during batch prediction: {e}")
@@ -0,0 +1,205 @@
+import pandas as pd
+import numpy as np
+import argparse
+import logging
+import sys
+import time
+
+from model_store import ModelStore
+
+logger = logging.getLogger(__name__)
+
+# Input columns use the names of the original dataset
+NUMERIC_COLUMNS = ['quantity tons', 'thickness', 'width', 'customer', 'country', 'application', 'product_ref']
+# Columns that are log-transformed and therefore must be strictly positive
+LOG_COLUMNS = ['quantity tons', 'thickness', 'selling_price']
+
+PRICE_COLUMNS = NUMERIC_COLUMNS + ['item type', 'status']
+STATUS_COLUMNS = NUMERIC_COLUMNS + ['item type', 'selling_price']
+
+def read_orders(path):
+    """Read an order book from CSV or Excel."""
+    path = str(path)
+    if path.lower().endswith(('.xlsx', '.xls')):
+        return pd.read_excel(path)
+    return pd.read_csv(path)
+
+def one_hot(values, categories):
+    """
+    Dense one-hot encoding against fitted categories, like OneHotEncoder(handle_unknown='ignore').
+
+    Args:
+        values: array-like of category values
+        categories: categories_ entry of the fitted encoder
+
+    Returns:
+        np.ndarray: float matrix of shape (len(values), len(categories))
+    """
+    codes = pd.Categorical(values, categories=categories).codes
+    encoded = np.zeros((len(codes), len(categories)), dtype=np.float64)
+    known = codes >= 0
+    encoded[np.flatnonzero(known), codes[known]] = 1.0
+    return encoded
+
+def validate_orders(orders, columns, categories):
+    """
+    Check every row at once and convert the numeric columns.
+
+    Args:
+        orders: raw order book
+        columns: required input columns
+        categories: column name -> allowed values, for categorical columns
+
+    Returns:
+        tuple: (typed frame, Series of error messages, empty string for valid rows)
+    """
+    missing = [col for col in columns if col not in orders.columns]
+    if missing:
+        raise ValueError(f"Missing required columns: {missing}")
+
+    typed = pd.DataFrame(index=orders.index)
+    errors = pd.Series('', index=orders.index)
+    for col in columns:
+        if col in categories:
+            typed[col] = orders[col].astype(str).str.strip()
+            invalid = ~typed[col].isin(categories[col])
+            errors[invalid] += f"unknown {col}; "
+            continue
+        typed[col] = pd.to_numeric(orders[col], errors='coerce')
+        invalid = typed[col].isna() | (typed[col] < 0)
+        if col in LOG_COLUMNS:
+            invalid |= typed[col] == 0
+        errors[invalid] += f"invalid {col}; "
+    return typed, errors.str.rstrip('; ')
+
+def price_features(typed, artifacts):
+    """Typed feature matrix for the selling-price model, in training column order."""
+    return np.column_stack([
+        np.log(typed['quantity tons'].to_numpy(dtype=np.float64)),
+        typed['application'].to_numpy(dtype=np.float64),
+        np.log(typed['thickness'].to_numpy(dtype=np.float64)),
+        typed['width'].to_numpy(dtype=np.float64),
+        typed['country'].to_numpy(dtype=np.float64),
+        typed['customer'].to_numpy(dtype=np.float64),
+        typed['product_ref'].to_numpy(dtype=np.float64),
+        one_hot(typed['item type'], artifacts['item_type_encoder'].categories_[0]),
+        one_hot(typed['status'], artifacts['status_encoder'].categories_[0]),
+    ])
+
+def status_features(typed, artifacts):
+    """Typed feature matrix for the status model, in training column order."""
+    return np.column_stack([
+        np.log(typed['quantity tons'].to_numpy(dtype=np.float64)),
+        np.log(typed['selling_price'].to_numpy(dtype=np.float64)),
+        typed['application'].to_numpy(dtype=np.float64),
+        np.log(typed['thickness'].to_numpy(dtype=np.float64)),
+        typed['width'].to_numpy(dtype=np.float64),
+        typed['country'].to_numpy(dtype=np.float64),
+        typed['customer'].to_numpy(dtype=np.float64),
+        typed['product_ref'].to_numpy(dtype=np.float64),
+        one_hot(typed['item type'], artifacts['item_type_encoder'].categories_[0]),
+    ])
+
+def predict_prices(orders, artifacts):
+    """
+    Predict the selling price of every order.
+
+    Args:
+        orders: order book with PRICE_COLUMNS
+        artifacts: ModelStore.get('price')
+
+    Returns:
+        tuple: (predicted prices with NaN for invalid rows, error messages)
+    """
+    categories = {
+        'item type': artifacts['item_type_encoder'].categories_[0],
+        'status': artifacts['status_encoder'].categories_[0],
+    }
+    typed, errors = validate_orders(orders, PRICE_COLUMNS, categories)
+    valid = (errors == '').to_numpy()
+    prices = np.full(len(orders), np.nan)
+    if valid.any():
+        X = artifacts['scaler'].transform(price_features(typed[valid], artifacts))
+        prices[valid] = np.exp(artifacts['model'].predict(X))
+    return prices, errors
+
+def predict_statuses(orders, artifacts):
+    """
+    Predict Won/Lost for every order.
+
+    Args:
+        orders: order book with STATUS_COLUMNS
+        artifacts: ModelStore.get('status')
+
+    Returns:
+        tuple: (array of 'Won'/'Lost', None for invalid rows, error messages)
+    """
+    categories = {'item type': artifacts['item_type_encoder'].categories_[0]}
+    typed, errors = validate_orders(orders, STATUS_COLUMNS, categories)
+    valid = (errors == '').to_numpy()
+    statuses = np.full(len(orders), None, dtype=object)
+    if valid.any():
+        # The classifier was trained on scaled features, see the EDA notebook
+        X = artifacts['scaler'].transform(status_features(typed[valid], artifacts))
+        statuses[valid] = np.where(np.ravel(artifacts['model'].predict(X)) == 1, 'Won', 'Lost')
+    return statuses, errors
+
+def score_orders(orders, store, tasks=('price', 'status')):
+    """
+    Score an order book with one or both models.
+
+    When status is requested and the book has no 'selling_price' column,
+    the predicted selling price is used instead.
+
+    Args:
+        orders: raw order book
+        store: ModelStore
+        tasks: any of 'price' and 'status'
+
+    Returns:
+        pd.DataFrame: the input plus prediction and error columns
+    """
+    result = orders.copy()
+    if 'price' in tasks:
+        prices, errors = predict_prices(orders, store.get('price'))
+        result['predicted_selling_price'] = prices
+        result['price_error'] = errors
+    if 'status' in tasks:
+        status_input = orders
+        if 'selling_price' not in orders.columns and 'predicted_selling_price' in result.columns:
+            status_input = orders.assign(selling_price=result['predicted_selling_price'])
+        statuses, errors = predict_statuses(status_input, store.get('status'))
+        result['predicted_status'] = statuses
+        result['status_error'] = errors
+    return result
+
+def parse_args():
+    """Parse command line options for batch scoring."""
+    parser = argparse.ArgumentParser(description="Score a copper order book in one pass.")
+    parser.add_argument('input', help="CSV or Excel file with one order per row")
+    parser.add_argument('output', help="CSV file to write the scored orders to")
+    parser.add_argument('--task', choices=['price', 'status', 'both'], default='both',
+                        help="Which predictions to make")
+    parser.add_argument('--models-dir', default='.',
+                        help="Directory holding the model pickles")
+    return parser.parse_args()
+
+def main():
+    """Score an order book from the command line."""
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s', stream=sys.stdout)
+    args = parse_args()
+    tasks = ('price', 'status') if args.task == 'both' else (args.task,)
+
+    orders = read_orders(args.input)
+    start = time.perf_counter()
+    scored = score_orders(orders, ModelStore(args.models_dir), tasks)
+    elapsed = time.perf_counter() - start
+    scored.to_csv(args.output, index=False)
+
+    error_columns = [col for col in ['price_error', 'status_error'] if col in scored.columns]
+    n_invalid = int((scored[error_columns] != '').any(axis=1).sum())
+    logger.info(f"Scored {len(orders)} orders in {elapsed:.3f}s "
+                f"({len(orders) / max(elapsed, 1e-9):,.0f} rows/s), {n_invalid} invalid")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,223 @@
+import pandas as pd
+import numpy as np
+import argparse
+import joblib
+import logging
+import os
+import sys
+import time
+
+from model_store import ModelStore
+
+logger = logging.getLogger(__name__)
+
+PIPELINE_FILES = {'price': 'price_pipeline.pkl', 'status': 'status_pipeline.pkl'}
+
+class CopperPipeline:
+    """
+    Log transforms, one-hot encoding, scaling and the model fused into one artifact.
+
+    Input is a mapping of column name to a 1-D array: numeric columns as
+    floats, categorical columns either as strings or as integer codes into
+    `categories[column]`. The feature matrix is written column by column into
+    one preallocated float64 array, with no object arrays or sparse matrices
+    on the way.
+    """
+
+    def __init__(self, task, numeric_columns, log_columns, categories, mean, scale, model):
+        self.task = task
+        self.numeric_columns = numeric_columns
+        self.log_columns = set(log_columns)
+        self.categories = categories
+        self.mean = np.asarray(mean, dtype=np.float64)
+        self.scale = np.asarray(scale, dtype=np.float64)
+        self.model = model
+
+    @property
+    def input_columns(self):
+        return list(self.numeric_columns) + list(self.categories)
+
+    def encode(self, column, values):
+        """Integer codes of categorical values; unknown values get -1."""
+        values = np.asarray(values)
+        if values.dtype.kind in 'iu':
+            return values.astype(np.int64)
+        return pd.Categorical(values, categories=self.categories[column]).codes.astype(np.int64)
+
+    def transform(self, features):
+        """
+        Build the scaled feature matrix.
+
+        Args:
+            features: mapping of input column -> 1-D array
+
+        Returns:
+            np.ndarray: scaled float64 matrix in training column order
+        """
+        n_rows = len(features[self.numeric_columns[0]])
+        X = np.empty((n_rows, len(self.mean)), dtype=np.float64)
+        for i, column in enumerate(self.numeric_columns):
+            values = np.asarray(features[column], dtype=np.float64)
+            X[:, i] = np.log(values) if column in self.log_columns else values
+
+        offset = len(self.numeric_columns)
+        for column, categories in self.categories.items():
+            block = X[:, offset:offset + len(categories)]
+            block[:] = 0.0
+            codes = self.encode(column, features[column])
+            known = codes >= 0
+            # Unknown categories stay all-zero, like OneHotEncoder(handle_unknown='ignore')
+            block[np.flatnonzero(known), codes[known]] = 1.0
+            offset += len(categories)
+
+        X -= self.mean
+        X /= self.scale
+        return X
+
+    def predict(self, features):
+        """
+        Predict selling prices (task 'price') or 'Won'/'Lost' (task 'status').
+
+        Args:
+            features: mapping of input column -> 1-D array
+
+        Returns:
+            np.ndarray: predictions, one per row
+        """
+        raw = np.ravel(self.model.predict(self.transform(features)))
+        if self.task == 'price':
+            return np.exp(raw)
+        return np.where(raw == 1, 'Won', 'Lost')
+
+def build_pipelines(store):
+    """
+    Fuse the separate pickles of each task into a CopperPipeline.
+
+    Args:
+        store: ModelStore pointing at the notebook artifacts
+
+    Returns:
+        dict: task -> CopperPipeline
+    """
+    price = store.get('price')
+    status = store.get('status')
+    return {
+        'price': CopperPipeline(
+            task='price',
+            numeric_columns=['quantity tons', 'application', 'thickness', 'width',
+                             'country', 'customer', 'product_ref'],
+            log_columns=['quantity tons', 'thickness'],
+            categories={
+                'item type': price['item_type_encoder'].categories_[0],
+                'status': price['status_encoder'].categories_[0],
+            },
+            mean=price['scaler'].mean_,
+            scale=price['scaler'].scale_,
+            model=price['model'],
+        ),
+        'status': CopperPipeline(
+            task='status',
+            numeric_columns=['quantity tons', 'selling_price', 'application', 'thickness',
+                             'width', 'country', 'customer', 'product_ref'],
+            log_columns=['quantity tons', 'selling_price', 'thickness'],
+            categories={'item type': status['item_type_encoder'].categories_[0]},
+            mean=status['scaler'].mean_,
+            scale=status['scaler'].scale_,
+            model=status['model'],
+        ),
+    }
+
+def save_pipelines(pipelines, output_dir='.'):
+    """Write each pipeline to its own file."""
+    for task, pipeline in pipelines.items():
+        path = os.path.join(output_dir, PIPELINE_FILES[task])
+        joblib.dump(pipeline, path)
+        logger.info(f"Saved {task} pipeline to {path}")
+
+def load_pipeline(task, base_dir='.'):
+    """Load a fused pipeline written by `save_pipelines`."""
+    return joblib.load(os.path.join(base_dir, PIPELINE_FILES[task]))
+
+def legacy_predict(task, artifacts, sample):
+    """One prediction the way App.py did it before the fused pipeline existed."""
+    if task == 'price':
+        new_sample = np.array([[np.log(sample['quantity tons']), sample['application'], np.log(sample['thickness']),
+                                sample['width'], sample['country'], sample['customer'], sample['product_ref'],
+                                sample['item type'], sample['status']]])
+        new_sample_ohe = artifacts['item_type_encoder'].transform(new_sample[:, [7]]).toarray()
+        new_sample_be = artifacts['status_encoder'].transform(new_sample[:, [8]]).toarray()
+        new_sample = np.concatenate((new_sample[:, [0, 1, 2, 3, 4, 5, 6]], new_sample_ohe, new_sample_be), axis=1)
+        return np.exp(artifacts['model'].predict(artifacts['scaler'].transform(new_sample)))[0]
+    new_sample = np.array([[np.log(sample['quantity tons']), np.log(sample['selling_price']), sample['application'],
+                            np.log(sample['thickness']), sample['width'], sample['country'], sample['customer'],
+                            sample['product_ref'], sample['item type']]])
+    new_sample_ohe = artifacts['item_type_encoder'].transform(new_sample[:, [8]]).toarray()
+    new_sample = np.concatenate((new_sample[:, [0, 1, 2, 3, 4, 5, 6, 7]], new_sample_ohe), axis=1)
+    pred = np.ravel(artifacts['model'].predict(artifacts['scaler'].transform(new_sample)))[0]
+    return 'Won' if pred == 1 else 'Lost'
+
+def benchmark(store, pipelines, repeats=200, batch_rows=10_000):
+    """
+    Compare single-row and batch latency of the legacy path and the fused pipeline.
+
+    Returns:
+        list: one dict per (task, path, mode) with the latency per row in microseconds
+    """
+    rng = np.random.default_rng(42)
+    sample = {
+        'quantity tons': 40.0, 'thickness': 2.5, 'width': 1250.0, 'customer': 30202938.0,
+        'country': 28.0, 'application': 10.0, 'product_ref': 1670798778.0,
+        'selling_price': 900.0, 'item type': 'W', 'status': 'Won',
+    }
+    batch = {column: np.full(batch_rows, value) for column, value in sample.items()}
+    batch['quantity tons'] = rng.uniform(1, 1000, batch_rows)
+    batch['width'] = rng.uniform(1, 2990, batch_rows)
+
+    results = []
+    for task, pipeline in pipelines.items():
+        artifacts = store.get(task)
+        single = {column: np.array([sample[column]]) for column in pipeline.input_columns}
+
+        legacy = legacy_predict(task, artifacts, sample)
+        fused = pipeline.predict(single)[0]
+        if task == 'price' and not np.isclose(legacy, fused):
+            raise ValueError(f"Pipeline price {fused} differs from legacy path {legacy}")
+        if task == 'status' and legacy != fused:
+            raise ValueError(f"Pipeline status {fused} differs from legacy path {legacy}")
+
+        timings = {
+            'legacy single': (lambda: legacy_predict(task, artifacts, sample), 1),
+            'pipeline single': (lambda: pipeline.predict(single), 1),
+            'pipeline batch': (lambda: pipeline.predict(batch), batch_rows),
+        }
+        for name, (func, rows) in timings.items():
+            start = time.perf_counter()
+            for _ in range(repeats if rows == 1 else 5):
+                func()
+            elapsed = (time.perf_counter() - start) / (repeats if rows == 1 else 5)
+            results.append({'task': task, 'path': name, 'latency_us_per_row': elapsed / rows * 1e6})
+            logger.info(f"{task:<6} {name:<16} {elapsed / rows * 1e6:10.2f} us/row")
+    return results
+
+def parse_args():
+    """Parse command line options."""
+    parser = argparse.ArgumentParser(description="Build the fused copper prediction pipelines.")
+    parser.add_argument('--models-dir', default='.', help="Directory holding the notebook pickles")
+    parser.add_argument('--benchmark', action='store_true',
+                        help="Compare latency against the per-pickle prediction path")
+    return parser.parse_args()
+
+def main():
+    """Build, save and optionally benchmark the pipelines."""
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s', stream=sys.stdout)
+    args = parse_args()
+    store = ModelStore(args.models_dir)
+    pipelines = build_pipelines(store)
+    save_pipelines(pipelines, args.models_dir)
+    if args.benchmark:
+        benchmark(store, pipelines)
+
+if __name__ == "__main__":
+    # Import by module name so pickled pipelines reference copper_pipeline.CopperPipeline, not __main__
+    from copper_pipeline import main as module_main
+    module_main()
@@ -0,0 +1,129 @@
+import numpy as np
+import json
+import os
+
+METADATA_FILE = 'metadata.json'
+
+CATEGORICAL_COLUMNS = ['status', 'item type', 'country', 'application', 'product_ref']
+NUMERIC_COLUMNS = ['quantity tons', 'thickness', 'width', 'customer', 'selling_price']
+
+# Vocabularies and label hints App.py used before metadata.json existed. The
+# hints were typed in by hand, so they are shown but not used for range warnings
+# (the old quantity hint was actually the product_ref range and is left out)
+DEFAULT_METADATA = {
+    'fitted': False,
+    'categories': {
+        'status': ['Won', 'Draft', 'To be approved', 'Lost', 'Not lost for AM', 'Wonderful', 'Revised', 'Offered',
+                   'Offerable'],
+        'item type': ['W', 'WI', 'S', 'Others', 'PL', 'IPL', 'SLAWR'],
+        'country': sorted([28., 25., 30., 32., 38., 78., 27., 77., 113., 79., 26., 39., 40., 84., 80., 107., 89.]),
+        'application': sorted([10., 41., 28., 59., 15., 4., 38., 56., 42., 26., 27., 19., 20., 66., 29., 22., 40.,
+                               25., 67., 79., 3., 99., 2., 5., 39., 69., 70., 65., 58., 68.]),
+        'product_ref': [611112, 611728, 628112, 628117, 628377, 640400, 640405, 640665, 611993, 929423819,
+                        1282007633, 1332077137, 164141591, 164336407, 164337175, 1665572032, 1665572374,
+                        1665584320, 1665584642, 1665584662, 1668701376, 1668701698, 1668701718, 1668701725,
+                        1670798778, 1671863738, 1671876026, 1690738206, 1690738219, 1693867550, 1693867563,
+                        1721130331, 1722207579],
+    },
+    'ranges': {
+        'thickness': {'min': 0.18, 'max': 400},
+        'width': {'min': 1, 'max': 2990},
+        'customer': {'min': 12458, 'max': 30408185},
+        'selling_price': {'min': 1, 'max': 100001015},
+    },
+}
+
+def build_metadata(df):
+    """
+    Category vocabularies and numeric ranges of the cleaned training data.
+
+    Args:
+        df: cleaned copper dataset, see train.clean_data
+
+    Returns:
+        dict: 'categories' (column -> sorted values) and 'ranges' (column -> min/max)
+    """
+    categories = {}
+    for col in CATEGORICAL_COLUMNS:
+        values = np.unique(df[col].to_numpy())
+        if col == 'product_ref':
+            values = values.astype(np.int64)
+        categories[col] = values.tolist()
+    ranges = {col: {'min': float(df[col].min()), 'max': float(df[col].max())} for col in NUMERIC_COLUMNS}
+    return {'fitted': True, 'categories': categories, 'ranges': ranges}
+
+def save_metadata(metadata, output_dir='.'):
+    """Write metadata.json next to the models."""
+    path = os.path.join(output_dir, METADATA_FILE)
+    with open(path, 'w') as f:
+        json.dump(metadata, f, indent=2)
+    return path
+
+def load_metadata(base_dir='.'):
+    """Metadata written at training time, or DEFAULT_METADATA when it is missing."""
+    path = os.path.join(base_dir, METADATA_FILE)
+    if not os.path.exists(path):
+        return DEFAULT_METADATA
+    with open(path) as f:
+        return json.load(f)
+
+def format_bound(value):
+    """Plain, digit-grouped number without trailing zeros, e.g. 1,722,207,579 or 0.18."""
+    return f"{value:,.6f}".rstrip('0').rstrip('.')
+
+def range_label(metadata, column, label):
+    """Input label with the training range as a hint, e.g. 'Enter width (Min:1, Max:2,990)'."""
+    bounds = metadata['ranges'].get(column)
+    if bounds is None:
+        return label
+    return f"{label} (Min:{format_bound(bounds['min'])}, Max:{format_bound(bounds['max'])})"
+
+def out_of_range(metadata, values):
+    """
+    Numeric inputs outside the training range, checked in one vectorized comparison.
+
+    Args:
+        metadata: see build_metadata
+        values: mapping of numeric column -> value or 1-D array
+
+    Returns:
+        list: names of the columns with at least one value outside its range,
+            always empty for the hand-written DEFAULT_METADATA hints
+    """
+    if not metadata.get('fitted', True):
+        return []
+    columns = [col for col in values if col in metadata['ranges']]
+    if not columns:
+        return []
+    data = np.atleast_2d(np.array([np.ravel(values[col]) for col in columns], dtype=np.float64))
+    low = np.array([metadata['ranges'][col]['min'] for col in columns])[:, None]
+    high = np.array([metadata['ranges'][col]['max'] for col in columns])[:, None]
+    outside = ((data < low) | (data > high)).any(axis=1)
+    return [col for col, flag in zip(columns, outside) if flag]
+
+def unknown_categories(metadata, values):
+    """
+    Categorical inputs that are not in the training vocabulary.
+
+    Args:
+        metadata: see build_metadata
+        values: mapping of categorical column -> value or 1-D array
+
+    Returns:
+        dict: column -> list of unknown values, empty when everything is known
+    """
+    unknown = {}
+    for col, value in values.items():
+        vocabulary = metadata['categories'].get(col)
+        if vocabulary is None:
+            continue
+        value = np.ravel(value)
+        if value.dtype.kind in 'iuf':
+            vocabulary = np.asarray(vocabulary, dtype=np.float64)
+        else:
+            value = value.astype(str)
+            vocabulary = np.asarray(vocabulary, dtype=str)
+        missing = np.unique(value[~np.isin(value, vocabulary)])
+        if len(missing):
+            unknown[col] = missing.tolist()
+    return unknown
@@ -0,0 +1,133 @@
+import joblib
+import json
+import logging
+import os
+import threading
+
+from metadata import METADATA_FILE, DEFAULT_METADATA
+
+logger = logging.getLogger(__name__)
+
+# Pickled artifacts produced by "Industrial_copper EDA.ipynb", per prediction task
+ARTIFACTS = {
+    'price': {
+        'model': 'model.pkl',
+        'scaler': 'scaler.pkl',
+        'item_type_encoder': 't.pkl',
+        'status_encoder': 's.pkl',
+    },
+    'status': {
+        'model': 'clsmodel.pkl',
+        'scaler': 'cscaler.pkl',
+        'item_type_encoder': 'ct.pkl',
+    },
+    # Fused artifacts written by copper_pipeline.py
+    'price_pipeline': {'pipeline': 'price_pipeline.pkl'},
+    'status_pipeline': {'pipeline': 'status_pipeline.pkl'},
+}
+
+# Task whose pickles each fused pipeline is built from
+PIPELINE_SOURCES = {'price_pipeline': 'price', 'status_pipeline': 'status'}
+
+class ModelStore:
+    """
+    Loads each model artifact once per process and reloads it when the file changes.
+
+    Artifacts are cached by path together with their mtime and size, so a
+    retrained pickle dropped next to the app is picked up on the next request
+    without restarting it.
+    """
+
+    def __init__(self, base_dir='.'):
+        self.base_dir = base_dir
+        self._lock = threading.Lock()
+        self._cache = {}
+
+    def _signature(self, path):
+        stat = os.stat(path)
+        return stat.st_mtime_ns, stat.st_size
+
+    def _load(self, filename, loader=joblib.load):
+        """Return the loaded artifact, reading the file only if it changed."""
+        path = os.path.join(self.base_dir, filename)
+        signature = self._signature(path)
+        cached = self._cache.get(path)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+        with open(path, 'rb') as f:
+            artifact = loader(f)
+        self._cache[path] = (signature, artifact)
+        logger.info(f"Loaded {path}")
+        return artifact
+
+    def available(self, task):
+        """Whether every file of a task exists."""
+        return all(os.path.exists(os.path.join(self.base_dir, filename))
+                   for filename in ARTIFACTS[task].values())
+
+    def current(self, task):
+        """
+        Whether every file of a task exists and is not older than the pickles it was built from.
+
+        A fused pipeline written before the notebook last retrained the
+        separate pickles is stale: it is logged and reported as not current,
+        so callers fall back to the separate pickles.
+        """
+        if not self.available(task):
+            return False
+        source = PIPELINE_SOURCES.get(task)
+        if source is None or not self.available(source):
+            return True
+        built = min(os.path.getmtime(os.path.join(self.base_dir, filename)) for filename in ARTIFACTS[task].values())
+        changed = max(os.path.getmtime(os.path.join(self.base_dir, filename)) for filename in ARTIFACTS[source].values())
+        if built < changed:
+            logger.warning(f"{task} is older than the {source} pickles, using the pickles until it is rebuilt")
+            return False
+        return True
+
+    def get(self, task):
+        """
+        Artifacts for one prediction task.
+
+        Args:
+            task: 'price' or 'status'
+
+        Returns:
+            dict: artifact name -> loaded object, see ARTIFACTS
+        """
+        with self._lock:
+            return {name: self._load(filename) for name, filename in ARTIFACTS[task].items()}
+
+    def metadata(self):
+        """Vocabularies and numeric ranges from metadata.json, reread when it changes; DEFAULT_METADATA when missing."""
+        if not os.path.exists(os.path.join(self.base_dir, METADATA_FILE)):
+            return DEFAULT_METADATA
+        with self._lock:
+            return self._load(METADATA_FILE, json.load)
+
+    def warm(self, tasks=None, background=True):
+        """
+        Load the artifacts ahead of the first prediction.
+
+        Args:
+            tasks: tasks to load, by default all tasks whose files exist and are current
+            background: load in a daemon thread instead of blocking
+
+        Returns:
+            threading.Thread or None: the loader thread when running in background
+        """
+        tasks = list(tasks or [task for task in ARTIFACTS if self.current(task)])
+
+        def load_all():
+            for task in tasks:
+                try:
+                    self.get(task)
+                except Exception as e:
+                    logger.error(f"Error warming {task} models: {e}")
+
+        if not background:
+            load_all()
+            return None
+        thread = threading.Thread(target=load_all, name='model-warmup', daemon=True)
+        thread.start()
+        return thread
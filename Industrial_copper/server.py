@@ -0,0 +1,357 @@
+import numpy as np
+from collections import OrderedDict, deque
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import argparse
+import json
+import logging
+import queue
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+
+from model_store import ModelStore
+from copper_pipeline import build_pipelines
+
+logger = logging.getLogger(__name__)
+
+TASKS = ('price', 'status')
+
+# Pending connections the listening socket queues; socketserver's default of 5 resets clients under load
+DEFAULT_BACKLOG = 128
+
+class LRUCache:
+    """Thread-safe least-recently-used cache with hit and miss counters."""
+
+    def __init__(self, maxsize=10_000):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        """Cached value or None."""
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+            return None
+
+    def put(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+class MicroBatcher:
+    """
+    Collects requests arriving within a short window and predicts them in one call.
+
+    `predict_fn` receives a list of distinct feature tuples and returns one
+    prediction per tuple. Each submitted tuple gets a Future that resolves
+    once its batch has been predicted.
+    """
+
+    def __init__(self, predict_fn, window_ms=5, max_batch=256):
+        self.predict_fn = predict_fn
+        self.window = window_ms / 1000
+        self.max_batch = max_batch
+        self.batches = 0
+        self.batched_rows = 0
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name='micro-batcher', daemon=True)
+        self._thread.start()
+
+    def submit(self, key):
+        future = Future()
+        self._queue.put((key, future))
+        return future
+
+    def _collect(self):
+        """Block for the first request, then gather more until the window closes."""
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.window
+        while len(batch) < self.max_batch:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=timeout))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            keys = list(dict.fromkeys(key for key, _ in batch))
+            try:
+                predictions = dict(zip(keys, self.predict_fn(keys)))
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+            self.batches += 1
+            self.batched_rows += len(keys)
+            for key, future in batch:
+                future.set_result(predictions[key])
+
+class PredictionService:
+    """
+    Copper price/status predictions with an LRU cache in front of a micro-batcher.
+
+    Requests are normalized to a tuple of the pipeline's input columns
+    (floats for numeric columns, stripped strings for categories), so
+    repeated quotes for the same order hit the cache regardless of how the
+    numbers were formatted.
+    """
+
+    def __init__(self, store, cache_size=10_000, window_ms=5, max_batch=256, timeout=10):
+        self.store = store
+        self.timeout = timeout
+        self.pipelines = self._load_pipelines()
+        self.caches = {task: LRUCache(cache_size) for task in TASKS}
+        self.batchers = {
+            task: MicroBatcher(lambda keys, task=task: self._predict_batch(task, keys), window_ms, max_batch)
+            for task in TASKS
+        }
+        self.latencies = {task: deque(maxlen=10_000) for task in TASKS}
+        self.requests = {task: 0 for task in TASKS}
+        self.errors = {task: 0 for task in TASKS}
+        self._lock = threading.Lock()
+
+    def _load_pipelines(self):
+        """Fused pipelines from disk, or built from the separate pickles when missing or stale."""
+        if all(self.store.current(f'{task}_pipeline') for task in TASKS):
+            return {task: self.store.get(f'{task}_pipeline')['pipeline'] for task in TASKS}
+        return build_pipelines(self.store)
+
+    def normalize(self, task, row):
+        """
+        Cache key for one request.
+
+        Args:
+            task: 'price' or 'status'
+            row: mapping of input column -> value
+
+        Returns:
+            tuple: values in the pipeline's input column order
+        """
+        pipeline = self.pipelines[task]
+        missing = [col for col in pipeline.input_columns if col not in row]
+        if missing:
+            raise ValueError(f"Missing required fields: {missing}")
+        key = []
+        for col in pipeline.numeric_columns:
+            try:
+                value = float(row[col])
+            except (TypeError, ValueError):
+                raise ValueError(f"Invalid {col}: {row[col]!r}")
+            if not np.isfinite(value) or value < 0 or (col in pipeline.log_columns and value == 0):
+                raise ValueError(f"Invalid {col}: {row[col]!r}")
+            key.append(value)
+        for col, categories in pipeline.categories.items():
+            value = str(row[col]).strip()
+            # Reject here rather than silently encoding an all-zero one-hot block
+            if value not in categories:
+                raise ValueError(f"Unknown {col}: {row[col]!r}")
+            key.append(value)
+        return tuple(key)
+
+    def _predict_batch(self, task, keys):
+        """One pipeline call for a list of normalized feature tuples."""
+        pipeline = self.pipelines[task]
+        columns = list(zip(*keys))
+        n_numeric = len(pipeline.numeric_columns)
+        features = {col: np.asarray(columns[i], dtype=np.float64) for i, col in enumerate(pipeline.numeric_columns)}
+        for i, col in enumerate(pipeline.categories):
+            features[col] = np.asarray(columns[n_numeric + i], dtype=object)
+        return pipeline.predict(features).tolist()
+
+    def predict(self, task, rows):
+        """
+        Predict a list of orders, serving repeats from the cache.
+
+        Args:
+            task: 'price' or 'status'
+            rows: list of mappings of input column -> value
+
+        Returns:
+            list: one prediction per row
+        """
+        start = time.perf_counter()
+        with self._lock:
+            self.requests[task] += 1
+        try:
+            keys = [self.normalize(task, row) for row in rows]
+            cache = self.caches[task]
+            results = [cache.get(key) for key in keys]
+            pending = {key: self.batchers[task].submit(key)
+                       for key, result in zip(keys, results) if result is None}
+            for key, future in pending.items():
+                cache.put(key, future.result(timeout=self.timeout))
+            results = [pending[key].result() if result is None else result
+                       for key, result in zip(keys, results)]
+        except Exception:
+            with self._lock:
+                self.errors[task] += 1
+            raise
+        self.latencies[task].append((time.perf_counter() - start) * 1000)
+        return results
+
+    def reload(self):
+        """Rebuild the pipelines and drop cached predictions, e.g. after retraining."""
+        self.pipelines = self._load_pipelines()
+        for cache in self.caches.values():
+            cache.clear()
+
+    def metrics(self):
+        """Request counts, cache hit rate, batch sizes and latency percentiles per task."""
+        result = {}
+        for task in TASKS:
+            cache = self.caches[task]
+            batcher = self.batchers[task]
+            latencies = np.array(self.latencies[task])
+            lookups = cache.hits + cache.misses
+            result[task] = {
+                'requests': self.requests[task],
+                'errors': self.errors[task],
+                'cache_size': len(cache),
+                'cache_hits': cache.hits,
+                'cache_misses': cache.misses,
+                'hit_rate': cache.hits / lookups if lookups else 0.0,
+                'batches': batcher.batches,
+                'mean_batch_size': batcher.batched_rows / batcher.batches if batcher.batches else 0.0,
+                'latency_ms': {
+                    'mean': float(latencies.mean()) if len(latencies) else 0.0,
+                    'p50': float(np.percentile(latencies, 50)) if len(latencies) else 0.0,
+                    'p95': float(np.percentile(latencies, 95)) if len(latencies) else 0.0,
+                    'p99': float(np.percentile(latencies, 99)) if len(latencies) else 0.0,
+                },
+            }
+        return result
+
+class PredictionHandler(BaseHTTPRequestHandler):
+    """
+    Routes:
+        POST /predict/price, POST /predict/status: one order object or a list of them
+        GET /metrics: PredictionService.metrics()
+        POST /reload: reload the models and clear the caches
+        GET /health
+    """
+
+    def _send_json(self, status, payload):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path == '/metrics':
+            self._send_json(200, self.server.service.metrics())
+        elif self.path == '/health':
+            self._send_json(200, {'status': 'ok'})
+        else:
+            self._send_json(404, {'error': f"Unknown path {self.path}"})
+
+    def do_POST(self):
+        if self.path == '/reload':
+            self.server.service.reload()
+            self._send_json(200, {'status': 'reloaded'})
+            return
+        task = self.path.rsplit('/', 1)[-1]
+        if not self.path.startswith('/predict/') or task not in TASKS:
+            self._send_json(404, {'error': f"Unknown path {self.path}"})
+            return
+        try:
+            payload = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))))
+            rows = payload if isinstance(payload, list) else [payload]
+            predictions = self.server.service.predict(task, rows)
+        except (ValueError, TypeError, AttributeError) as e:
+            self._send_json(400, {'error': str(e)})
+            return
+        except Exception as e:
+            logger.error(f"Prediction failed: {e}")
+            self._send_json(500, {'error': str(e)})
+            return
+        self._send_json(200, {'predictions': predictions})
+
+    def log_message(self, format, *args):
+        logger.debug(format % args)
+
+class PredictionServer(ThreadingHTTPServer):
+    """ThreadingHTTPServer for a PredictionService, with a configurable listen backlog."""
+
+    def __init__(self, address, service, backlog=DEFAULT_BACKLOG):
+        # Read by server_activate's listen() call while the base class binds
+        self.request_queue_size = backlog
+        self.service = service
+        super().__init__(address, PredictionHandler)
+
+def remote_predict(url, task, rows, timeout=10):
+    """
+    Call a running prediction service.
+
+    Args:
+        url: base URL of the service, e.g. http://127.0.0.1:8502
+        task: 'price' or 'status'
+        rows: list of mappings of input column -> value
+
+    Returns:
+        list: one prediction per row
+    """
+    request = urllib.request.Request(
+        f"{url.rstrip('/')}/predict/{task}",
+        data=json.dumps(rows).encode(),
+        headers={'Content-Type': 'application/json'},
+        method='POST'
+    )
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            return json.loads(response.read())['predictions']
+    except urllib.error.HTTPError as e:
+        raise ValueError(json.loads(e.read()).get('error', str(e)))
+
+def parse_args():
+    """Parse command line options for the prediction service."""
+    parser = argparse.ArgumentParser(description="Serve copper price and status predictions over HTTP.")
+    parser.add_argument('--host', default='127.0.0.1', help="Interface to bind")
+    parser.add_argument('--port', type=int, default=8502, help="Port to listen on")
+    parser.add_argument('--models-dir', default='.', help="Directory holding the model pickles")
+    parser.add_argument('--cache-size', type=int, default=10_000, help="Cached predictions per task")
+    parser.add_argument('--window-ms', type=float, default=5, help="How long to collect requests into a batch")
+    parser.add_argument('--max-batch', type=int, default=256, help="Largest batch sent to the model")
+    parser.add_argument('--backlog', type=int, default=DEFAULT_BACKLOG, help="Pending connections to queue")
+    return parser.parse_args()
+
+def main():
+    """Start the prediction service."""
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s', stream=sys.stdout)
+    args = parse_args()
+    service = PredictionService(ModelStore(args.models_dir), args.cache_size, args.window_ms, args.max_batch)
+    server = PredictionServer((args.host, args.port), service, args.backlog)
+    logger.info(f"Serving copper predictions on http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+if __name__ == "__main__":
+    main()
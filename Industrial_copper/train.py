@@ -0,0 +1,218 @@
+import pandas as pd
+import numpy as np
+from sklearn.model_selection import train_test_split, GridSearchCV
+from sklearn.experimental import enable_halving_search_cv  # noqa: F401
+from sklearn.model_selection import HalvingGridSearchCV
+from sklearn.tree import DecisionTreeRegressor, DecisionTreeClassifier
+from sklearn.preprocessing import StandardScaler, OneHotEncoder, LabelBinarizer
+from sklearn.metrics import mean_squared_error, r2_score, accuracy_score, f1_score, confusion_matrix
+import argparse
+import hashlib
+import logging
+import os
+import pickle
+import sys
+import time
+
+from model_store import ModelStore
+from copper_pipeline import build_pipelines, save_pipelines
+from metadata import build_metadata, save_metadata
+
+logger = logging.getLogger(__name__)
+
+# Hyperparameter grids, as in "Industrial_copper EDA.ipynb" ('auto' is no longer accepted by scikit-learn)
+REGRESSOR_GRID = {
+    'max_depth': [2, 5, 10, 20],
+    'min_samples_split': [2, 5, 10],
+    'min_samples_leaf': [1, 2, 4],
+    'max_features': [None, 'sqrt', 'log2'],
+}
+CLASSIFIER_GRID = {
+    'max_depth': [5, 10, 20, None],
+    'min_samples_split': [2, 5, 10],
+    'min_samples_leaf': [1, 2, 4],
+    'criterion': ['gini', 'entropy'],
+}
+
+PRICE_NUMERIC = ['quantity tons_log', 'application', 'thickness_log', 'width', 'country', 'customer', 'product_ref']
+STATUS_NUMERIC = ['quantity tons_log', 'selling_price_log', 'application', 'thickness_log', 'width',
+                  'country', 'customer', 'product_ref']
+
+def source_signature(path):
+    """Hash of the source file's path, size and mtime, used to name the cache."""
+    stat = os.stat(path)
+    key = f"{os.path.abspath(path)}:{stat.st_size}:{stat.st_mtime_ns}"
+    return hashlib.sha1(key.encode()).hexdigest()[:12]
+
+def clean_data(df):
+    """
+    Clean the raw copper dataset the way the EDA notebook does.
+
+    Args:
+        df: raw data read from indcopper.csv
+
+    Returns:
+        pd.DataFrame: cleaned data with the log-transformed columns
+    """
+    df['item_date'] = pd.to_datetime(df['item_date'], format='%Y%m%d', errors='coerce')
+    df['delivery date'] = pd.to_datetime(df['delivery date'], format='%Y%m%d', errors='coerce')
+    for col in ['quantity tons', 'customer', 'country', 'application', 'thickness', 'width',
+                'product_ref', 'selling_price']:
+        df[col] = pd.to_numeric(df[col], errors='coerce')
+    df['material_ref'] = df['material_ref'].astype('string').str.lstrip('0').fillna('unknown')
+    df = df.dropna()
+
+    # Non-positive values cannot be log-transformed
+    df = df[(df['selling_price'] > 0) & (df['quantity tons'] > 0) & (df['thickness'] > 0)].copy()
+    for col in ['selling_price', 'quantity tons', 'thickness']:
+        df[f'{col}_log'] = np.log(df[col])
+    df['item type'] = df['item type'].astype(str)
+    df['status'] = df['status'].astype(str)
+    return df
+
+def load_clean_data(source, cache_dir):
+    """
+    Cleaned dataset, read from a Parquet cache when the source is unchanged.
+
+    Args:
+        source: path to indcopper.csv
+        cache_dir: directory for the cached Parquet files
+
+    Returns:
+        pd.DataFrame: cleaned data
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+    cache_path = os.path.join(cache_dir, f'copper_clean_{source_signature(source)}.parquet')
+    if os.path.exists(cache_path):
+        logger.info(f"Loading cleaned data from cache {cache_path}")
+        return pd.read_parquet(cache_path)
+
+    start = time.perf_counter()
+    df = clean_data(pd.read_csv(source))
+    df.to_parquet(cache_path, index=False)
+    logger.info(f"Cleaned {len(df)} rows in {time.perf_counter() - start:.1f}s, cached to {cache_path}")
+    return df
+
+def make_search(estimator, grid, scoring, search, cv):
+    """Grid or successive-halving search using every core."""
+    if search == 'halving':
+        return HalvingGridSearchCV(estimator, grid, scoring=scoring, cv=cv, factor=3,
+                                   random_state=42, n_jobs=-1)
+    return GridSearchCV(estimator, grid, scoring=scoring, cv=cv, n_jobs=-1)
+
+def log_candidates(name, search):
+    """Log score and fit time of every candidate of a finished search."""
+    results = search.cv_results_
+    for params, score, std, fit_time in zip(results['params'], results['mean_test_score'],
+                                            results['std_test_score'], results['mean_fit_time']):
+        logger.info(f"[{name}] score: {score:.4f} (+/- {std:.4f}), fit time: {fit_time:.3f}s, params: {params}")
+    logger.info(f"[{name}] best params: {search.best_params_}")
+
+def train_regressor(df, search='grid', cv=5):
+    """
+    Fit the selling-price model and its encoders.
+
+    Returns:
+        dict: model, scaler, item_type_encoder, status_encoder
+    """
+    t = OneHotEncoder(handle_unknown='ignore')
+    s = OneHotEncoder(handle_unknown='ignore')
+    X = np.concatenate((
+        df[PRICE_NUMERIC].to_numpy(dtype=np.float64),
+        t.fit_transform(df[['item type']]).toarray(),
+        s.fit_transform(df[['status']]).toarray(),
+    ), axis=1)
+    y = df['selling_price_log'].to_numpy()
+    scaler = StandardScaler()
+    X = scaler.fit_transform(X)
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.1, random_state=42)
+
+    searcher = make_search(DecisionTreeRegressor(random_state=42), REGRESSOR_GRID, 'r2', search, cv)
+    searcher.fit(X_train, y_train)
+    log_candidates('regressor', searcher)
+
+    model = searcher.best_estimator_
+    y_pred = model.predict(X_test)
+    logger.info(f"Regressor test MSE: {mean_squared_error(y_test, y_pred):.4f}, "
+                f"R-squared: {r2_score(y_test, y_pred):.4f}")
+    return {'model': model, 'scaler': scaler, 'item_type_encoder': t, 'status_encoder': s}
+
+def train_classifier(df, search='grid', cv=5):
+    """
+    Fit the Won/Lost model and its encoders on the Won and Lost rows.
+
+    Returns:
+        dict: model, scaler, item_type_encoder
+    """
+    df = df[df['status'].isin(['Won', 'Lost'])]
+    t = OneHotEncoder(handle_unknown='ignore')
+    X = np.concatenate((
+        df[STATUS_NUMERIC].to_numpy(dtype=np.float64),
+        t.fit_transform(df[['item type']]).toarray(),
+    ), axis=1)
+    # Won -> 1, Lost -> 0
+    y = LabelBinarizer().fit_transform(df['status']).ravel()
+    scaler = StandardScaler()
+    X = scaler.fit_transform(X)
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
+
+    searcher = make_search(DecisionTreeClassifier(random_state=42), CLASSIFIER_GRID, 'f1', search, cv)
+    searcher.fit(X_train, y_train)
+    log_candidates('classifier', searcher)
+
+    model = searcher.best_estimator_
+    y_pred = model.predict(X_test)
+    logger.info(f"Classifier test accuracy: {accuracy_score(y_test, y_pred):.4f}, "
+                f"F1: {f1_score(y_test, y_pred):.4f}")
+    logger.info(f"Confusion matrix:\n{confusion_matrix(y_test, y_pred)}")
+    return {'model': model, 'scaler': scaler, 'item_type_encoder': t}
+
+def save_artifacts(price, status, output_dir):
+    """Write the pickles App.py loads, under their original file names."""
+    files = {
+        'model.pkl': price['model'],
+        'scaler.pkl': price['scaler'],
+        't.pkl': price['item_type_encoder'],
+        's.pkl': price['status_encoder'],
+        'clsmodel.pkl': status['model'],
+        'cscaler.pkl': status['scaler'],
+        'ct.pkl': status['item_type_encoder'],
+    }
+    for filename, artifact in files.items():
+        with open(os.path.join(output_dir, filename), 'wb') as f:
+            pickle.dump(artifact, f)
+    logger.info(f"Saved {', '.join(files)} to {output_dir}")
+
+def parse_args():
+    """Parse command line options for the training pipeline."""
+    parser = argparse.ArgumentParser(description="Rebuild every Industrial_copper model artifact.")
+    parser.add_argument('--data', default='indcopper.csv', help="Raw copper dataset")
+    parser.add_argument('--output-dir', default='.', help="Where to write the pickles")
+    parser.add_argument('--cache-dir', default='cache', help="Where to cache the cleaned dataset")
+    parser.add_argument('--search', choices=['grid', 'halving'], default='grid',
+                        help="Exhaustive grid search or successive halving")
+    parser.add_argument('--cv', type=int, default=5, help="Cross-validation folds")
+    return parser.parse_args()
+
+def main():
+    """Clean the data, search both models and save all artifacts."""
+    args = parse_args()
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s',
+        handlers=[logging.StreamHandler(sys.stdout), logging.FileHandler('training.log')]
+    )
+    logger.info("Starting the copper training pipeline...")
+    start = time.perf_counter()
+
+    df = load_clean_data(args.data, args.cache_dir)
+    price = train_regressor(df, args.search, args.cv)
+    status = train_classifier(df, args.search, args.cv)
+    save_artifacts(price, status, args.output_dir)
+    save_pipelines(build_pipelines(ModelStore(args.output_dir)), args.output_dir)
+    logger.info(f"Saved category vocabularies and ranges to {save_metadata(build_metadata(df), args.output_dir)}")
+
+    logger.info(f"Training pipeline completed in {time.perf_counter() - start:.1f}s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,228 @@
+import pandas as pd
+import numpy as np
+import argparse
+import json
+import os
+import time
+from pathlib import Path
+
+CATEGORICAL_COLUMNS = ['Name', 'Cuisines', 'City', 'Rating_Text']
+# Smallest dtype that holds every value of the cleaned Zomato data
+NUMERIC_DTYPES = {
+    'Price_Range': np.int8,
+    'Has_Online_Delivery': np.int8,
+    'Is_Delivering_Now': np.int8,
+    'Votes': np.int32,
+    'Aggregate_Rating': np.float32,
+    'Average_Cost_For_Two': np.float32,
+}
+
+COMPACT_DIR = 'cleaned_data_compact'
+
+def split_cuisines(values):
+    """Comma-separated cuisine strings -> list of stripped tokens per row."""
+    return [[token.strip() for token in str(value).split(',') if token.strip()] for value in values]
+
+def cuisine_bitsets(cuisines):
+    """
+    Multi-hot cuisine membership, packed eight cuisines per byte.
+
+    Args:
+        cuisines: array-like of comma-separated cuisine strings
+
+    Returns:
+        tuple: (sorted cuisine vocabulary, uint8 array of shape (n_rows, ceil(n_cuisines / 8)))
+    """
+    tokens = pd.Series(np.asarray(cuisines, dtype=object)).astype(str).str.split(',').explode().str.strip()
+    tokens = tokens[tokens != '']
+    vocabulary = np.unique(tokens.to_numpy().astype(str))
+    multi_hot = np.zeros((len(cuisines), len(vocabulary)), dtype=bool)
+    multi_hot[tokens.index.to_numpy(), np.searchsorted(vocabulary, tokens.to_numpy().astype(str))] = True
+    return vocabulary.tolist(), np.packbits(multi_hot, axis=1)
+
+def has_cuisine(bits, vocabulary, cuisine):
+    """Boolean mask of the rows whose cuisines include `cuisine` (whole-token match)."""
+    j = int(np.searchsorted(vocabulary, cuisine))
+    if j >= len(vocabulary) or vocabulary[j] != cuisine:
+        return np.zeros(len(bits), dtype=bool)
+    return (bits[:, j >> 3] & (0x80 >> (j & 7))) != 0
+
+def compact_frame(df):
+    """
+    Categorical text columns and downcast numerics, with the same column order.
+
+    Args:
+        df: cleaned data as written by the preprocessing notebook
+
+    Returns:
+        pd.DataFrame: compact copy of df with a fresh RangeIndex
+    """
+    compact = {}
+    for col in df.columns:
+        if col in CATEGORICAL_COLUMNS or df[col].dtype == object:
+            # .array keeps the pd.Categorical; to_numpy() would turn it back into objects
+            compact[col] = df[col].astype(str).astype('category').array
+        elif col in NUMERIC_DTYPES:
+            compact[col] = df[col].to_numpy().astype(NUMERIC_DTYPES[col])
+        else:
+            compact[col] = df[col].to_numpy()
+    return pd.DataFrame(compact)
+
+class CompactRestaurants:
+    """
+    Compact restaurant table plus packed cuisine bitsets.
+
+    Saved as one .npy file per column (category codes for text columns) and a
+    meta.json with the categories, so the arrays can be memory-mapped on load
+    instead of unpickling a frame of Python strings.
+    """
+
+    def __init__(self, df, vocabulary, bits):
+        self.df = df
+        self.vocabulary = vocabulary
+        self.bits = bits
+
+    @classmethod
+    def from_frame(cls, df):
+        df = compact_frame(df)
+        vocabulary, bits = cuisine_bitsets(df['Cuisines'].astype(str).to_numpy())
+        return cls(df, vocabulary, bits)
+
+    def filter(self, city, cuisine):
+        """Rows of `city` serving `cuisine`, using category codes and the bitsets."""
+        cities = self.df['City'].cat.categories
+        if city not in cities:
+            return self.df.iloc[:0]
+        mask = (self.df['City'].cat.codes.to_numpy() == cities.get_loc(city)) \
+            & has_cuisine(self.bits, self.vocabulary, cuisine)
+        return self.df.iloc[np.flatnonzero(mask)]
+
+    def save(self, directory=COMPACT_DIR):
+        """Write the columns, the bitsets and meta.json to a directory."""
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        meta = {'columns': [], 'categories': {}, 'cuisines': self.vocabulary}
+        for i, col in enumerate(self.df.columns):
+            values = self.df[col]
+            if isinstance(values.dtype, pd.CategoricalDtype):
+                meta['categories'][col] = values.cat.categories.tolist()
+                values = values.cat.codes
+            np.save(directory / f'column_{i}.npy', np.ascontiguousarray(values.to_numpy()))
+            meta['columns'].append(col)
+        np.save(directory / 'cuisine_bits.npy', self.bits)
+        with open(directory / 'meta.json', 'w') as f:
+            json.dump(meta, f)
+
+    @classmethod
+    def load(cls, directory=COMPACT_DIR, mmap=True):
+        """
+        Load a table written by `save`.
+
+        Args:
+            directory: directory holding the .npy files and meta.json
+            mmap: memory-map the arrays instead of reading them into memory
+
+        Returns:
+            CompactRestaurants: loaded table
+        """
+        directory = Path(directory)
+        with open(directory / 'meta.json') as f:
+            meta = json.load(f)
+        mmap_mode = 'r' if mmap else None
+        columns = {}
+        for i, col in enumerate(meta['columns']):
+            values = np.load(directory / f'column_{i}.npy', mmap_mode=mmap_mode)
+            if col in meta['categories']:
+                values = pd.Categorical.from_codes(values, categories=meta['categories'][col])
+            columns[col] = values
+        df = pd.DataFrame(columns, copy=False)
+        bits = np.load(directory / 'cuisine_bits.npy', mmap_mode=mmap_mode)
+        return cls(df, meta['cuisines'], bits)
+
+def check_round_trip(df, directory=COMPACT_DIR, queries=()):
+    """
+    Check that the saved table loads memory-mapped and matches a fresh build.
+
+    Raises ValueError when the loaded columns, the cuisine bitsets or any
+    (city, cuisine) filter result differ from the table built from `df`.
+    """
+    built = CompactRestaurants.from_frame(df)
+    loaded = CompactRestaurants.load(directory, mmap=True)
+    # Memory-mapped columns are np.memmap, which assert_frame_equal treats as a different class
+    columns = {col: values if isinstance(values.dtype, pd.CategoricalDtype) else np.asarray(values)
+               for col, values in loaded.df.items()}
+    try:
+        pd.testing.assert_frame_equal(pd.DataFrame(columns, index=loaded.df.index), built.df)
+    except AssertionError as e:
+        raise ValueError(f"Compact table in {directory} differs from the source data: {e}")
+    if list(loaded.vocabulary) != list(built.vocabulary) or not np.array_equal(loaded.bits, built.bits):
+        raise ValueError(f"Cuisine bitsets in {directory} differ from the source data")
+    for city, cuisine in queries:
+        if not built.filter(city, cuisine).index.equals(loaded.filter(city, cuisine).index):
+            raise ValueError(f"Filter ({city!r}, {cuisine!r}) differs after loading {directory}")
+
+def is_current(directory=COMPACT_DIR, pickle_path='cleaned_data.pkl'):
+    """Whether the compact table exists and was built after the last change to the pickle."""
+    meta_path = os.path.join(directory, 'meta.json')
+    if not os.path.exists(meta_path):
+        return False
+    return not os.path.exists(pickle_path) or os.path.getmtime(meta_path) >= os.path.getmtime(pickle_path)
+
+def report(pickle_path='cleaned_data.pkl', directory=COMPACT_DIR, n_queries=200, seed=42):
+    """
+    Compare memory and (city, cuisine) filter time of the pickle and the compact table,
+    after checking that the saved table round-trips (see check_round_trip).
+
+    Returns:
+        dict: memory in MB and mean filter time in ms for both representations
+    """
+    df = pd.read_pickle(pickle_path)
+    compact = CompactRestaurants.load(directory, mmap=False)
+
+    rng = np.random.default_rng(seed)
+    rows = rng.integers(0, len(df), n_queries)
+    queries = [(compact.df['City'].iloc[row], rng.choice(split_cuisines([compact.df['Cuisines'].iloc[row]])[0]))
+               for row in rows]
+    check_round_trip(df, directory, queries)
+
+    start = time.perf_counter()
+    for city, cuisine in queries:
+        df[(df['City'] == city) & (df['Cuisines'].str.contains(cuisine, na=False, regex=False))]
+    pickle_ms = (time.perf_counter() - start) / n_queries * 1000
+
+    start = time.perf_counter()
+    for city, cuisine in queries:
+        compact.filter(city, cuisine)
+    compact_ms = (time.perf_counter() - start) / n_queries * 1000
+
+    pickle_mb = df.memory_usage(deep=True).sum() / 1e6
+    compact_mb = (compact.df.memory_usage(deep=True).sum() + compact.bits.nbytes) / 1e6
+    return {
+        'rows': len(df),
+        'pickle_mb': pickle_mb,
+        'compact_mb': compact_mb,
+        'pickle_filter_ms': pickle_ms,
+        'compact_filter_ms': compact_ms,
+    }
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Build the compact, memory-mappable restaurant table.")
+    parser.add_argument('--input', default='cleaned_data.pkl', help="Cleaned data pickle")
+    parser.add_argument('--output', default=COMPACT_DIR, help="Directory for the compact table")
+    parser.add_argument('--report', action='store_true', help="Compare memory and filter speed with the pickle")
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+    CompactRestaurants.from_frame(pd.read_pickle(args.input)).save(args.output)
+    print(f"Wrote compact table to {args.output}")
+    if args.report:
+        result = report(args.input, args.output)
+        print(f"Rows: {result['rows']} (save -> load -> filter round trip OK)")
+        print(f"Memory: {result['pickle_mb']:.2f} MB -> {result['compact_mb']:.2f} MB "
+              f"({result['pickle_mb'] / result['compact_mb']:.1f}x smaller)")
+        print(f"Filter: {result['pickle_filter_ms']:.3f} ms -> {result['compact_filter_ms']:.3f} ms "
+              f"({result['pickle_filter_ms'] / result['compact_filter_ms']:.1f}x faster)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,199 @@
+import numpy as np
+import json
+import logging
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+# singapore/ and Zomato_resatuarant_likeprediction/ each keep an identical copy of this
+# file: every project runs and deploys from its own directory, so neither imports the
+# other. Change both copies together.
+
+# Marker used by scikit-learn for "no child" in tree_.children_left/right
+TREE_LEAF = -1
+
+# Upper bound on (rows x trees) node indices held in memory at once
+BLOCK_NODES = 1 << 20
+
+ARRAY_NAMES = ['feature', 'threshold', 'left', 'right', 'value', 'roots']
+
+
+class CompactForest:
+    """
+    Tree ensemble stored as flat, contiguous NumPy node tables.
+
+    All trees of a fitted RandomForestRegressor or GradientBoostingRegressor are
+    concatenated into one set of arrays (split feature, threshold, left/right
+    child, leaf value). The arrays are saved as plain .npy files so they can be
+    memory-mapped on load instead of unpickling thousands of Tree objects.
+    """
+
+    def __init__(self, feature, threshold, left, right, value, roots,
+                 base=0.0, scale=1.0, max_depth=0, n_features=0,
+                 feature_importances=None):
+        self.feature = feature
+        self.threshold = threshold
+        self.left = left
+        self.right = right
+        self.value = value
+        self.roots = roots
+        self.base = base
+        self.scale = scale
+        self.max_depth = max_depth
+        self.n_features = n_features
+        self.feature_importances_ = feature_importances
+
+    @classmethod
+    def from_estimator(cls, model):
+        """
+        Compile a fitted scikit-learn forest into node tables.
+
+        Args:
+            model: fitted RandomForestRegressor or GradientBoostingRegressor
+
+        Returns:
+            CompactForest: equivalent compact model
+        """
+        if hasattr(model, 'init_'):
+            # Gradient boosting: init prediction plus learning_rate * sum(trees)
+            trees = [est.tree_ for est in model.estimators_.ravel()]
+            base = float(model.init_.predict(np.zeros((1, model.n_features_in_)))[0])
+            scale = float(model.learning_rate)
+        else:
+            # Random forest: mean of the tree predictions
+            trees = [est.tree_ for est in model.estimators_]
+            base = 0.0
+            scale = 1.0 / len(trees)
+
+        offsets = np.cumsum([0] + [tree.node_count for tree in trees])
+        feature, threshold, left, right, value = [], [], [], [], []
+        for offset, tree in zip(offsets, trees):
+            is_leaf = tree.children_left == TREE_LEAF
+            # Leaves get feature 0 so the gather in predict never goes out of range
+            feature.append(np.where(is_leaf, 0, tree.feature))
+            threshold.append(tree.threshold)
+            left.append(np.where(is_leaf, TREE_LEAF, tree.children_left + offset))
+            right.append(np.where(is_leaf, TREE_LEAF, tree.children_right + offset))
+            value.append(tree.value[:, 0, 0])
+
+        return cls(
+            feature=np.concatenate(feature).astype(np.int32),
+            threshold=np.concatenate(threshold).astype(np.float64),
+            left=np.concatenate(left).astype(np.int32),
+            right=np.concatenate(right).astype(np.int32),
+            value=np.concatenate(value).astype(np.float64),
+            roots=offsets[:-1].astype(np.int32),
+            base=base,
+            scale=scale,
+            max_depth=max(tree.max_depth for tree in trees),
+            n_features=int(model.n_features_in_),
+            feature_importances=np.asarray(model.feature_importances_, dtype=np.float64),
+        )
+
+    def save(self, directory):
+        """
+        Write the node tables and metadata to a directory.
+
+        Args:
+            directory: target directory, created if missing
+        """
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        for name in ARRAY_NAMES:
+            np.save(directory / f'{name}.npy', np.ascontiguousarray(getattr(self, name)))
+        meta = {
+            'base': self.base,
+            'scale': self.scale,
+            'max_depth': int(self.max_depth),
+            'n_features': self.n_features,
+            'feature_importances': [float(v) for v in self.feature_importances_],
+        }
+        with open(directory / 'meta.json', 'w') as f:
+            json.dump(meta, f, indent=2)
+
+    @classmethod
+    def load(cls, directory, mmap=True):
+        """
+        Load node tables written by `save`.
+
+        Args:
+            directory: directory holding the .npy files and meta.json
+            mmap: memory-map the arrays instead of reading them into memory
+
+        Returns:
+            CompactForest: loaded model
+        """
+        directory = Path(directory)
+        with open(directory / 'meta.json') as f:
+            meta = json.load(f)
+        mmap_mode = 'r' if mmap else None
+        arrays = {name: np.load(directory / f'{name}.npy', mmap_mode=mmap_mode)
+                  for name in ARRAY_NAMES}
+        return cls(
+            base=meta['base'],
+            scale=meta['scale'],
+            max_depth=meta['max_depth'],
+            n_features=meta['n_features'],
+            feature_importances=np.array(meta['feature_importances']),
+            **arrays
+        )
+
+    @property
+    def n_trees(self):
+        return len(self.roots)
+
+    def predict(self, X):
+        """
+        Predict for all rows, walking every tree level by level in lockstep.
+
+        Args:
+            X: array of shape (n_samples, n_features), already scaled
+
+        Returns:
+            np.ndarray: predictions of shape (n_samples,)
+        """
+        # scikit-learn evaluates splits on float32 inputs
+        X = np.asarray(X, dtype=np.float32)
+        if X.ndim != 2 or X.shape[1] != self.n_features:
+            raise ValueError(f"Expected input with {self.n_features} features, got shape {X.shape}")
+
+        predictions = np.empty(len(X), dtype=np.float64)
+        block = max(1, BLOCK_NODES // self.n_trees)
+        for start in range(0, len(X), block):
+            X_block = X[start:start + block]
+            rows = np.arange(len(X_block))[:, None]
+            node = np.tile(self.roots, (len(X_block), 1))
+            for _ in range(self.max_depth):
+                left = self.left[node]
+                is_leaf = left == TREE_LEAF
+                if is_leaf.all():
+                    break
+                go_left = X_block[rows, self.feature[node]] <= self.threshold[node]
+                node = np.where(is_leaf, node, np.where(go_left, left, self.right[node]))
+            predictions[start:start + block] = self.base + self.scale * self.value[node].sum(axis=1)
+        return predictions
+
+
+def export_forest(model, directory, X_check=None, atol=1e-3):
+    """
+    Compile a fitted forest, verify it against the original and save it.
+
+    Args:
+        model: fitted RandomForestRegressor or GradientBoostingRegressor
+        directory: output directory for the node tables
+        X_check: optional scaled sample used to compare predictions
+        atol: largest absolute prediction difference accepted
+
+    Returns:
+        CompactForest: the compiled model
+    """
+    compact = CompactForest.from_estimator(model)
+    if X_check is not None:
+        max_diff = float(np.max(np.abs(compact.predict(X_check) - model.predict(X_check))))
+        logger.info(f"Compact model max absolute difference: {max_diff:.6g}")
+        if max_diff > atol:
+            raise ValueError(f"Compact model differs from original by {max_diff:.6g} (tolerance {atol})")
+    compact.save(directory)
+    logger.info(f"Compact model with {compact.n_trees} trees and "
+                f"{len(compact.feature)} nodes saved in {directory}")
+    return compact
@@ -0,0 +1,129 @@
+import pandas as pd
+import numpy as np
+import argparse
+import json
+import os
+import time
+from pathlib import Path
+
+from predictor import CostPredictor, ARTIFACT_FILES
+from compact_forest import CompactForest
+
+MODEL_DIR = 'compact_model'
+
+def export_model(predictor, directory=MODEL_DIR):
+    """
+    Write the forest node tables and the encoder/scaler lookups.
+
+    Args:
+        predictor: CostPredictor wrapping the pickled random forest
+        directory: output directory
+    """
+    directory = Path(directory)
+    CompactForest.from_estimator(predictor.model).save(directory / 'forest')
+    meta = {
+        'vocabularies': {col: values.tolist() for col, values in predictor.vocabularies.items()},
+        'input_columns': predictor.input_columns,
+        'input_min': predictor.input_min.tolist(),
+        'input_scale': predictor.input_scale.tolist(),
+        'target_min': predictor.target_min,
+        'target_scale': predictor.target_scale,
+        'feature_names': predictor.feature_names,
+    }
+    with open(directory / 'meta.json', 'w') as f:
+        json.dump(meta, f)
+
+def load_predictor(directory=MODEL_DIR, mmap=True):
+    """CostPredictor backed by the compact forest, without unpickling anything."""
+    directory = Path(directory)
+    with open(directory / 'meta.json') as f:
+        meta = json.load(f)
+    return CostPredictor(
+        model=CompactForest.load(directory / 'forest', mmap=mmap),
+        vocabularies=meta['vocabularies'],
+        input_columns=meta['input_columns'],
+        input_min=meta['input_min'],
+        input_scale=meta['input_scale'],
+        target_min=meta['target_min'],
+        target_scale=meta['target_scale'],
+        feature_names=meta['feature_names'],
+    )
+
+def is_current(model_dir=MODEL_DIR, directory='.'):
+    """
+    Whether an export exists and is not older than any training pickle.
+
+    ingest.py rewrites the encoders and scalers; an export from before that
+    would pair the old vocabularies and forest with the new data.
+    """
+    meta_path = os.path.join(model_dir, 'meta.json')
+    # Exports from before the forest was written by compact_forest.py have no forest/meta.json
+    if not os.path.exists(meta_path) or not os.path.exists(os.path.join(model_dir, 'forest', 'meta.json')):
+        return False
+    sources = [os.path.join(directory, name) for name in ARTIFACT_FILES]
+    newest = max((os.path.getmtime(path) for path in sources if os.path.exists(path)), default=0)
+    return os.path.getmtime(meta_path) >= newest
+
+def check(original, compact, frame, rtol=1e-6):
+    """Largest relative difference between the two predictors on `frame`; raises above `rtol`."""
+    expected, _ = original.predict(frame)
+    actual, _ = compact.predict(frame)
+    valid = ~np.isnan(expected)
+    max_diff = float(np.max(np.abs(actual[valid] - expected[valid]) / np.maximum(np.abs(expected[valid]), 1.0)))
+    if max_diff > rtol:
+        raise ValueError(f"Compact model differs from the pickled model by {max_diff:.3g} (tolerance {rtol})")
+    return max_diff
+
+def benchmark(directory='.', model_dir=MODEL_DIR, frame=None, repeats=50):
+    """
+    Compare load time and prediction latency of the pickles and the compact model.
+
+    Returns:
+        dict: timings in milliseconds
+    """
+    start = time.perf_counter()
+    original = CostPredictor.load(directory)
+    pickle_load = (time.perf_counter() - start) * 1000
+    start = time.perf_counter()
+    compact = load_predictor(model_dir)
+    compact_load = (time.perf_counter() - start) * 1000
+
+    results = {'pickle_load_ms': pickle_load, 'compact_load_ms': compact_load}
+    for name, predictor in [('pickle', original), ('compact', compact)]:
+        single = frame.iloc[:1]
+        start = time.perf_counter()
+        for _ in range(repeats):
+            predictor.predict(single)
+        results[f'{name}_single_ms'] = (time.perf_counter() - start) / repeats * 1000
+        start = time.perf_counter()
+        predictor.predict(frame)
+        results[f'{name}_batch_ms'] = (time.perf_counter() - start) * 1000
+    results['batch_rows'] = len(frame)
+    results['max_rel_diff'] = check(original, compact, frame)
+    return results
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Export the cost model to a compact, pickle-free format.")
+    parser.add_argument('--models-dir', default='.', help="Directory holding the training pickles")
+    parser.add_argument('--output', default=MODEL_DIR, help="Directory for the compact model")
+    parser.add_argument('--data', default='cleaned_data.pkl', help="Rows used to verify the export")
+    parser.add_argument('--benchmark', action='store_true', help="Compare load time and latency with the pickles")
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+    original = CostPredictor.load(args.models_dir)
+    export_model(original, args.output)
+    frame = pd.read_pickle(args.data)
+    max_diff = check(original, load_predictor(args.output), frame)
+    print(f"Wrote compact model to {args.output} (max relative difference {max_diff:.2g} on {len(frame)} rows)")
+
+    if args.benchmark:
+        results = benchmark(args.models_dir, args.output, frame)
+        print(f"Load:   {results['pickle_load_ms']:8.1f} ms -> {results['compact_load_ms']:8.1f} ms")
+        print(f"Single: {results['pickle_single_ms']:8.2f} ms -> {results['compact_single_ms']:8.2f} ms")
+        print(f"Batch:  {results['pickle_batch_ms']:8.1f} ms -> {results['compact_batch_ms']:8.1f} ms "
+              f"({results['batch_rows']} rows)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+import pandas as pd
+from sklearn.preprocessing import LabelEncoder, MinMaxScaler
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+import argparse
+import hashlib
+import json
+import pickle
+import time
+
+from compact_data import CompactRestaurants, COMPACT_DIR
+
+PARQUET_DIR = 'ingested'
+MANIFEST_FILE = 'manifest.json'
+
+# Same columns, encoders and scalers as the training cell of zomato_learning.ipynb
+COLUMNS_TO_KEEP = [
+    'Name',
+    'Cuisines',
+    'Price_Range',
+    'Has_Online_Delivery',
+    'Is_Delivering_Now',
+    'City',
+    'Aggregate_Rating',
+    'Rating_Text',
+    'Votes',
+    'Average_Cost_For_Two'
+]
+CATEGORICAL_COLUMNS = ['Cuisines', 'City', 'Rating_Text']
+NUMERICAL_FEATURES = ['Votes', 'Aggregate_Rating']
+FEATURE_COLUMNS = ['Cuisines', 'Price_Range', 'Has_Online_Delivery', 'Is_Delivering_Now',
+                   'City', 'Aggregate_Rating', 'Rating_Text', 'Votes']
+
+def file_hash(path, block_size=1 << 20):
+    """SHA-256 of a file's content."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def convert_file(source, target):
+    """
+    Read one Excel export and write it as Parquet.
+
+    Object columns mixing numbers and strings (e.g. a numeric-looking
+    restaurant name) are written as strings so every file has a stable schema.
+
+    Returns:
+        int: number of rows written
+    """
+    df = pd.read_excel(source)
+    for col in df.columns[df.dtypes == object]:
+        df[col] = df[col].where(df[col].isna(), df[col].astype(str))
+    df.to_parquet(target, index=False)
+    return len(df)
+
+def load_manifest(parquet_dir=PARQUET_DIR):
+    path = Path(parquet_dir) / MANIFEST_FILE
+    if not path.exists():
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+def ingest(sources, parquet_dir=PARQUET_DIR, max_workers=None):
+    """
+    Convert changed Excel files to Parquet, in parallel across files.
+
+    A file is skipped when its content hash matches the manifest and its
+    Parquet file still exists.
+
+    Args:
+        sources: Excel files, in the order their rows should be concatenated
+        parquet_dir: directory for the Parquet files and manifest.json
+        max_workers: worker processes, one per CPU by default
+
+    Returns:
+        dict: the updated manifest, source file name -> sha256, parquet path, rows
+    """
+    parquet_dir = Path(parquet_dir)
+    parquet_dir.mkdir(parents=True, exist_ok=True)
+    manifest = load_manifest(parquet_dir)
+
+    pending = {}
+    for source in sources:
+        source = Path(source)
+        digest = file_hash(source)
+        entry = manifest.get(source.name)
+        target = parquet_dir / f'{source.stem}.parquet'
+        if entry and entry['sha256'] == digest and target.exists():
+            print(f"Unchanged: {source.name}")
+            continue
+        pending[source.name] = (source, target, digest)
+
+    if pending:
+        start = time.perf_counter()
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = {name: executor.submit(convert_file, str(source), str(target))
+                       for name, (source, target, _) in pending.items()}
+            for name, future in futures.items():
+                _, target, digest = pending[name]
+                manifest[name] = {'sha256': digest, 'parquet': target.name, 'rows': future.result()}
+                print(f"Converted: {name} ({manifest[name]['rows']} rows)")
+        print(f"Converted {len(pending)} file(s) in {time.perf_counter() - start:.1f}s")
+
+    manifest = {Path(source).name: manifest[Path(source).name] for source in sources}
+    with open(parquet_dir / MANIFEST_FILE, 'w') as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+def load_ingested(manifest, parquet_dir=PARQUET_DIR):
+    """Concatenate the Parquet files in manifest order, like pd.concat of the Excel files."""
+    frames = [pd.read_parquet(Path(parquet_dir) / entry['parquet'], columns=COLUMNS_TO_KEEP)
+              for entry in manifest.values()]
+    return pd.concat(frames, ignore_index=True)
+
+def clean(df):
+    """Keep the model and display columns and drop incomplete rows."""
+    return df[COLUMNS_TO_KEEP].dropna()
+
+def fit_preprocessors(df_cleaned):
+    """
+    Fit the label encoders and scalers the app loads.
+
+    LabelEncoder sorts its classes and MinMaxScaler only depends on the
+    column range, so the same input always gives the same artifacts.
+
+    Returns:
+        tuple: (label_encoders dict, input_scaler, target_scaler)
+    """
+    label_encoders = {}
+    for col in CATEGORICAL_COLUMNS:
+        label_encoders[col] = LabelEncoder().fit(df_cleaned[col].astype(str))
+    input_scaler = MinMaxScaler().fit(df_cleaned[NUMERICAL_FEATURES])
+    target_scaler = MinMaxScaler().fit(df_cleaned[['Average_Cost_For_Two']])
+    return label_encoders, input_scaler, target_scaler
+
+def save_artifacts(df_cleaned, label_encoders, input_scaler, target_scaler, output_dir='.'):
+    """Write cleaned_data.pkl and the preprocessing pickles."""
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    df_cleaned.to_pickle(output_dir / 'cleaned_data.pkl')
+    artifacts = {
+        'label_encoders.pkl': label_encoders,
+        'input_scaler.pkl': input_scaler,
+        'target_scaler.pkl': target_scaler,
+        'feature_names.pkl': FEATURE_COLUMNS,
+    }
+    for filename, artifact in artifacts.items():
+        with open(output_dir / filename, 'wb') as f:
+            pickle.dump(artifact, f)
+    print("Saved files:")
+    for filename in ['cleaned_data.pkl'] + list(artifacts):
+        print(f"- {filename}")
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Ingest the Zomato Excel exports and rebuild the cleaned data.")
+    parser.add_argument('sources', nargs='*', help="Excel files to ingest (default: file*.xlsx)")
+    parser.add_argument('--parquet-dir', default=PARQUET_DIR, help="Directory for the Parquet cache")
+    parser.add_argument('--output-dir', default='.', help="Where to write cleaned_data.pkl and the pickles")
+    parser.add_argument('--workers', type=int, default=None, help="Worker processes for the conversion")
+    parser.add_argument('--compact', action='store_true', help="Also rebuild the compact table (compact_data.py)")
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+    sources = args.sources or sorted(str(path) for path in Path('.').glob('file*.xlsx'))
+    if not sources:
+        raise SystemExit("No Excel files to ingest")
+
+    manifest = ingest(sources, args.parquet_dir, args.workers)
+    df_cleaned = clean(load_ingested(manifest, args.parquet_dir))
+    print(f"Cleaned data: {len(df_cleaned)} rows")
+    save_artifacts(df_cleaned, *fit_preprocessors(df_cleaned), output_dir=args.output_dir)
+
+    if args.compact:
+        CompactRestaurants.from_frame(df_cleaned).save(Path(args.output_dir) / COMPACT_DIR)
+        print(f"- {COMPACT_DIR}/")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+import pandas as pd
+import numpy as np
+import argparse
+import pickle
+import time
+
+CATEGORICAL_COLUMNS = ['Cuisines', 'City', 'Rating_Text']
+# Files written by the training notebook / ingest.py, in from_artifacts order
+ARTIFACT_FILES = ['restaurant_cost_prediction_model.pkl', 'label_encoders.pkl', 'input_scaler.pkl',
+                  'target_scaler.pkl', 'feature_names.pkl']
+NUMERICAL_FEATURES = ['Votes', 'Aggregate_Rating']
+
+class CostPredictor:
+    """
+    Vectorized cost-for-two prediction for many restaurants at once.
+
+    Categorical values are encoded with np.searchsorted against the sorted
+    LabelEncoder classes and the MinMax scalers are applied as plain array
+    arithmetic, so a batch of any size costs one `model.predict` call.
+    """
+
+    def __init__(self, model, vocabularies, input_columns, input_min, input_scale,
+                 target_min, target_scale, feature_names):
+        self.model = model
+        self.feature_names = list(feature_names)
+        # Sorted class labels per categorical column; a label's code is its position
+        self.vocabularies = {col: np.asarray(values).astype(str) for col, values in vocabularies.items()}
+        self.input_columns = list(input_columns)
+        self.input_min = np.asarray(input_min, dtype=np.float64)
+        self.input_scale = np.asarray(input_scale, dtype=np.float64)
+        self.target_min = float(target_min)
+        self.target_scale = float(target_scale)
+
+    @classmethod
+    def from_artifacts(cls, model, label_encoders, input_scaler, target_scaler, feature_names):
+        """Build a predictor from the fitted encoders and scalers of the training notebook."""
+        return cls(
+            model=model,
+            vocabularies={col: label_encoders[col].classes_ for col in CATEGORICAL_COLUMNS},
+            input_columns=getattr(input_scaler, 'feature_names_in_', NUMERICAL_FEATURES),
+            input_min=input_scaler.min_,
+            input_scale=input_scaler.scale_,
+            target_min=target_scaler.min_[0],
+            target_scale=target_scaler.scale_[0],
+            feature_names=feature_names,
+        )
+
+    @classmethod
+    def load(cls, directory='.'):
+        """Build a predictor from the pickles written by the training notebook."""
+        artifacts = []
+        for filename in ARTIFACT_FILES:
+            with open(f"{directory}/{filename}", 'rb') as file:
+                artifacts.append(pickle.load(file))
+        return cls.from_artifacts(*artifacts)
+
+    def encode(self, col, values):
+        """
+        Label-encode a column of values.
+
+        Returns:
+            np.ndarray: integer codes, -1 for values the encoder never saw
+        """
+        vocabulary = self.vocabularies[col]
+        values = np.asarray(values).astype(str)
+        codes = np.searchsorted(vocabulary, values)
+        known = codes < len(vocabulary)
+        known[known] = vocabulary[codes[known]] == values[known]
+        return np.where(known, codes, -1)
+
+    def predict(self, frame):
+        """
+        Predict the cost for two of every row.
+
+        Args:
+            frame: DataFrame with the raw (unencoded, unscaled) feature columns
+
+        Returns:
+            tuple: (np.ndarray of predicted costs with NaN for rows that could
+                not be encoded, pd.Series of error messages)
+        """
+        errors = pd.Series('', index=frame.index)
+        features = {}
+        for col in self.feature_names:
+            if col in self.vocabularies:
+                codes = self.encode(col, frame[col])
+                errors[codes < 0] += f"unknown {col}; "
+                features[col] = codes
+            else:
+                features[col] = pd.to_numeric(frame[col], errors='coerce').to_numpy(dtype=np.float64)
+                errors[np.isnan(features[col])] += f"invalid {col}; "
+
+        for i, col in enumerate(self.input_columns):
+            features[col] = features[col] * self.input_scale[i] + self.input_min[i]
+
+        valid = (errors == '').to_numpy()
+        predictions = np.full(len(frame), np.nan)
+        if valid.any():
+            # Same column names as in training, so scikit-learn does not warn
+            X = pd.DataFrame({col: features[col][valid] for col in self.feature_names})
+            scaled = self.model.predict(X)
+            predictions[valid] = (scaled - self.target_min) / self.target_scale
+        return predictions, errors.str.rstrip('; ')
+
+    def compare_cuisines(self, city, cuisines, settings):
+        """
+        Predict every candidate cuisine for one city in a single call.
+
+        Args:
+            city: selected city
+            cuisines: candidate cuisines
+            settings: the remaining feature values shared by all candidates
+
+        Returns:
+            pd.DataFrame: 'Cuisine' and 'Predicted_Cost', most expensive first;
+                cuisines the model was not trained on are left out
+        """
+        candidates = pd.DataFrame({'Cuisines': list(cuisines)})
+        candidates['City'] = city
+        for col, value in settings.items():
+            candidates[col] = value
+        candidates = candidates[self.encode('Cuisines', candidates['Cuisines']) >= 0]
+        predictions, _ = self.predict(candidates)
+        ranked = pd.DataFrame({'Cuisine': candidates['Cuisines'].to_numpy(), 'Predicted_Cost': predictions})
+        return ranked.dropna().sort_values('Predicted_Cost', ascending=False, ignore_index=True)
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Score a CSV of restaurants with the cost-for-two model.")
+    parser.add_argument('input', help="CSV with the columns in feature_names.pkl")
+    parser.add_argument('output', help="CSV to write the input plus Predicted_Cost and Error to")
+    parser.add_argument('--models-dir', default='.', help="Directory holding the model pickles")
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+    predictor = CostPredictor.load(args.models_dir)
+    frame = pd.read_csv(args.input)
+    missing = [col for col in predictor.feature_names if col not in frame.columns]
+    if missing:
+        raise SystemExit(f"Missing required columns: {missing}")
+
+    start = time.perf_counter()
+    predictions, errors = predictor.predict(frame)
+    elapsed = time.perf_counter() - start
+    frame['Predicted_Cost'] = predictions
+    frame['Error'] = errors
+    frame.to_csv(args.output, index=False)
+    print(f"Scored {len(frame)} rows in {elapsed:.3f}s, {int((errors != '').sum())} could not be scored")
+
+if __name__ == "__main__":
+    main()
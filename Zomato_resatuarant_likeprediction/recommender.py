@@ -0,0 +1,172 @@
+import pandas as pd
+import numpy as np
+import argparse
+import time
+
+from compact_data import cuisine_bitsets
+
+# Relative weight of each block of the restaurant vector
+WEIGHTS = {
+    'cuisines': 1.0,
+    'price_range': 0.6,
+    'rating': 0.5,
+    'votes': 0.3,
+    'delivery': 0.2,
+}
+
+class RestaurantIndex:
+    """
+    k-nearest-neighbour search over restaurant feature vectors.
+
+    Every restaurant becomes a unit-length float32 vector of weighted blocks:
+    multi-hot cuisines, price range, rating, log votes and the two delivery
+    flags. Similarity is the dot product (cosine), computed for all candidates
+    in one matrix-vector product, and the top k are taken with argpartition.
+    Rows are grouped by city up front so a city filter only scores that city.
+
+    The cleaned data lists many restaurants several times, so only the first
+    row of each (Name, City) is a candidate, and rows with the query's own
+    Name and City are never returned.
+    """
+
+    def __init__(self, vectors, cities, identities=None):
+        self.vectors = vectors
+        self.cities = np.asarray(cities)
+        # Restaurant id per row; rows sharing one are copies of the same restaurant
+        self.identities = np.arange(len(self.cities)) if identities is None else np.asarray(identities)
+        _, first = np.unique(self.identities, return_index=True)
+        self.candidates = np.sort(first)
+        # Scored on every unfiltered query, so gathered once here rather than per query
+        self.candidate_vectors = vectors if len(self.candidates) == len(vectors) else vectors[self.candidates]
+        cities = self.cities[self.candidates]
+        order = np.argsort(cities, kind='stable')
+        boundaries = np.flatnonzero(np.r_[True, cities[order][1:] != cities[order][:-1], True])
+        self.city_rows = {cities[order[start]]: self.candidates[order[start:end]]
+                          for start, end in zip(boundaries[:-1], boundaries[1:])}
+
+    @classmethod
+    def from_frame(cls, df):
+        cities = df['City'].astype(str).to_numpy()
+        identities, _ = pd.factorize(pd.MultiIndex.from_arrays([df['Name'].astype(str).to_numpy(), cities]))
+        return cls(embed(df), cities, identities)
+
+    def similar(self, position, k=10, city=None):
+        """
+        The k restaurants most similar to the one at `position`.
+
+        Args:
+            position: row position of the query restaurant
+            k: number of neighbours
+            city: only return restaurants in this city
+
+        Returns:
+            tuple: (row positions, similarity scores), most similar first
+        """
+        if city is None:
+            rows = self.candidates
+            scores = self.candidate_vectors @ self.vectors[position]
+        else:
+            rows = self.city_rows.get(city, np.empty(0, dtype=np.int64))
+            scores = self.vectors[rows] @ self.vectors[position]
+
+        # Never recommend the query restaurant itself or a copy of it
+        is_self = self.identities[rows] == self.identities[position]
+        scores[is_self] = -np.inf
+        k = min(k, len(scores) - int(is_self.sum()))
+        if k <= 0:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind='stable')]
+        return rows[top], scores[top]
+
+def embed(df):
+    """
+    Weighted, L2-normalized float32 feature vector per restaurant.
+
+    Args:
+        df: cleaned restaurant data
+
+    Returns:
+        np.ndarray: float32 matrix of shape (len(df), n_cuisines + 5)
+    """
+    vocabulary, bits = cuisine_bitsets(df['Cuisines'].astype(str).to_numpy())
+    cuisines = np.unpackbits(bits, axis=1, count=len(vocabulary)).astype(np.float32)
+    # Each restaurant's cuisine block has unit length however many cuisines it lists
+    cuisines /= np.maximum(np.sqrt(cuisines.sum(axis=1, keepdims=True)), 1.0)
+
+    votes = np.log1p(df['Votes'].to_numpy(dtype=np.float32))
+    numeric = np.column_stack([
+        WEIGHTS['price_range'] * (df['Price_Range'].to_numpy(dtype=np.float32) - 1) / 3,
+        WEIGHTS['rating'] * df['Aggregate_Rating'].to_numpy(dtype=np.float32) / 5,
+        WEIGHTS['votes'] * votes / max(float(votes.max()), 1.0),
+        WEIGHTS['delivery'] * df['Has_Online_Delivery'].to_numpy(dtype=np.float32),
+        WEIGHTS['delivery'] * df['Is_Delivering_Now'].to_numpy(dtype=np.float32),
+    ]).astype(np.float32)
+
+    vectors = np.hstack([WEIGHTS['cuisines'] * cuisines, numeric])
+    vectors /= np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+    return np.ascontiguousarray(vectors, dtype=np.float32)
+
+def synthetic_restaurants(n, n_cities=100, n_cuisines=60, seed=42):
+    """Random restaurants with the columns of cleaned_data.pkl, for benchmarking."""
+    rng = np.random.default_rng(seed)
+    cuisine_names = np.array([f'Cuisine {i}' for i in range(n_cuisines)])
+    # One to three cuisines per restaurant, joined the way Zomato lists them
+    picks = rng.integers(0, n_cuisines, (n, 3))
+    counts = rng.integers(1, 4, n)
+    cuisines = cuisine_names[picks[:, 0]]
+    for i in (1, 2):
+        extra = np.where(counts > i, ', ' + cuisine_names[picks[:, i]], '')
+        cuisines = np.char.add(cuisines, extra)
+    return pd.DataFrame({
+        'Name': np.char.add('Restaurant ', np.arange(n).astype(str)),
+        'Cuisines': cuisines,
+        'Price_Range': rng.integers(1, 5, n),
+        'Has_Online_Delivery': rng.integers(0, 2, n),
+        'Is_Delivering_Now': rng.integers(0, 2, n),
+        'City': np.char.add('City ', rng.integers(0, n_cities, n).astype(str)),
+        'Aggregate_Rating': rng.uniform(1, 5, n).round(1),
+        'Votes': rng.integers(0, 10000, n),
+    })
+
+def benchmark(n=1_000_000, n_queries=100, k=10, seed=42):
+    """
+    Build an index over n synthetic restaurants and time k-NN queries.
+
+    Returns:
+        dict: build time in seconds, index size in MB and query latency
+            percentiles in milliseconds, with and without a city filter
+    """
+    df = synthetic_restaurants(n, seed=seed)
+    start = time.perf_counter()
+    index = RestaurantIndex.from_frame(df)
+    results = {'rows': n, 'build_s': time.perf_counter() - start, 'index_mb': index.vectors.nbytes / 1e6}
+
+    queries = np.random.default_rng(seed).integers(0, n, n_queries)
+    for name, use_city in [('all', False), ('city', True)]:
+        latencies = []
+        for position in queries:
+            city = index.cities[position] if use_city else None
+            start = time.perf_counter()
+            index.similar(position, k, city)
+            latencies.append((time.perf_counter() - start) * 1000)
+        results[f'{name}_p50_ms'] = float(np.percentile(latencies, 50))
+        results[f'{name}_p95_ms'] = float(np.percentile(latencies, 95))
+    return results
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark the similar-restaurant index.")
+    parser.add_argument('--rows', type=int, default=1_000_000, help="Synthetic restaurants to index")
+    parser.add_argument('--queries', type=int, default=100, help="Queries to time")
+    parser.add_argument('-k', type=int, default=10, help="Neighbours per query")
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+    results = benchmark(args.rows, args.queries, args.k)
+    print(f"Indexed {results['rows']:,} restaurants in {results['build_s']:.1f}s ({results['index_mb']:.0f} MB)")
+    print(f"All cities: p50 {results['all_p50_ms']:.2f} ms, p95 {results['all_p95_ms']:.2f} ms")
+    print(f"Same city:  p50 {results['city_p50_ms']:.2f} ms, p95 {results['city_p95_ms']:.2f} ms")
+
+if __name__ == "__main__":
+    main()
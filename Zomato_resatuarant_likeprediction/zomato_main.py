@@ -2,6 +2,11 @@ import streamlit as st
 import pandas as pd
 import pickle
 import numpy as np
+import altair as alt
+from compact_data import CompactRestaurants, COMPACT_DIR, is_current as compact_data_is_current
+from predictor import CostPredictor
+from compact_model import MODEL_DIR, load_predictor, is_current
+from recommender import RestaurantIndex
 
 # Set page config - THIS MUST BE THE FIRST STREAMLIT COMMAND
 st.set_page_config(page_title="Restaurant Price Predictor", layout="wide")
@@ -9,29 +14,107 @@ st.set_page_config(page_title="Restaurant Price Predictor", layout="wide")
 # Load all necessary files
 @st.cache_resource
 def load_models_and_data():
-    with open("restaurant_cost_prediction_model.pkl", 'rb') as file:
-        model = pickle.load(file)
-    with open("label_encoders.pkl", 'rb') as file:
-        label_encoders = pickle.load(file)
-    with open("input_scaler.pkl", 'rb') as file:
-        input_scaler = pickle.load(file)
-    with open("target_scaler.pkl", 'rb') as file:
-        target_scaler = pickle.load(file)
-    with open("feature_names.pkl", "rb") as file:
-        feature_names = pickle.load(file)
-    # Load the cleaned data
-    df = pd.read_pickle("cleaned_data.pkl")
-    return model, label_encoders, input_scaler, target_scaler, feature_names, df
-
-# Function to get unique cuisines from comma-separated values
-def get_unique_cuisines(df):
-    all_cuisines = []
-    for cuisines in df['Cuisines'].dropna():
-        all_cuisines.extend([cuisine.strip() for cuisine in str(cuisines).split(',')])
-    return sorted(list(set(all_cuisines)))
+    # Compiled forest and lookup tables from compact_model.py when exported after the last
+    # change to the pickles, otherwise the pickles
+    if is_current(MODEL_DIR):
+        predictor = load_predictor(MODEL_DIR)
+    else:
+        with open("restaurant_cost_prediction_model.pkl", 'rb') as file:
+            model = pickle.load(file)
+        with open("label_encoders.pkl", 'rb') as file:
+            label_encoders = pickle.load(file)
+        with open("input_scaler.pkl", 'rb') as file:
+            input_scaler = pickle.load(file)
+        with open("target_scaler.pkl", 'rb') as file:
+            target_scaler = pickle.load(file)
+        with open("feature_names.pkl", "rb") as file:
+            feature_names = pickle.load(file)
+        predictor = CostPredictor.from_artifacts(model, label_encoders, input_scaler, target_scaler, feature_names)
+    # Load the cleaned data, memory-mapped from the compact table when compact_data.py has built it
+    # from the current cleaned_data.pkl
+    if compact_data_is_current(COMPACT_DIR):
+        df = CompactRestaurants.load(COMPACT_DIR).df
+    else:
+        df = pd.read_pickle("cleaned_data.pkl")
+    pairs = cuisine_pairs(df)
+    cuisine_index = build_cuisine_index(pairs)
+    cuisine_stats = build_cuisine_stats(df, pairs)
+    display_df = build_display_frame(df)
+    restaurant_index = RestaurantIndex.from_frame(df)
+    return predictor, df, cuisine_index, cuisine_stats, display_df, restaurant_index
+
+# One row per (city, cuisine token, row position) of the comma-separated Cuisines column
+def cuisine_pairs(df):
+    # The index of the exploded Series is the row position in df
+    cuisines = pd.Series(df['Cuisines'].to_numpy(), dtype=object).dropna()
+    tokens = cuisines.astype(str).str.split(',').explode().str.strip()
+    tokens = tokens[tokens != '']
+    positions = tokens.index.to_numpy()
+    return pd.DataFrame({
+        'City': df['City'].to_numpy()[positions],
+        'Cuisine': tokens.to_numpy(),
+        'position': positions
+    }).drop_duplicates()
+
+# Inverted index over the comma-separated Cuisines column
+def build_cuisine_index(pairs):
+    """
+    Map each city to its cuisines and each (city, cuisine) pair to row positions.
+
+    Cuisines are matched as whole tokens, so 'Indian' does not match 'North Indian'.
+
+    Returns:
+        dict: 'cuisines' -> {city: sorted cuisine list},
+              'rows' -> {(city, cuisine): np.ndarray of positions in df}
+    """
+    rows = {key: pairs['position'].to_numpy()[idx] for key, idx in pairs.groupby(['City', 'Cuisine']).indices.items()}
+    city_cuisines = {}
+    for city, cuisine in sorted(rows):
+        city_cuisines.setdefault(city, []).append(cuisine)
+    return {'cuisines': city_cuisines, 'rows': rows}
+
+# Restaurant Analysis metrics for every (city, cuisine) pair, computed in one groupby
+def build_cuisine_stats(df, pairs):
+    """
+    Returns:
+        dict: (city, cuisine) -> count, mean cost/rating/votes and cost percentiles
+    """
+    positions = pairs['position'].to_numpy()
+    values = pd.DataFrame({
+        'City': pairs['City'].to_numpy(),
+        'Cuisine': pairs['Cuisine'].to_numpy(),
+        'Cost': df['Average_Cost_For_Two'].to_numpy(dtype=np.float64)[positions],
+        'Rating': df['Aggregate_Rating'].to_numpy(dtype=np.float64)[positions],
+        'Votes': df['Votes'].to_numpy(dtype=np.float64)[positions]
+    })
+    grouped = values.groupby(['City', 'Cuisine'])
+    stats = grouped.agg(
+        count=('Cost', 'size'),
+        avg_cost=('Cost', 'mean'),
+        avg_rating=('Rating', 'mean'),
+        avg_votes=('Votes', 'mean')
+    )
+    percentiles = grouped['Cost'].quantile([0.25, 0.5, 0.75]).unstack()
+    percentiles.columns = ['cost_p25', 'cost_p50', 'cost_p75']
+    stats = stats.join(percentiles)
+    return stats.to_dict('index')
+
+# Rounded and renamed restaurant table, aligned with df by position
+def build_display_frame(df):
+    return pd.DataFrame({
+        'Restaurant': df['Name'].to_numpy(),
+        'Cuisines': df['Cuisines'].to_numpy(),
+        'Cost for Two (₹)': df['Average_Cost_For_Two'].to_numpy(dtype=np.float64).round(2),
+        'Rating': df['Aggregate_Rating'].to_numpy(dtype=np.float64).round(1),
+        'Rating Category': df['Rating_Text'].to_numpy(),
+        'Number of Reviews': df['Votes'].to_numpy()
+    })
 
 # Load all resources
-model, label_encoders, input_scaler, target_scaler, feature_names, df = load_models_and_data()
+predictor, df, cuisine_index, cuisine_stats, display_df, restaurant_index = load_models_and_data()
+
+# Restaurants shown per page in the analysis table
+PAGE_SIZE = 25
 
 # Main title with custom styling
 st.markdown("""
@@ -64,7 +147,7 @@ with col1:
     selected_city = st.selectbox("Select City", city_options)
 
     # Filter: Cuisines
-    cuisine_options = get_unique_cuisines(df[df['City'] == selected_city])
+    cuisine_options = cuisine_index['cuisines'].get(selected_city, [])
     selected_cuisine = st.selectbox("Select Cuisine", cuisine_options)
 
     st.markdown("### ⭐ Rating & Reviews")
@@ -98,95 +181,73 @@ with col1:
 with col2:
     st.markdown("### 📊 Restaurant Analysis")
     
-    # Show filtered data
-    filtered_data = df[
-        (df['City'] == selected_city) & 
-        (df['Cuisines'].str.contains(selected_cuisine, na=False))
-    ].copy()
+    # Statistics and row positions are precomputed per (city, cuisine)
+    stats = cuisine_stats.get((selected_city, selected_cuisine))
+    positions = cuisine_index['rows'].get((selected_city, selected_cuisine), [])
     
-    if not filtered_data.empty:
-        st.write(f"Showing {len(filtered_data)} restaurants matching your criteria:")
+    if stats is not None:
+        st.write(f"Showing {stats['count']} restaurants matching your criteria:")
         
         # Display key statistics
         col_stats1, col_stats2, col_stats3 = st.columns(3)
         
         with col_stats1:
-            avg_cost = filtered_data['Average_Cost_For_Two'].mean()
-            st.metric("Average Cost", f"₹{avg_cost:.2f}")
+            st.metric("Average Cost", f"₹{stats['avg_cost']:.2f}")
             
         with col_stats2:
-            avg_rating = filtered_data['Aggregate_Rating'].mean()
-            st.metric("Average Rating", f"{avg_rating:.1f}⭐")
+            st.metric("Average Rating", f"{stats['avg_rating']:.1f}⭐")
             
         with col_stats3:
-            avg_votes = filtered_data['Votes'].mean()
-            st.metric("Average Reviews", f"{avg_votes:.0f}")
-        
-        # Show filtered restaurants with proper columns
-        display_columns = [
-            'Name',
-            'Cuisines', 
-            'Average_Cost_For_Two',
-            'Aggregate_Rating', 
-            'Rating_Text', 
-            'Votes'
-        ]
-        
-        # Format the display dataframe
-        display_df = filtered_data[display_columns].copy()
-        display_df['Average_Cost_For_Two'] = display_df['Average_Cost_For_Two'].round(2)
-        display_df['Aggregate_Rating'] = display_df['Aggregate_Rating'].round(1)
-        
-        # Rename columns for better display
-        display_df.columns = [
-            'Restaurant',
-            'Cuisines',
-            'Cost for Two (₹)',
-            'Rating',
-            'Rating Category',
-            'Number of Reviews'
-        ]
+            st.metric("Average Reviews", f"{stats['avg_votes']:.0f}")
+
+        st.caption(f"Cost for two percentiles: 25th ₹{stats['cost_p25']:.0f} · "
+                   f"median ₹{stats['cost_p50']:.0f} · 75th ₹{stats['cost_p75']:.0f}")
         
-        st.dataframe(display_df)
+        # Only the rows of the current page are sliced out of the precomputed table
+        n_pages = (len(positions) - 1) // PAGE_SIZE + 1
+        page = st.number_input("Page", min_value=1, max_value=n_pages, value=1, step=1) if n_pages > 1 else 1
+        page_positions = positions[(page - 1) * PAGE_SIZE:page * PAGE_SIZE]
+        st.dataframe(display_df.iloc[page_positions])
+        if n_pages > 1:
+            st.caption(f"Page {page} of {n_pages}")
+
+        st.markdown("### 🔁 Restaurants Like This One")
+        reference = st.selectbox("Restaurant", list(page_positions),
+                                 format_func=lambda position: display_df['Restaurant'].iloc[position])
+        same_city = st.checkbox(f"Only restaurants in {selected_city}", value=True)
+        neighbours, scores = restaurant_index.similar(reference, k=10, city=selected_city if same_city else None)
+        similar_df = display_df.iloc[neighbours].assign(Similarity=scores.round(3))
+        st.dataframe(similar_df)
     else:
         st.warning("No restaurants found matching your criteria.")
 
     # Prediction Section
     st.markdown("### 💰 Cost Prediction")
     
-    if st.button("Predict Cost", use_container_width=True):
+    # Features shared by the single prediction and the cuisine comparison
+    settings = {
+        'Price_Range': price_range,
+        'Has_Online_Delivery': int(has_online_delivery),
+        'Is_Delivering_Now': int(is_delivering_now),
+        'Aggregate_Rating': aggregate_rating,
+        'Rating_Text': rating_text_input,
+        'Votes': votes_input
+    }
+
+    predict_col, compare_col = st.columns(2)
+    with predict_col:
+        predict_clicked = st.button("Predict Cost", use_container_width=True)
+    with compare_col:
+        compare_clicked = st.button("Compare All Cuisines", use_container_width=True)
+
+    if predict_clicked:
         try:
-            # Prepare input features
-            input_data = {
-                'Cuisines': selected_cuisine,
-                'Price_Range': price_range,
-                'Has_Online_Delivery': int(has_online_delivery),
-                'Is_Delivering_Now': int(is_delivering_now),
-                'City': selected_city,
-                'Aggregate_Rating': aggregate_rating,
-                'Rating_Text': rating_text_input,
-                'Votes': votes_input
-            }
-            
-            # Create DataFrame
-            input_df = pd.DataFrame([input_data])
-            
-            # Encode categorical variables
-            for col in ['Cuisines', 'City', 'Rating_Text']:
-                input_df[col] = label_encoders[col].transform(input_df[col].astype(str))
-            
-            # Scale numerical features
-            numerical_features = ['Votes', 'Aggregate_Rating']
-            input_df[numerical_features] = input_scaler.transform(input_df[numerical_features])
-            
-            # Ensure correct column order
-            input_df = input_df[feature_names]
-            
-            # Make prediction
-            scaled_prediction = model.predict(input_df)[0]
-            
-            # Inverse transform the prediction
-            prediction = target_scaler.inverse_transform([[scaled_prediction]])[0][0]
+            # Encode, scale and predict in one vectorized pass
+            input_df = pd.DataFrame([{'Cuisines': selected_cuisine, 'City': selected_city, **settings}])
+            predictions, errors = predictor.predict(input_df)
+            if errors.iloc[0]:
+                raise ValueError(errors.iloc[0])
+            prediction = predictions[0]
             
             # Display prediction with styling
             st.markdown(f"""
@@ -221,6 +282,25 @@ with col2:
             st.error(f"An error occurred during prediction: {str(e)}")
             st.info("Please ensure all input fields are filled correctly.")
 
+    if compare_clicked:
+        try:
+            ranked = predictor.compare_cuisines(selected_city, cuisine_options, settings)
+            if ranked.empty:
+                st.warning("None of the cuisines in this city are known to the model.")
+            else:
+                st.write(f"Predicted cost for two of {len(ranked)} cuisines in {selected_city}:")
+                chart = alt.Chart(ranked).mark_bar(color='#FF4B4B').encode(
+                    x=alt.X('Predicted_Cost:Q', title='Predicted Cost for Two (₹)'),
+                    y=alt.Y('Cuisine:N', sort='-x', title=None),
+                    tooltip=['Cuisine', alt.Tooltip('Predicted_Cost:Q', format='.2f')]
+                ).properties(height=max(200, 22 * len(ranked)))
+                st.altair_chart(chart, use_container_width=True)
+            skipped = len(cuisine_options) - len(ranked)
+            if skipped:
+                st.caption(f"{skipped} cuisines were skipped because the model was not trained on them.")
+        except Exception as e:
+            st.error(f"An error occurred during prediction: {str(e)}")
+
 # Add footer
 st.markdown("""
     <div style='text-align: center; color: #666666; padding: 20px;'>
@@ -0,0 +1,284 @@
+import pandas as pd
+import numpy as np
+import argparse
+import cProfile
+import json
+import logging
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+import sklearn
+
+from train import PropertyPriceModel, CURRENT_YEAR
+# The pure prediction helpers, not main.py, which sets up Streamlit and app.log on import
+from prediction import ModelRegistry, STOREY_RANGES, preprocess_prediction_input
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SIZES = [10_000, 100_000, 1_000_000, 5_000_000]
+STAGES = ['preprocess', 'train', 'save', 'load', 'predict']
+
+TOWNS = [
+    "ANG MO KIO", "BEDOK", "BISHAN", "BUKIT BATOK", "BUKIT MERAH", "BUKIT PANJANG",
+    "BUKIT TIMAH", "CENTRAL AREA", "CHOA CHU KANG", "CLEMENTI", "GEYLANG", "HOUGANG",
+    "JURONG EAST", "JURONG WEST", "KALLANG/WHAMPOA", "MARINE PARADE", "PASIR RIS",
+    "PUNGGOL", "QUEENSTOWN", "SEMBAWANG", "SENGKANG", "SERANGOON", "TAMPINES",
+    "TOA PAYOH", "WOODLANDS", "YISHUN"
+]
+FLAT_TYPES = ["1 ROOM", "2 ROOM", "3 ROOM", "4 ROOM", "5 ROOM", "EXECUTIVE", "MULTI-GENERATION"]
+FLAT_MODELS = [
+    "Improved", "New Generation", "Model A", "Standard", "Simplified", "Premium Apartment",
+    "Maisonette", "Apartment", "Model A2", "DBSS", "Type S1", "Adjoined flat"
+]
+
+def make_synthetic_hdb(n_rows, seed=42):
+    """
+    Generate an HDB-like resale transactions frame with the columns of combined.csv.
+
+    Args:
+        n_rows: number of transactions
+        seed: random seed
+
+    Returns:
+        pd.DataFrame: synthetic transactions
+    """
+    rng = np.random.default_rng(seed)
+    town = rng.integers(0, len(TOWNS), n_rows)
+    flat_type = rng.integers(0, len(FLAT_TYPES), n_rows)
+    floor_area = np.clip(35 + 15 * flat_type + rng.normal(0, 8, n_rows), 28, 250)
+    lease_start = rng.integers(1966, 2020, n_rows)
+    month = pd.to_datetime('2017-01-01') + pd.to_timedelta(rng.integers(0, 96, n_rows) * 30, unit='D')
+    storey = rng.integers(0, len(STOREY_RANGES), n_rows)
+    cbd_dist = rng.uniform(500, 20000, n_rows)
+    mrt_dist = rng.gamma(2.0, 400.0, n_rows)
+    lease_left = 99 - (month.year.to_numpy() - lease_start)
+    price = (
+        4500 * floor_area
+        - 8 * cbd_dist
+        + 1500 * lease_left
+        + 6000 * storey
+        - 20 * mrt_dist
+        + rng.normal(0, 30000, n_rows)
+    )
+
+    return pd.DataFrame({
+        'month': month.strftime('%Y-%m'),
+        'town': np.array(TOWNS, dtype=object)[town],
+        'flat_type': np.array(FLAT_TYPES, dtype=object)[flat_type],
+        'flat_model': np.array(FLAT_MODELS, dtype=object)[rng.integers(0, len(FLAT_MODELS), n_rows)],
+        'storey_range': np.array(STOREY_RANGES, dtype=object)[storey],
+        'floor_area_sqm': floor_area.round(0),
+        'lease_commence_date': lease_start,
+        'remaining_lease': [f"{years} years" for years in lease_left],
+        'cbd_dist': cbd_dist,
+        'min_dist_mrt': mrt_dist,
+        'resale_price': np.clip(price, 150_000, None).round(-3),
+    })
+
+def measure(results, stage, n_rows, run, profile=None, profile_dir=None):
+    """
+    Record wall time, peak traced memory and per-row latency of a stage.
+
+    The stage runs once untraced for the wall time, then again under
+    tracemalloc for the peak memory, and a third time under the profiler
+    when one is selected, so neither tracing nor profiling inflates the
+    timing. Peak memory covers Python and NumPy allocations but not buffers
+    malloc'ed inside compiled estimator code.
+
+    Args:
+        results: list the stage record is appended to
+        stage: stage name
+        n_rows: rows processed by the stage, used for per-row latency
+        run: callable running the stage; it must be safe to call repeatedly
+        profile: None, 'cprofile' or 'pyinstrument'
+        profile_dir: directory for profiler dumps
+
+    Returns:
+        the return value of the timed run
+    """
+    start = time.perf_counter()
+    value = run()
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    try:
+        run()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    record = {
+        'stage': stage,
+        'rows': n_rows,
+        'wall_time_s': round(elapsed, 6),
+        'peak_memory_mb': round(peak / (1024 ** 2), 3),
+        'latency_us_per_row': round(elapsed / max(n_rows, 1) * 1e6, 4),
+    }
+    if profile is not None:
+        dump = Path(profile_dir) / f'{stage}_{n_rows}'
+        if profile == 'cprofile':
+            profiler = cProfile.Profile()
+            profiler.runcall(run)
+            profiler.dump_stats(f'{dump}.prof')
+            record['profile'] = f'{dump}.prof'
+        else:
+            from pyinstrument import Profiler
+            profiler = Profiler()
+            profiler.start()
+            try:
+                run()
+            finally:
+                profiler.stop()
+            Path(f'{dump}.html').write_text(profiler.output_html())
+            record['profile'] = f'{dump}.html'
+    results.append(record)
+    logger.info(f"{stage:<10} rows={n_rows:>9,} time={elapsed:9.3f}s "
+                f"peak={record['peak_memory_mb']:10.1f}MB "
+                f"latency={record['latency_us_per_row']:.3f}us/row")
+    return value
+
+def run_size(n_rows, stages, work_dir, profile=None, profile_dir=None, predict_rows=10_000):
+    """
+    Run the selected stages on one synthetic dataset size.
+
+    Stages only run when selected or needed by a selected stage, and only
+    selected stages are measured. 'predict' uses the model in memory, so it
+    does not need 'save' or 'load'.
+    """
+    results = []
+
+    def stage(name, rows, run):
+        if name in stages:
+            return measure(results, name, rows, run, profile, profile_dir)
+        return run()
+
+    df = make_synthetic_hdb(n_rows)
+    model = PropertyPriceModel()
+
+    X, y = stage('preprocess', n_rows, lambda: model.preprocess_data(df))
+
+    if not {'train', 'save', 'load', 'predict'} & set(stages):
+        return results
+
+    stage('train', len(X), lambda: model.train(X, y))
+
+    if {'save', 'load'} & set(stages):
+        models_dir = Path(work_dir) / 'models'
+        cwd = os.getcwd()
+        os.chdir(work_dir)
+        try:
+            stage('save', n_rows, model.save_model)
+        finally:
+            os.chdir(cwd)
+
+    if 'load' in stages:
+        stage('load', n_rows, lambda: ModelRegistry(models_dir).get('model'))
+
+    if 'predict' in stages:
+        raw = make_synthetic_hdb(predict_rows, seed=7)
+        raw['property_age'] = CURRENT_YEAR - raw['lease_commence_date']
+        raw['remaining_lease'] = 99 - raw['property_age']
+        raw['month_number'] = pd.to_datetime(raw['month']).dt.month
+        raw['is_near_mrt'] = (raw['min_dist_mrt'] < 1000).astype(int)
+        raw = raw[model.feature_columns]
+
+        def predict(rows):
+            return model.model.predict(preprocess_prediction_input(rows, model.scaler, model.label_encoders))
+
+        measure(results, 'predict', predict_rows, lambda: predict(raw), profile, profile_dir)
+
+        # What a single click in the app costs
+        measure(results, 'predict_1', 100, lambda: [predict(raw.iloc[[i]]) for i in range(100)],
+                profile, profile_dir)
+
+    return results
+
+def environment_info():
+    """Versions and machine details stored alongside the results."""
+    try:
+        commit = subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        'commit': commit,
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'sklearn': sklearn.__version__,
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+    }
+
+def compare(current, baseline_path, threshold=0.10):
+    """Log stages whose wall time changed by more than `threshold` against a previous run."""
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+    previous = {(r['stage'], r['rows']): r for r in baseline['results']}
+    logger.info(f"Comparison against {baseline_path} (commit {baseline['environment'].get('commit')}):")
+    for record in current['results']:
+        old = previous.get((record['stage'], record['rows']))
+        if old is None:
+            continue
+        change = record['wall_time_s'] / old['wall_time_s'] - 1 if old['wall_time_s'] else 0.0
+        flag = "REGRESSION" if change > threshold else ("faster" if change < -threshold else "")
+        logger.info(f"{record['stage']:<10} rows={record['rows']:>9,} "
+                    f"{old['wall_time_s']:9.3f}s -> {record['wall_time_s']:9.3f}s "
+                    f"({change:+.1%}) {flag}")
+
+def parse_args():
+    """Parse command line options for the benchmark suite."""
+    parser = argparse.ArgumentParser(description="Benchmark the HDB training and inference stages.")
+    parser.add_argument('--sizes', type=lambda v: [int(n) for n in v.split(',')], default=DEFAULT_SIZES,
+                        help="Comma-separated dataset sizes (default: 10k,100k,1M,5M)")
+    parser.add_argument('--stages', type=lambda v: v.split(','), default=STAGES,
+                        help=f"Comma-separated stages out of {','.join(STAGES)}")
+    parser.add_argument('--output', type=Path, default=Path('benchmarks'),
+                        help="Directory for JSON results and profiles")
+    parser.add_argument('--profile', choices=['cprofile', 'pyinstrument'],
+                        help="Dump a profile of every stage")
+    parser.add_argument('--compare', type=Path,
+                        help="Previous results JSON to compare wall times against")
+    return parser.parse_args()
+
+def main():
+    """Run the benchmark suite and write the results as JSON."""
+    args = parse_args()
+    logging.basicConfig(level=logging.INFO, format='%(message)s', stream=sys.stdout, force=True)
+    # Keep the per-stage log lines of train.py/prediction.py out of the output
+    logging.getLogger('train').setLevel(logging.WARNING)
+    logging.getLogger('prediction').setLevel(logging.WARNING)
+
+    args.output.mkdir(parents=True, exist_ok=True)
+    environment = environment_info()
+    run_name = f"{environment['timestamp'].replace(':', '')}_{environment['commit'] or 'nocommit'}"
+    profile_dir = args.output / run_name if args.profile else None
+    if profile_dir:
+        profile_dir.mkdir(parents=True, exist_ok=True)
+
+    results = []
+    for n_rows in args.sizes:
+        with tempfile.TemporaryDirectory() as work_dir:
+            results.extend(run_size(n_rows, args.stages, work_dir, args.profile, profile_dir))
+
+    report = {'environment': environment, 'results': results}
+    output_path = args.output / f'{run_name}.json'
+    with open(output_path, 'w') as f:
+        json.dump(report, f, indent=2)
+    logger.info(f"Results written to {output_path}")
+
+    if args.compare:
+        compare(report, args.compare)
+
+if __name__ == "__main__":
+    main()
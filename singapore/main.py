@@ -3,12 +3,13 @@ import streamlit as st
 from streamlit_option_menu import option_menu
 import pandas as pd
 import numpy as np
-import pickle
+import altair as alt
 from datetime import datetime
 import folium
 from streamlit_folium import folium_static
 import logging
 from pathlib import Path
+from prediction import ModelRegistry, STOREY_RANGES, FEATURE_COLUMNS, preprocess_prediction_input
 
 # Set up logging
 logging.basicConfig(
@@ -21,27 +22,38 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Inputs that can be varied in the what-if sweep: label -> (column, min, max)
+SWEEP_PARAMETERS = {
+    "Floor Area (sqm)": ('floor_area_sqm', 20.0, 200.0),
+    "Storey Range": ('storey_range', None, None),
+    "Remaining Lease (years)": ('remaining_lease', 0.0, 99.0),
+    "Property Age (years)": ('property_age', 0.0, 60.0),
+    "Distance to MRT (meters)": ('min_dist_mrt', 0.0, 5000.0),
+}
+@st.cache_resource
+def get_model_registry():
+    """Single registry shared by all sessions and reruns of this process."""
+    return ModelRegistry(Path('models'))
+
 class PropertyPricePredictionApp:
     def __init__(self):
-        self.feature_columns = [
-            'town', 'flat_type', 'flat_model', 'floor_area_sqm',
-            'storey_range', 'remaining_lease', 'property_age',
-            'month_number', 'cbd_dist', 'min_dist_mrt', 'is_near_mrt'
-        ]
-        self.load_models()
+        self.feature_columns = list(FEATURE_COLUMNS)
+        self.registry = get_model_registry()
+        self.model_version = None
+        self.comparison_version = None
         self.setup_page()
+        self.load_models()
         self.town_coordinates = self.load_town_coordinates()
 
-    def load_models(self):
+    def load_models(self, version='model'):
         """Load the trained model and preprocessing objects."""
         try:
-            models_dir = Path('models')
-            with open(models_dir / 'model.pkl', 'rb') as f:
-                self.model = pickle.load(f)
-            with open(models_dir / 'model_scaler.pkl', 'rb') as f:
-                self.scaler = pickle.load(f)
-            with open(models_dir / 'model_encoders.pkl', 'rb') as f:
-                self.label_encoders = pickle.load(f)
+            artifacts = self.registry.get(version)
+            self.model = artifacts['model']
+            self.scaler = artifacts['scaler']
+            self.label_encoders = artifacts['label_encoders']
+            self.market_index = artifacts['market_index']
+            self.model_version = version
             logger.info("Models loaded successfully")
         except Exception as e:
             logger.error(f"Error loading models: {str(e)}")
@@ -67,16 +79,6 @@ class PropertyPricePredictionApp:
         except:
             return 0
 
-    def _get_storey_median(self, x):
-        """Extract median storey from range."""
-        try:
-            if pd.isna(x):
-                return 0
-            split_list = str(x).split(' TO ')
-            return np.mean([float(i) for i in split_list])
-        except:
-            return 0
-
     def show_prediction_page(self):
         """Display the prediction interface."""
         st.title("Predict HDB Resale Price")
@@ -133,23 +135,23 @@ class PropertyPricePredictionApp:
                 value=500.0
             )
 
+        # Prepare input data
+        input_data = pd.DataFrame({
+            'town': [town],
+            'flat_type': [flat_type],
+            'flat_model': [flat_model],
+            'floor_area_sqm': [floor_area],
+            'storey_range': [storey_range],
+            'remaining_lease': [remaining_lease],
+            'property_age': [property_age],
+            'month_number': [datetime.now().month],
+            'cbd_dist': [self.calculate_cbd_distance(town)],
+            'min_dist_mrt': [mrt_distance],
+            'is_near_mrt': [1 if mrt_distance < 1000 else 0]
+        })
+
         if st.button("Predict Price", type="primary"):
             try:
-                # Prepare input data
-                input_data = pd.DataFrame({
-                    'town': [town],
-                    'flat_type': [flat_type],
-                    'flat_model': [flat_model],
-                    'floor_area_sqm': [floor_area],
-                    'storey_range': [storey_range],
-                    'remaining_lease': [remaining_lease],
-                    'property_age': [property_age],
-                    'month_number': [datetime.now().month],
-                    'cbd_dist': [self.calculate_cbd_distance(town)],
-                    'min_dist_mrt': [mrt_distance],
-                    'is_near_mrt': [1 if mrt_distance < 1000 else 0]
-                })
-
                 # Preprocess input
                 processed_input = self.preprocess_prediction_input(input_data)
                 
@@ -158,6 +160,19 @@ class PropertyPricePredictionApp:
                 
                 # Display result
                 st.success(f"Estimated Resale Price: SGD {prediction:,.2f}")
+
+                # Compare against a second model version
+                if self.comparison_version:
+                    other = self.registry.get(self.comparison_version)
+                    other_input = self.preprocess_prediction_input(
+                        input_data, scaler=other['scaler'], label_encoders=other['label_encoders'],
+                        market_index=other['market_index']
+                    )
+                    other_prediction = other['model'].predict(other_input)[0]
+                    st.info(
+                        f"Version '{self.comparison_version}': SGD {other_prediction:,.2f} "
+                        f"({other_prediction - prediction:+,.2f} vs '{self.model_version}')"
+                    )
                 
                 # Show location on map
                 if town in self.town_coordinates:
@@ -167,29 +182,83 @@ class PropertyPricePredictionApp:
                 logger.error(f"Prediction error: {str(e)}")
                 st.error("An error occurred while making the prediction. Please check your inputs.")
 
-    def preprocess_prediction_input(self, input_df):
-        """Preprocess input data for prediction."""
-        try:
-            processed_df = input_df.copy()
-            
-            # Handle storey range
-            processed_df['storey_range'] = processed_df['storey_range'].apply(self._get_storey_median)
-            
-            # Handle categorical variables
-            for feature in ['town', 'flat_type', 'flat_model']:
-                processed_df[feature] = self.label_encoders[feature].transform(processed_df[feature].astype(str))
-            
-            # Ensure correct column order
-            processed_df = processed_df[self.feature_columns]
-            
-            # Scale features
-            scaled_input = self.scaler.transform(processed_df)
-            
-            return scaled_input
-            
-        except Exception as e:
-            logger.error(f"Error in preprocessing prediction input: {str(e)}")
-            raise
+        self.show_sweep_section(input_data)
+
+    def show_sweep_section(self, input_data):
+        """Let the user vary one or two inputs of the current flat and plot the predicted price."""
+        with st.expander("What-if Sweep"):
+            labels = list(SWEEP_PARAMETERS)
+            first_label = st.selectbox("Vary", labels)
+            second_label = st.selectbox("And (optional)", ["None"] + [other for other in labels if other != first_label])
+            steps = st.slider("Steps per parameter", min_value=5, max_value=50, value=20)
+
+            sweep = {}
+            for label in [first_label, second_label]:
+                if label == "None":
+                    continue
+                column, low, high = SWEEP_PARAMETERS[label]
+                if column == 'storey_range':
+                    sweep[column] = st.multiselect(label, STOREY_RANGES, default=STOREY_RANGES)
+                else:
+                    low, high = st.slider(f"{label} range", min_value=low, max_value=high, value=(low, high))
+                    sweep[column] = np.linspace(low, high, steps)
+
+            if st.button("Run Sweep"):
+                try:
+                    result = self.predict_sweep(input_data, sweep)
+                    self.show_sweep_chart(result, list(sweep))
+                except Exception as e:
+                    logger.error(f"Sweep error: {str(e)}")
+                    st.error("An error occurred while running the sweep. Please check your inputs.")
+
+    def predict_sweep(self, input_data, sweep):
+        """
+        Score a grid of variations of one flat with a single model call.
+
+        Args:
+            input_data: one-row input frame as built in show_prediction_page
+            sweep: mapping of column name to the values to try (one or two columns)
+
+        Returns:
+            pd.DataFrame: the swept columns plus 'predicted_price', one row per grid point
+        """
+        columns = list(sweep)
+        mesh = np.meshgrid(*[np.asarray(sweep[col]) for col in columns], indexing='ij')
+        grid = input_data.loc[input_data.index.repeat(mesh[0].size)].reset_index(drop=True)
+        for col, values in zip(columns, mesh):
+            grid[col] = values.ravel()
+        grid['is_near_mrt'] = (grid['min_dist_mrt'] < 1000).astype(int)
+
+        predictions = self.model.predict(self.preprocess_prediction_input(grid))
+        result = grid[columns].copy()
+        result['predicted_price'] = predictions
+        return result
+
+    def show_sweep_chart(self, result, columns):
+        """Plot a response curve for one swept input or a heatmap for two."""
+        if len(columns) == 1:
+            chart = alt.Chart(result).mark_line(point=True).encode(
+                x=alt.X(f'{columns[0]}:{"O" if columns[0] == "storey_range" else "Q"}'),
+                y=alt.Y('predicted_price:Q', title="Predicted Price (SGD)"),
+                tooltip=[columns[0], alt.Tooltip('predicted_price:Q', format=',.0f')]
+            )
+        else:
+            result = result.round({col: 1 for col in columns if col != 'storey_range'})
+            chart = alt.Chart(result).mark_rect().encode(
+                x=alt.X(f'{columns[0]}:O'),
+                y=alt.Y(f'{columns[1]}:O'),
+                color=alt.Color('predicted_price:Q', title="Predicted Price (SGD)"),
+                tooltip=columns + [alt.Tooltip('predicted_price:Q', format=',.0f')]
+            )
+        st.altair_chart(chart, use_container_width=True)
+
+    def preprocess_prediction_input(self, input_df, scaler=None, label_encoders=None, market_index=None):
+        """Preprocess input data for prediction, by default with the active model version."""
+        scaler = scaler if scaler is not None else self.scaler
+        label_encoders = label_encoders if label_encoders is not None else self.label_encoders
+        if scaler is self.scaler and market_index is None:
+            market_index = getattr(self, 'market_index', None)
+        return preprocess_prediction_input(input_df, scaler, label_encoders, market_index, self.feature_columns)
 
     def show_analytics_page(self):
         """Display analytics and insights."""
@@ -199,7 +268,7 @@ class PropertyPricePredictionApp:
         if hasattr(self.model, 'feature_importances_'):
             st.subheader("Feature Importance")
             importance = pd.DataFrame({
-                'Feature': self.feature_columns,
+                'Feature': list(getattr(self.scaler, 'feature_names_in_', self.feature_columns)),
                 'Importance': self.model.feature_importances_
             }).sort_values('Importance', ascending=False)
             
@@ -285,8 +354,30 @@ class PropertyPricePredictionApp:
         - Market trends
         """)
 
+    def select_model_versions(self):
+        """Sidebar controls for the active and comparison model versions."""
+        versions = self.registry.available_versions()
+        self.comparison_version = None
+        if len(versions) < 2:
+            return
+        st.sidebar.header("Model Versions")
+        active = st.sidebar.selectbox(
+            "Active model",
+            versions,
+            index=versions.index(self.model_version) if self.model_version in versions else 0
+        )
+        if active != self.model_version:
+            self.load_models(active)
+        comparison = st.sidebar.selectbox(
+            "Compare with",
+            ["None"] + [v for v in versions if v != active]
+        )
+        if comparison != "None":
+            self.comparison_version = comparison
+
     def run(self):
         """Run the Streamlit application."""
+        self.select_model_versions()
         selected = option_menu(
             "Navigation",
             ["Home", "Price Prediction", "Analytics"],
@@ -0,0 +1,124 @@
+import pandas as pd
+import numpy as np
+from pathlib import Path
+
+# months_elapsed is counted from this month so the feature is stable across retrains
+MONTH_ORIGIN = 1990 * 12
+
+def month_ordinal(months):
+    """
+    Convert month values ('2017-01', timestamps, ...) to year * 12 + month - 1.
+
+    Args:
+        months: array-like of month values
+
+    Returns:
+        np.ndarray: integer month ordinals
+    """
+    dates = pd.to_datetime(pd.Series(months).reset_index(drop=True))
+    return (dates.dt.year * 12 + dates.dt.month - 1).to_numpy()
+
+class MarketIndex:
+    """
+    Monthly resale price index (price per sqm) for every (town, flat_type).
+
+    Only per-month sums and counts are stored, so a new month of transactions
+    is folded in without touching the rest of the history. The value used as a
+    feature for a transaction is the index known at the start of its month,
+    i.e. the latest earlier month with sales for that (town, flat_type).
+    """
+
+    COLUMNS = ['town', 'flat_type', 'month', 'price_sum', 'area_sum', 'count']
+
+    def __init__(self, aggregates=None):
+        self.aggregates = aggregates if aggregates is not None else pd.DataFrame(columns=self.COLUMNS)
+        self._table = None
+
+    @property
+    def months(self):
+        """Month ordinals present in the index."""
+        return sorted(self.aggregates['month'].unique())
+
+    def update(self, df):
+        """
+        Fold in transactions. Months present in `df` replace their previous aggregates.
+
+        Args:
+            df: transactions with 'town', 'flat_type', 'month', 'floor_area_sqm', 'resale_price'
+        """
+        sales = pd.DataFrame({
+            'town': df['town'].astype(str).to_numpy(),
+            'flat_type': df['flat_type'].astype(str).to_numpy(),
+            'month': month_ordinal(df['month']),
+            'price': df['resale_price'].to_numpy(dtype=np.float64),
+            'area': df['floor_area_sqm'].to_numpy(dtype=np.float64),
+        }).dropna()
+        delta = sales.groupby(['town', 'flat_type', 'month'], as_index=False).agg(
+            price_sum=('price', 'sum'),
+            area_sum=('area', 'sum'),
+            count=('price', 'size')
+        )
+        keep = ~self.aggregates['month'].isin(delta['month'].unique())
+        self.aggregates = pd.concat([self.aggregates[keep], delta], ignore_index=True)
+        self._table = None
+
+    def _build_table(self):
+        """Dense (month, key) table of trailing index values, forward filled."""
+        agg = self.aggregates
+        keys = agg[['town', 'flat_type']].drop_duplicates().sort_values(['town', 'flat_type'])
+        key_index = pd.MultiIndex.from_frame(keys)
+        first = int(agg['month'].min())
+        # One extra row for the value known after the last month
+        n_rows = int(agg['month'].max()) - first + 2
+
+        # The row for month m holds data up to and including month m - 1
+        rows = agg['month'].to_numpy(dtype=np.int64) - first + 1
+        cols = key_index.get_indexer(pd.MultiIndex.from_frame(agg[['town', 'flat_type']]))
+        values = np.full((n_rows, len(key_index)), np.nan)
+        values[rows, cols] = agg['price_sum'].to_numpy(dtype=np.float64) / agg['area_sum'].to_numpy(dtype=np.float64)
+
+        overall = agg.groupby('month')[['price_sum', 'area_sum']].sum()
+        fallback = np.full(n_rows, np.nan)
+        fallback[overall.index.to_numpy(dtype=np.int64) - first + 1] = overall['price_sum'] / overall['area_sum']
+
+        values = pd.DataFrame(values).ffill().to_numpy()
+        # The first month has no earlier sales: use that month's own index rather
+        # than an average over the whole history, which would leak later prices
+        fallback = pd.Series(fallback).ffill().bfill().to_numpy()
+        self._table = (first, key_index, values, fallback)
+        return self._table
+
+    def lookup(self, towns, flat_types, months):
+        """
+        Index values for a batch of transactions.
+
+        Args:
+            towns: array-like of town names
+            flat_types: array-like of flat types
+            months: month ordinals (see `month_ordinal`); months after the last
+                indexed month get the latest value
+
+        Returns:
+            np.ndarray: price-per-sqm index, falling back to the all-town index
+                for unseen (town, flat_type) pairs
+        """
+        if self.aggregates.empty:
+            raise ValueError("Market index is empty, call update() first")
+        first, key_index, values, fallback = self._table or self._build_table()
+        rows = np.clip(np.asarray(months, dtype=np.int64) - first, 0, len(values) - 1)
+        cols = key_index.get_indexer(pd.MultiIndex.from_arrays([
+            np.asarray(towns, dtype=str), np.asarray(flat_types, dtype=str)
+        ]))
+        result = np.where(cols >= 0, values[rows, np.maximum(cols, 0)], np.nan)
+        return np.where(np.isnan(result), fallback[rows], result)
+
+    def save(self, path):
+        """Write the monthly aggregates to CSV."""
+        self.aggregates.to_csv(path, index=False)
+
+    @classmethod
+    def load(cls, path):
+        """Read aggregates written by `save`."""
+        if not Path(path).exists():
+            return cls()
+        return cls(pd.read_csv(path, dtype={'town': str, 'flat_type': str}))
@@ -0,0 +1,189 @@
+import pandas as pd
+import numpy as np
+import pickle
+import logging
+import hashlib
+import threading
+from datetime import datetime
+from pathlib import Path
+from compact_forest import CompactForest
+from market_index import MarketIndex, MONTH_ORIGIN, month_ordinal
+
+logger = logging.getLogger(__name__)
+
+# Base model inputs, in training order
+FEATURE_COLUMNS = [
+    'town', 'flat_type', 'flat_model', 'floor_area_sqm',
+    'storey_range', 'remaining_lease', 'property_age',
+    'month_number', 'cbd_dist', 'min_dist_mrt', 'is_near_mrt'
+]
+STOREY_RANGES = [f"{low:02d} TO {low + 2:02d}" for low in range(1, 50, 3)]
+
+def storey_median(x):
+    """Extract median storey from range."""
+    try:
+        if pd.isna(x):
+            return 0
+        split_list = str(x).split(' TO ')
+        return np.mean([float(i) for i in split_list])
+    except:
+        return 0
+
+def preprocess_prediction_input(input_df, scaler, label_encoders, market_index=None, feature_columns=FEATURE_COLUMNS):
+    """
+    Turn raw prediction inputs into the scaled feature matrix of a model version.
+
+    Args:
+        input_df: rows with the FEATURE_COLUMNS inputs
+        scaler: fitted scaler of the model version
+        label_encoders: fitted label encoders of the model version
+        market_index: MarketIndex of time-aware versions
+        feature_columns: fallback column order when the scaler has no feature names
+
+    Returns:
+        np.ndarray: scaled features
+    """
+    # Columns the scaler was fitted on; time-aware models have two extra ones
+    feature_columns = list(getattr(scaler, 'feature_names_in_', feature_columns))
+    try:
+        processed_df = input_df.copy()
+
+        # Market trend features as of the current month
+        if 'market_index' in feature_columns:
+            current_month = month_ordinal([datetime.now()])[0]
+            processed_df['months_elapsed'] = current_month - MONTH_ORIGIN
+            processed_df['market_index'] = market_index.lookup(
+                processed_df['town'], processed_df['flat_type'],
+                np.full(len(processed_df), current_month)
+            )
+
+        # Handle storey range
+        processed_df['storey_range'] = processed_df['storey_range'].apply(storey_median)
+
+        # Handle categorical variables
+        for feature in ['town', 'flat_type', 'flat_model']:
+            processed_df[feature] = label_encoders[feature].transform(processed_df[feature].astype(str))
+
+        # Ensure correct column order and scale
+        return scaler.transform(processed_df[feature_columns])
+
+    except Exception as e:
+        logger.error(f"Error in preprocessing prediction input: {str(e)}")
+        raise
+
+class ModelRegistry:
+    """
+    Process-wide store of loaded model versions.
+
+    A version is the `filepath_prefix` used by `PropertyPriceModel.save_model`,
+    i.e. the files `<prefix>.pkl`, `<prefix>_scaler.pkl`, `<prefix>_encoders.pkl`
+    and optionally the `<prefix>_compact/` node tables. Each version is loaded
+    once and only reloaded when its files change on disk.
+    """
+
+    def __init__(self, models_dir='models'):
+        self.models_dir = Path(models_dir)
+        self._lock = threading.Lock()
+        self._cache = {}
+
+    def available_versions(self):
+        """List the model versions present in the models directory."""
+        versions = [path.name[:-len('_scaler.pkl')] for path in self.models_dir.glob('*_scaler.pkl')]
+        return sorted(v for v in versions if (self.models_dir / f'{v}_encoders.pkl').exists())
+
+    def _compact_dir(self, version):
+        """
+        The version's compact node tables, or None when missing or older
+        than the pickle (the model was retrained without a new export).
+        """
+        compact_dir = self.models_dir / f'{version}_compact'
+        pickle_path = self.models_dir / f'{version}.pkl'
+        if not compact_dir.exists():
+            return None
+        files = list(compact_dir.iterdir())
+        if not files:
+            return None
+        if pickle_path.exists() and min(path.stat().st_mtime_ns for path in files) < pickle_path.stat().st_mtime_ns:
+            return None
+        return compact_dir
+
+    def _artifact_files(self, version):
+        """Files that make up one model version."""
+        compact_dir = self._compact_dir(version)
+        if compact_dir is not None:
+            model_files = sorted(compact_dir.iterdir())
+        else:
+            model_files = [self.models_dir / f'{version}.pkl']
+        index_file = self.models_dir / f'{version}_market_index.csv'
+        return model_files + [
+            self.models_dir / f'{version}_scaler.pkl',
+            self.models_dir / f'{version}_encoders.pkl',
+        ] + ([index_file] if index_file.exists() else [])
+
+    def _signature(self, files):
+        """Cheap change detector based on file mtime and size."""
+        return tuple((str(path), path.stat().st_mtime_ns, path.stat().st_size) for path in files)
+
+    def _content_hash(self, files):
+        """Content hash, only computed once the signature has changed."""
+        digest = hashlib.sha1()
+        for path in files:
+            with open(path, 'rb') as f:
+                for chunk in iter(lambda: f.read(1 << 20), b''):
+                    digest.update(chunk)
+        return digest.hexdigest()
+
+    def _load(self, version):
+        """Read one model version from disk."""
+        compact_dir = self._compact_dir(version)
+        if compact_dir is not None:
+            # Memory-mapped node tables load much faster than the pickle
+            model = CompactForest.load(compact_dir)
+        else:
+            with open(self.models_dir / f'{version}.pkl', 'rb') as f:
+                model = pickle.load(f)
+        with open(self.models_dir / f'{version}_scaler.pkl', 'rb') as f:
+            scaler = pickle.load(f)
+        with open(self.models_dir / f'{version}_encoders.pkl', 'rb') as f:
+            label_encoders = pickle.load(f)
+        # Time-aware versions (retrain.py) ship a monthly market index
+        index_file = self.models_dir / f'{version}_market_index.csv'
+        market_index = MarketIndex.load(index_file) if index_file.exists() else None
+        return {
+            'model': model,
+            'scaler': scaler,
+            'label_encoders': label_encoders,
+            'market_index': market_index,
+        }
+
+    def get(self, version='model'):
+        """
+        Return the artifacts of a model version, reloading them if changed.
+
+        Args:
+            version: model file prefix
+
+        Returns:
+            dict: 'model', 'scaler', 'label_encoders' and 'market_index' (or None)
+        """
+        with self._lock:
+            files = self._artifact_files(version)
+            signature = self._signature(files)
+            cached = self._cache.get(version)
+            if cached is not None and cached['signature'] == signature:
+                return cached['artifacts']
+
+            content_hash = self._content_hash(files)
+            if cached is not None and cached['hash'] == content_hash:
+                # Touched but unchanged, keep the loaded objects
+                cached['signature'] = signature
+                return cached['artifacts']
+
+            artifacts = self._load(version)
+            self._cache[version] = {
+                'signature': signature,
+                'hash': content_hash,
+                'artifacts': artifacts,
+            }
+            logger.info(f"Loaded model version '{version}' ({content_hash[:8]})")
+            return artifacts
@@ -0,0 +1,214 @@
+import pandas as pd
+import numpy as np
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.model_selection import train_test_split
+import pickle
+import json
+import argparse
+import logging
+from pathlib import Path
+
+from train import PropertyPriceModel, peak_rss_mb
+from market_index import MarketIndex, MONTH_ORIGIN, month_ordinal
+
+logger = logging.getLogger(__name__)
+
+# Share of the new rows held out to evaluate a warm_start update
+HOLDOUT_FRACTION = 0.2
+
+class TimeAwarePriceModel(PropertyPriceModel):
+    """
+    Property price model with a market trend feature and incremental retraining.
+
+    On top of the base features it uses `market_index`, the trailing monthly
+    price-per-sqm index of the flat's (town, flat_type), and `months_elapsed`.
+    Processed features are kept per month under `models/<prefix>_state/`, so a
+    new month of transactions only needs that month to be preprocessed.
+    """
+
+    def __init__(self, filepath_prefix='model_timeaware'):
+        super().__init__()
+        self.feature_columns = self.feature_columns + ['market_index', 'months_elapsed']
+        self.filepath_prefix = filepath_prefix
+        self.models_dir = Path('models')
+        self.state_dir = self.models_dir / f'{filepath_prefix}_state'
+        self.market_index = MarketIndex()
+
+    def _property_age(self, df):
+        """Property age at the time of sale rather than relative to a fixed year."""
+        if 'month' in df.columns:
+            return pd.to_datetime(df['month']).dt.year - df['lease_commence_date']
+        return super()._property_age(df)
+
+    def add_time_features(self, df):
+        """Return a copy of the transactions with market_index and months_elapsed."""
+        df = df.copy()
+        months = month_ordinal(df['month'])
+        df['months_elapsed'] = months - MONTH_ORIGIN
+        df['market_index'] = self.market_index.lookup(df['town'], df['flat_type'], months)
+        return df
+
+    def build(self, df):
+        """
+        Full rebuild: index, feature store and model from the complete history.
+
+        Args:
+            df: all transactions
+        """
+        logger.info("Starting full time-aware build...")
+        self.market_index = MarketIndex()
+        self.market_index.update(df)
+        X, y = self.preprocess_data(self.add_time_features(df))
+
+        for shard in (self.state_dir / 'features').glob('*.npz') if self.state_dir.exists() else []:
+            shard.unlink()
+        self._write_shards(month_ordinal(df.loc[X.index, 'month']), X, y)
+
+        self.train(X, y)
+        self.save()
+        return self
+
+    def update(self, delta_df, strategy='refit', extra_trees=50, window_months=12, max_trees=500):
+        """
+        Fold in new transactions and retrain.
+
+        Only `delta_df` is preprocessed. Months it contains replace the stored
+        months with the same date.
+
+        Args:
+            delta_df: new transactions, typically one month
+            strategy: 'refit' retrains on the stored features of every month,
+                'warm_start' adds `extra_trees` trees fitted on the last
+                `window_months` months to the existing forest
+            extra_trees: trees added in 'warm_start' mode
+            window_months: months of history the new trees are fitted on
+            max_trees: forest size cap in 'warm_start' mode; the oldest trees
+                are dropped beyond it
+
+        Returns:
+            self: updated model instance
+        """
+        logger.info(f"Starting incremental update ({strategy}) with {len(delta_df)} rows...")
+        try:
+            self.load_state()
+            self.market_index.update(delta_df)
+            X_new, y_new = self.preprocess_data(self.add_time_features(delta_df), fit=False)
+            new_months = month_ordinal(delta_df.loc[X_new.index, 'month'])
+            self._write_shards(new_months, X_new, y_new)
+
+            if strategy == 'refit':
+                X, y = self._read_shards()
+                self.train(X, y)
+            elif strategy == 'warm_start':
+                if not isinstance(self.model, RandomForestRegressor):
+                    raise ValueError("warm_start is only supported for RandomForestRegressor models")
+                # Part of the new rows is held out, so the logged metrics are out of sample
+                X_fit, X_holdout, y_fit, y_holdout = train_test_split(
+                    X_new, y_new, test_size=HOLDOUT_FRACTION, random_state=42
+                )
+                X_recent, y_recent = self._read_shards(since=new_months.max() - window_months + 1,
+                                                       skip=np.unique(new_months))
+                X_recent = pd.concat([X_recent, X_fit.astype(np.float32)], ignore_index=True)
+                y_recent = pd.concat([y_recent, y_fit.astype(np.float32)], ignore_index=True)
+                # The scaler stays fixed so the existing trees remain valid
+                self.model.set_params(warm_start=True, n_estimators=len(self.model.estimators_) + extra_trees)
+                self.model.fit(self.scaler.transform(X_recent), y_recent)
+                logger.info(f"Added {extra_trees} trees fitted on {len(X_recent)} recent rows")
+                if len(self.model.estimators_) > max_trees:
+                    dropped = len(self.model.estimators_) - max_trees
+                    self.model.estimators_ = self.model.estimators_[dropped:]
+                    self.model.set_params(n_estimators=max_trees)
+                    logger.info(f"Dropped the {dropped} oldest trees to stay at {max_trees}")
+                logger.info(f"Evaluating on {len(X_holdout)} held-out new rows")
+                self._evaluate_model(y_holdout, self.model.predict(self.scaler.transform(X_holdout)))
+            else:
+                raise ValueError(f"Unknown update strategy: {strategy}")
+
+            self.save()
+            logger.info("Incremental update completed successfully")
+            return self
+
+        except Exception as e:
+            logger.error(f"Error in incremental update: {str(e)}")
+            raise
+
+    def _write_shards(self, months, X, y):
+        """Store processed features as one .npz file per month."""
+        shard_dir = self.state_dir / 'features'
+        shard_dir.mkdir(parents=True, exist_ok=True)
+        X_values = X.to_numpy(dtype=np.float32)
+        y_values = np.asarray(y, dtype=np.float32)
+        for month in np.unique(months):
+            mask = months == month
+            np.savez(shard_dir / f'{month}.npz', X=X_values[mask], y=y_values[mask])
+        logger.info(f"Stored features for {len(np.unique(months))} month(s)")
+
+    def _read_shards(self, since=None, skip=()):
+        """Load stored features, optionally only months >= `since` and not in `skip`."""
+        shards = sorted(
+            (int(path.stem), path) for path in (self.state_dir / 'features').glob('*.npz')
+        )
+        X_parts, y_parts = [], []
+        for month, path in shards:
+            if (since is not None and month < since) or month in skip:
+                continue
+            with np.load(path) as shard:
+                X_parts.append(shard['X'])
+                y_parts.append(shard['y'])
+        X = pd.DataFrame(np.concatenate(X_parts), columns=self.feature_columns)
+        return X, pd.Series(np.concatenate(y_parts), name='resale_price')
+
+    def save(self):
+        """Save model, scaler, encoders and the market index next to them."""
+        self.save_model(self.filepath_prefix)
+        self.market_index.save(self.models_dir / f'{self.filepath_prefix}_market_index.csv')
+
+    def load_state(self):
+        """Load the artifacts written by `save`."""
+        with open(self.models_dir / f'{self.filepath_prefix}.pkl', 'rb') as f:
+            self.model = pickle.load(f)
+        with open(self.models_dir / f'{self.filepath_prefix}_scaler.pkl', 'rb') as f:
+            self.scaler = pickle.load(f)
+        with open(self.models_dir / f'{self.filepath_prefix}_encoders.pkl', 'rb') as f:
+            self.label_encoders = pickle.load(f)
+        fill_values_path = self.models_dir / f'{self.filepath_prefix}_fill_values.json'
+        if fill_values_path.exists():
+            with open(fill_values_path) as f:
+                self.fill_values = json.load(f)
+        self.market_index = MarketIndex.load(self.models_dir / f'{self.filepath_prefix}_market_index.csv')
+
+def parse_args():
+    """Parse command line options for time-aware (re)training."""
+    parser = argparse.ArgumentParser(description="Build or incrementally update the time-aware price model.")
+    parser.add_argument('data', type=Path,
+                        help="CSV with all transactions (build) or only the new ones (update)")
+    parser.add_argument('--update', choices=['refit', 'warm_start'],
+                        help="Fold the CSV into the existing model instead of rebuilding")
+    parser.add_argument('--prefix', default='model_timeaware',
+                        help="Model file prefix inside models/")
+    parser.add_argument('--extra-trees', type=int, default=50,
+                        help="Trees added per update in warm_start mode")
+    parser.add_argument('--max-trees', type=int, default=500,
+                        help="Largest forest kept in warm_start mode; the oldest trees are dropped")
+    return parser.parse_args()
+
+def main():
+    """Run a full build or an incremental update."""
+    args = parse_args()
+    if not args.data.exists():
+        raise FileNotFoundError(f"Data file not found: {args.data}")
+
+    df = pd.read_csv(args.data)
+    logger.info(f"Data loaded successfully. Shape: {df.shape}")
+    model = TimeAwarePriceModel(args.prefix)
+    if args.update:
+        model.update(df, strategy=args.update, extra_trees=args.extra_trees, max_trees=args.max_trees)
+    else:
+        model.build(df)
+
+    peak = peak_rss_mb()
+    if peak is not None:
+        logger.info(f"Peak RSS: {peak:,.1f} MB")
+
+if __name__ == "__main__":
+    main()
@@ -1,18 +1,81 @@
 import pandas as pd
 import numpy as np
 from sklearn.preprocessing import StandardScaler, LabelEncoder
-from sklearn.model_selection import train_test_split
-from sklearn.ensemble import RandomForestRegressor
+from sklearn.model_selection import train_test_split, RandomizedSearchCV
+from sklearn.experimental import enable_halving_search_cv  # noqa: F401
+from sklearn.model_selection import HalvingRandomSearchCV
+from sklearn.ensemble import RandomForestRegressor, GradientBoostingRegressor
+from sklearn.linear_model import SGDRegressor
 from sklearn.metrics import mean_squared_error, mean_absolute_error, r2_score
 import pickle
+import json
 import logging
 import warnings
+import argparse
+import shutil
 import sys
+from functools import partial
 from pathlib import Path
+from compact_forest import export_forest
 
 # Suppress warnings
 warnings.filterwarnings('ignore')
 
+# Hyperparameter search space used by PropertyPriceModel.tune
+SEARCH_SPACES = {
+    'random_forest': (
+        RandomForestRegressor(random_state=42, n_jobs=1),
+        {
+            'n_estimators': [100, 200, 300, 400],
+            'max_depth': [10, 15, 20, 25, None],
+            'min_samples_split': [2, 5, 10],
+            'min_samples_leaf': [1, 2, 4],
+            'max_features': [1.0, 'sqrt', 0.5],
+        }
+    ),
+    'gradient_boosting': (
+        GradientBoostingRegressor(random_state=42),
+        {
+            'n_estimators': [100, 200, 400],
+            'learning_rate': [0.03, 0.05, 0.1, 0.2],
+            'max_depth': [3, 5, 7],
+            'min_samples_leaf': [1, 5, 20],
+            'subsample': [0.7, 0.85, 1.0],
+        }
+    ),
+}
+
+# Compact dtypes used when combined.csv is read in chunks
+CSV_DTYPES = {
+    'month': 'category',
+    'town': 'category',
+    'flat_type': 'category',
+    'flat_model': 'category',
+    'storey_range': 'category',
+    'remaining_lease': 'category',
+    'floor_area_sqm': 'float32',
+    'lease_commence_date': 'float32',
+    'cbd_dist': 'float32',
+    'min_dist_mrt': 'float32',
+    'resale_price': 'float32',
+}
+CATEGORICAL_FEATURES = ['town', 'flat_type', 'flat_model']
+CURRENT_YEAR = 2024
+
+def peak_rss_mb():
+    """Peak resident set size of this process in MB, or None if unavailable."""
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux reports kilobytes, macOS bytes
+        return peak / (1024 ** 2) if sys.platform == 'darwin' else peak / 1024
+    except ImportError:
+        try:
+            import psutil
+            return psutil.Process().memory_info().peak_wset / (1024 ** 2)
+        except (ImportError, AttributeError):
+            return None
+
 # Set up logging
 logging.basicConfig(
     level=logging.INFO,
@@ -32,6 +95,10 @@ class PropertyPriceModel:
         self.model = None
         self.scaler = None
         self.label_encoders = {}
+        # Medians fitted by preprocess_data(fit=True), reused when fit=False
+        self.fill_values = {}
+        # Rows the last reservoir-mode model was trained on
+        self.reservoir_sample = None
         # Updated to match actual dataset column names
         self.feature_columns = [
             'town', 'flat_type', 'flat_model', 'floor_area_sqm',
@@ -77,9 +144,23 @@ class PropertyPriceModel:
         except:
             return 0
 
-    def preprocess_data(self, df):
+    def _fitted_median(self, key, values, fit):
+        """Median of `values` when fitting, otherwise the median stored at fit time."""
+        if fit:
+            self.fill_values[key] = float(values.median())
+        elif key not in self.fill_values:
+            logger.warning(f"No fitted median for {key}, using the median of the new data")
+            return float(values.median())
+        return self.fill_values[key]
+
+    def preprocess_data(self, df, fit=True):
+        """
+        Preprocess the dataset with enhanced feature engineering and NaN handling.
+
+        With fit=False the label encoders, the MRT distance threshold and the
+        fill medians fitted earlier are reused, so newly arriving data is
+        processed consistently with the saved model.
         """
-        Preprocess the dataset with enhanced feature engineering and NaN handling."""
         
         logger.info("Starting data preprocessing...")
         try:
@@ -110,15 +191,19 @@ class PropertyPriceModel:
             categorical_features = ['town', 'flat_type', 'flat_model']
             for feature in categorical_features:
                 if feature in processed_df.columns:
-                    self.label_encoders[feature] = LabelEncoder()
-                    processed_df[feature] = self.label_encoders[feature].fit_transform(
-                        processed_df[feature].fillna('Unknown').astype(str)
-                    )
+                    values = processed_df[feature].fillna('Unknown').astype(str)
+                    if fit:
+                        self.label_encoders[feature] = LabelEncoder()
+                        processed_df[feature] = self.label_encoders[feature].fit_transform(values)
+                    else:
+                        unseen = set(values.unique()) - set(self.label_encoders[feature].classes_)
+                        if unseen:
+                            raise ValueError(f"Unseen {feature} values {sorted(unseen)}, a full retrain is required")
+                        processed_df[feature] = self.label_encoders[feature].transform(values)
 
             # Calculate property age
-            current_year = 2024
             if 'lease_commence_date' in processed_df.columns:
-                processed_df['property_age'] = current_year - processed_df['lease_commence_date']
+                processed_df['property_age'] = self._property_age(processed_df)
 
             # Process month
             if 'month' in processed_df.columns:
@@ -127,9 +212,9 @@ class PropertyPriceModel:
             # Create proximity features
             if 'min_dist_mrt' in processed_df.columns:
                 processed_df['min_dist_mrt'] = processed_df['min_dist_mrt'].fillna(
-                    processed_df['min_dist_mrt'].median()
+                    self._fitted_median('min_dist_mrt', processed_df['min_dist_mrt'], fit)
                 )
-                median_mrt_dist = processed_df['min_dist_mrt'].median()
+                median_mrt_dist = self._fitted_median('mrt_threshold', processed_df['min_dist_mrt'], fit)
                 processed_df['is_near_mrt'] = (processed_df['min_dist_mrt'] < median_mrt_dist).astype(int)
 
             # Handle missing columns
@@ -145,7 +230,7 @@ class PropertyPriceModel:
             # Final handling of any remaining NaN values in features
             for col in X.columns:
                 if X[col].dtype.kind in 'fcb':  # float, complex, or boolean
-                    X[col] = X[col].fillna(X[col].median())
+                    X[col] = X[col].fillna(self._fitted_median(col, X[col], fit))
                 else:  # integer or object
                     X[col] = X[col].fillna(0)
 
@@ -157,6 +242,10 @@ class PropertyPriceModel:
             logger.error(f"Error in preprocessing data: {str(e)}")
             raise
 
+    def _property_age(self, df):
+        """Property age in years, relative to CURRENT_YEAR."""
+        return CURRENT_YEAR - df['lease_commence_date']
+
     def train(self, X, y):
         """
         Train the model with optimized parameters.
@@ -170,15 +259,7 @@ class PropertyPriceModel:
         """
         logger.info("Starting model training...")
         try:
-            # Split the data
-            X_train, X_test, y_train, y_test = train_test_split(
-                X, y, test_size=0.2, random_state=42
-            )
-
-            # Scale features
-            self.scaler = StandardScaler()
-            X_train_scaled = self.scaler.fit_transform(X_train)
-            X_test_scaled = self.scaler.transform(X_test)
+            X_train_scaled, X_test_scaled, y_train, y_test = self._split_and_scale(X, y)
 
             # Initialize and train model
             self.model = RandomForestRegressor(
@@ -206,6 +287,313 @@ class PropertyPriceModel:
             logger.error(f"Error in training model: {str(e)}")
             raise
 
+    def train_streaming(self, csv_path, mode='reservoir', chunksize=50_000,
+                        sample_size=200_000, epochs=5):
+        """
+        Train from a CSV file without loading it into memory at once.
+
+        The file is read in chunks with compact dtypes. A first pass fits the
+        label encoders and estimates the fill medians, later passes transform
+        each chunk straight into a float32 matrix. In 'reservoir' mode a
+        uniform sample of the processed rows is collected and passed to `train`;
+        in 'sgd' mode an SGDRegressor is fitted incrementally with `partial_fit`.
+
+        Args:
+            csv_path: path to the transactions CSV
+            mode: 'reservoir' or 'sgd'
+            chunksize: rows read per chunk
+            sample_size: rows kept for the reservoir sample and median estimates
+            epochs: passes over the data in 'sgd' mode
+
+        Returns:
+            self: trained model instance
+        """
+        logger.info(f"Starting streaming training in {mode} mode...")
+        try:
+            header = pd.read_csv(csv_path, nrows=0).columns
+            required_columns = ['resale_price'] + [col for col in self.feature_columns
+                                                if col not in ['property_age', 'month_number', 'is_near_mrt']]
+            missing_columns = [col for col in required_columns if col not in header]
+            if missing_columns:
+                raise ValueError(f"Missing required columns: {missing_columns}")
+            usecols = [col for col in CSV_DTYPES if col in header]
+
+            rng = np.random.default_rng(42)
+            fill_values = self._scan_csv(csv_path, usecols, chunksize, sample_size, rng)
+            self.fill_values = dict(fill_values, mrt_threshold=fill_values['min_dist_mrt'])
+            chunks = partial(self._iter_processed_chunks, csv_path, usecols, chunksize, fill_values)
+
+            if mode == 'reservoir':
+                X_sample = np.empty((sample_size, len(self.feature_columns)), dtype=np.float32)
+                y_sample = np.empty(sample_size, dtype=np.float32)
+                seen = 0
+                for _, X_chunk, y_chunk in chunks():
+                    seen = self._reservoir_update([X_sample, y_sample], [X_chunk, y_chunk], seen, rng)
+                n_rows = min(seen, sample_size)
+                logger.info(f"Reservoir sample of {n_rows} rows out of {seen}")
+                X = pd.DataFrame(X_sample[:n_rows], columns=self.feature_columns)
+                self.reservoir_sample = X
+                return self.train(X, pd.Series(y_sample[:n_rows], name='resale_price'))
+
+            if mode != 'sgd':
+                raise ValueError(f"Unknown streaming mode: {mode}")
+
+            # Pass 2: scaler and target statistics on the training rows
+            self.scaler = StandardScaler()
+            y_sum, y_sq_sum, n_train = 0.0, 0.0, 0
+            for index, X_chunk, y_chunk in chunks():
+                train_mask = ~self._holdout_mask(index, len(y_chunk))
+                self.scaler.partial_fit(X_chunk[train_mask])
+                y_train = y_chunk[train_mask].astype(np.float64)
+                y_sum += y_train.sum()
+                y_sq_sum += np.square(y_train).sum()
+                n_train += len(y_train)
+            y_mean = y_sum / n_train
+            y_std = np.sqrt(y_sq_sum / n_train - y_mean ** 2)
+
+            # Later passes: incremental fit on a standardized target
+            self.model = SGDRegressor(alpha=1e-4, eta0=0.01, random_state=42)
+            for epoch in range(epochs):
+                for index, X_chunk, y_chunk in chunks():
+                    train_mask = ~self._holdout_mask(index, len(y_chunk))
+                    self.model.partial_fit(
+                        self.scaler.transform(X_chunk[train_mask]),
+                        (y_chunk[train_mask] - y_mean) / y_std
+                    )
+                logger.info(f"Finished SGD epoch {epoch + 1}/{epochs}")
+
+            # Fold the target scaling into the coefficients so the saved model
+            # predicts prices directly
+            self.model.coef_ = self.model.coef_ * y_std
+            self.model.intercept_ = self.model.intercept_ * y_std + y_mean
+
+            y_true, y_pred = [], []
+            for index, X_chunk, y_chunk in chunks():
+                holdout_mask = self._holdout_mask(index, len(y_chunk))
+                y_true.append(y_chunk[holdout_mask])
+                y_pred.append(self.model.predict(self.scaler.transform(X_chunk[holdout_mask])))
+            self._evaluate_model(np.concatenate(y_true), np.concatenate(y_pred))
+
+            logger.info("Streaming training completed successfully")
+            return self
+
+        except Exception as e:
+            logger.error(f"Error in streaming training: {str(e)}")
+            raise
+
+    def _read_chunks(self, csv_path, usecols, chunksize):
+        """Read the CSV lazily with compact dtypes, skipping rows without a price."""
+        reader = pd.read_csv(
+            csv_path,
+            usecols=usecols,
+            dtype={col: CSV_DTYPES[col] for col in usecols},
+            chunksize=chunksize
+        )
+        for chunk in reader:
+            yield chunk.dropna(subset=['resale_price'])
+
+    def _scan_csv(self, csv_path, usecols, chunksize, sample_size, rng):
+        """
+        First pass: fit the label encoders and estimate fill medians.
+
+        Returns:
+            dict: fill value per feature column, plus the MRT distance median
+        """
+        categories = {feature: set() for feature in CATEGORICAL_FEATURES}
+        has_missing = {feature: False for feature in CATEGORICAL_FEATURES}
+        numeric_columns = ['floor_area_sqm', 'cbd_dist', 'min_dist_mrt', 'lease_commence_date']
+        numeric_columns = [col for col in numeric_columns if col in usecols]
+        sample = np.empty((sample_size, len(numeric_columns)), dtype=np.float32)
+        seen = 0
+
+        for chunk in self._read_chunks(csv_path, usecols, chunksize):
+            for feature in CATEGORICAL_FEATURES:
+                categories[feature].update(chunk[feature].cat.categories.astype(str))
+                has_missing[feature] |= bool(chunk[feature].isna().any())
+            seen = self._reservoir_update(
+                [sample], [chunk[numeric_columns].to_numpy(dtype=np.float32)], seen, rng
+            )
+
+        for feature in CATEGORICAL_FEATURES:
+            classes = categories[feature] | ({'Unknown'} if has_missing[feature] else set())
+            self.label_encoders[feature] = LabelEncoder().fit(sorted(classes))
+
+        medians = dict(zip(numeric_columns, np.nanmedian(sample[:min(seen, sample_size)], axis=0)))
+        fill_values = {col: 0.0 for col in self.feature_columns}
+        for col in ['floor_area_sqm', 'cbd_dist', 'min_dist_mrt']:
+            fill_values[col] = float(medians.get(col, 0.0))
+        if 'lease_commence_date' in medians:
+            fill_values['property_age'] = CURRENT_YEAR - float(medians['lease_commence_date'])
+        logger.info(f"Scanned {seen} rows, estimated fill values: {fill_values}")
+        return fill_values
+
+    def _iter_processed_chunks(self, csv_path, usecols, chunksize, fill_values):
+        """Yield (chunk index, float32 feature matrix, target) for every chunk."""
+        columns = {col: i for i, col in enumerate(self.feature_columns)}
+        encoder_lookup = {
+            feature: {cls: code for code, cls in enumerate(encoder.classes_)}
+            for feature, encoder in self.label_encoders.items()
+        }
+
+        for index, chunk in enumerate(self._read_chunks(csv_path, usecols, chunksize)):
+            X = np.zeros((len(chunk), len(self.feature_columns)), dtype=np.float32)
+
+            # String columns are parsed once per distinct value, not once per row
+            X[:, columns['storey_range']] = self._map_categories(chunk['storey_range'], self._get_storey_median, 0)
+            X[:, columns['remaining_lease']] = self._map_categories(chunk['remaining_lease'], self.extract_lease_years, 0)
+            for feature in CATEGORICAL_FEATURES:
+                lookup = encoder_lookup[feature]
+                X[:, columns[feature]] = self._map_categories(
+                    chunk[feature], lambda value: lookup[str(value)], lookup.get('Unknown', 0)
+                )
+            if 'month' in chunk.columns:
+                X[:, columns['month_number']] = self._map_categories(
+                    chunk['month'], lambda value: pd.Timestamp(value).month, np.nan
+                )
+            if 'lease_commence_date' in chunk.columns:
+                X[:, columns['property_age']] = CURRENT_YEAR - chunk['lease_commence_date'].to_numpy()
+            for col in ['floor_area_sqm', 'cbd_dist', 'min_dist_mrt']:
+                X[:, columns[col]] = chunk[col].to_numpy()
+
+            for col, i in columns.items():
+                missing = np.isnan(X[:, i])
+                if missing.any():
+                    X[missing, i] = fill_values[col]
+            X[:, columns['is_near_mrt']] = X[:, columns['min_dist_mrt']] < fill_values['min_dist_mrt']
+
+            yield index, X, chunk['resale_price'].to_numpy()
+
+    @staticmethod
+    def _map_categories(series, func, missing):
+        """Apply func to each category of a categorical series and broadcast by code."""
+        codes = series.cat.codes.to_numpy()
+        if len(series.cat.categories) == 0:
+            return np.full(len(series), missing, dtype=np.float32)
+        lookup = np.array([func(value) for value in series.cat.categories], dtype=np.float32)
+        return np.where(codes >= 0, lookup[codes], missing)
+
+    @staticmethod
+    def _reservoir_update(reservoirs, arrays, seen, rng):
+        """
+        Vectorized reservoir sampling (Algorithm R) over one chunk.
+
+        Args:
+            reservoirs: preallocated arrays sharing their first dimension
+            arrays: chunk arrays aligned with `reservoirs`
+            seen: rows seen before this chunk
+            rng: numpy random generator
+
+        Returns:
+            int: rows seen including this chunk
+        """
+        size = len(reservoirs[0])
+        n_rows = len(arrays[0])
+        fill = max(0, min(size - seen, n_rows))
+        for reservoir, array in zip(reservoirs, arrays):
+            reservoir[seen:seen + fill] = array[:fill]
+
+        # Row number i replaces a random slot with probability size / (i + 1)
+        positions = np.arange(seen + fill, seen + n_rows)
+        slots = rng.integers(0, positions + 1)
+        accepted = slots < size
+        for reservoir, array in zip(reservoirs, arrays):
+            reservoir[slots[accepted]] = array[fill:][accepted]
+        return seen + n_rows
+
+    @staticmethod
+    def _holdout_mask(chunk_index, n_rows, test_size=0.2):
+        """Deterministic per-chunk test split, identical on every pass."""
+        return np.random.default_rng([42, chunk_index]).random(n_rows) < test_size
+
+    def tune(self, X, y, search='halving', n_iter=20, cv=3):
+        """
+        Search forest and gradient-boosting hyperparameters in parallel.
+
+        Every candidate is fitted on the same train split used by `train`,
+        its cross-validated score and fit time are written to the training
+        log, and the family with the best cross-validated score becomes
+        `self.model`. The held-out test split is only used for the final
+        report, so the reported metrics are not biased by the selection.
+
+        Args:
+            X: preprocessed features
+            y: target variable
+            search: 'halving' for successive halving, 'random' for a plain
+                randomized search
+            n_iter: number of candidates sampled per model family
+            cv: number of cross-validation folds
+
+        Returns:
+            self: tuned model instance
+        """
+        logger.info(f"Starting {search} hyperparameter search...")
+        try:
+            X_train_scaled, X_test_scaled, y_train, y_test = self._split_and_scale(X, y)
+
+            best_score = -np.inf
+            for family, (estimator, params) in SEARCH_SPACES.items():
+                if search == 'halving':
+                    # Poor configurations are dropped after being fitted on a
+                    # small sample, only the survivors see the full training set
+                    searcher = HalvingRandomSearchCV(
+                        estimator, params, n_candidates=n_iter, factor=3,
+                        resource='n_samples', min_resources='exhaust',
+                        scoring='r2', cv=cv, random_state=42, n_jobs=-1
+                    )
+                elif search == 'random':
+                    searcher = RandomizedSearchCV(
+                        estimator, params, n_iter=n_iter, scoring='r2',
+                        cv=cv, random_state=42, n_jobs=-1
+                    )
+                else:
+                    raise ValueError(f"Unknown search strategy: {search}")
+
+                searcher.fit(X_train_scaled, y_train)
+                self._log_search_trials(family, searcher.cv_results_)
+
+                logger.info(f"Best {family}: {searcher.best_params_} "
+                            f"(CV R-squared: {searcher.best_score_:.4f})")
+                if searcher.best_score_ > best_score:
+                    best_score = searcher.best_score_
+                    self.model = searcher.best_estimator_
+
+            logger.info(f"Selected model: {type(self.model).__name__}")
+            self._evaluate_model(y_test, self.model.predict(X_test_scaled))
+            self._print_feature_importance()
+
+            logger.info("Hyperparameter search completed successfully")
+            return self
+
+        except Exception as e:
+            logger.error(f"Error in hyperparameter search: {str(e)}")
+            raise
+
+    def _split_and_scale(self, X, y):
+        """Split the data and fit the feature scaler on the training part."""
+        X_train, X_test, y_train, y_test = train_test_split(
+            X, y, test_size=0.2, random_state=42
+        )
+
+        # Scale features
+        self.scaler = StandardScaler()
+        X_train_scaled = self.scaler.fit_transform(X_train)
+        X_test_scaled = self.scaler.transform(X_test)
+        return X_train_scaled, X_test_scaled, y_train, y_test
+
+    def _log_search_trials(self, family, cv_results):
+        """Write metrics and fit time of every search trial to the log."""
+        iterations = cv_results.get('iter', [0] * len(cv_results['params']))
+        resources = cv_results.get('n_resources', [None] * len(cv_results['params']))
+        for params, score, std, fit_time, iteration, n_resources in zip(
+            cv_results['params'], cv_results['mean_test_score'],
+            cv_results['std_test_score'], cv_results['mean_fit_time'],
+            iterations, resources
+        ):
+            sample_info = f", samples: {n_resources}" if n_resources is not None else ""
+            logger.info(f"Trial [{family}] iter {iteration}{sample_info} - "
+                        f"R-squared: {score:.4f} (+/- {std:.4f}), "
+                        f"fit time: {fit_time:.2f}s, params: {params}")
+
     def _evaluate_model(self, y_true, y_pred):
         """Calculate and log model performance metrics."""
         mse = mean_squared_error(y_true, y_pred)
@@ -247,6 +635,7 @@ class PropertyPriceModel:
             model_path = output_dir / f'{filepath_prefix}.pkl'
             scaler_path = output_dir / f'{filepath_prefix}_scaler.pkl'
             encoders_path = output_dir / f'{filepath_prefix}_encoders.pkl'
+            fill_values_path = output_dir / f'{filepath_prefix}_fill_values.json'
             
             with open(model_path, 'wb') as f:
                 pickle.dump(self.model, f)
@@ -257,14 +646,86 @@ class PropertyPriceModel:
             with open(encoders_path, 'wb') as f:
                 pickle.dump(self.label_encoders, f)
 
+            with open(fill_values_path, 'w') as f:
+                json.dump(self.fill_values, f, indent=2)
+
+            # A compact export of the previous model would otherwise be served
+            # with the new scaler and encoders; export_compact writes a fresh one
+            compact_dir = output_dir / f'{filepath_prefix}_compact'
+            if compact_dir.exists():
+                shutil.rmtree(compact_dir)
+                logger.info(f"Removed stale compact model {compact_dir}")
+
             logger.info(f"Model and preprocessing objects saved successfully in {output_dir}")
 
         except Exception as e:
             logger.error(f"Error saving model: {str(e)}")
             raise
 
+    def export_compact(self, X_check=None, filepath_prefix='model', atol=1e-3):
+        """
+        Save the trained model as memory-mappable node tables.
+
+        Args:
+            X_check: optional preprocessed (unscaled) sample used to verify
+                that the compact model matches `model.predict`
+            filepath_prefix: prefix for the compact model directory
+            atol: largest absolute prediction difference accepted
+        """
+        logger.info("Exporting compact model...")
+        try:
+            X_check_scaled = self.scaler.transform(X_check) if X_check is not None else None
+            export_forest(
+                self.model,
+                Path('models') / f'{filepath_prefix}_compact',
+                X_check=X_check_scaled,
+                atol=atol
+            )
+        except Exception as e:
+            logger.error(f"Error exporting compact model: {str(e)}")
+            raise
+
+def parse_args():
+    """Parse command line options for the training pipeline."""
+    parser = argparse.ArgumentParser(description="Train the HDB resale price model.")
+    parser.add_argument(
+        '--tune', choices=['halving', 'random'],
+        help="Run a hyperparameter search instead of the fixed configuration"
+    )
+    parser.add_argument(
+        '--n-iter', type=int, default=20,
+        help="Candidates sampled per model family when tuning"
+    )
+    parser.add_argument(
+        '--export-compact', action='store_true',
+        help="Also write the model as memory-mappable node tables"
+    )
+    parser.add_argument(
+        '--mode', choices=['memory', 'reservoir', 'sgd'], default='memory',
+        help="memory: load the whole CSV; reservoir/sgd: stream it in chunks"
+    )
+    parser.add_argument(
+        '--chunksize', type=int, default=50_000,
+        help="Rows per chunk in streaming modes"
+    )
+    parser.add_argument(
+        '--sample-size', type=int, default=200_000,
+        help="Reservoir sample size in reservoir mode"
+    )
+    parser.add_argument(
+        '--epochs', type=int, default=5,
+        help="Passes over the data in sgd mode"
+    )
+    args = parser.parse_args()
+    if args.tune and args.mode != 'memory':
+        parser.error("--tune is only supported with --mode memory")
+    if args.export_compact and args.mode == 'sgd':
+        parser.error("--export-compact needs a tree model and is not supported with --mode sgd")
+    return args
+
 def main():
     """Main function to run the training pipeline."""
+    args = parse_args()
     logger.info("Starting the training pipeline...")
     
     try:
@@ -273,15 +734,33 @@ def main():
         if not data_path.exists():
             raise FileNotFoundError(f"Data file not found: {data_path}")
             
-        df = pd.read_csv(data_path)
-        logger.info(f"Data loaded successfully. Shape: {df.shape}")
-        
-        # Initialize and train model
         model = PropertyPriceModel()
-        X, y = model.preprocess_data(df)
-        model.train(X, y)
-        model.save_model()
-        
+        if args.mode == 'memory':
+            df = pd.read_csv(data_path)
+            logger.info(f"Data loaded successfully. Shape: {df.shape}")
+
+            # Initialize and train model
+            X, y = model.preprocess_data(df)
+            if args.tune:
+                model.tune(X, y, search=args.tune, n_iter=args.n_iter)
+            else:
+                model.train(X, y)
+            model.save_model()
+            if args.export_compact:
+                model.export_compact(X.sample(n=min(len(X), 5000), random_state=42))
+        else:
+            model.train_streaming(
+                data_path, mode=args.mode, chunksize=args.chunksize,
+                sample_size=args.sample_size, epochs=args.epochs
+            )
+            model.save_model()
+            if args.export_compact:
+                sample = model.reservoir_sample
+                model.export_compact(sample.sample(n=min(len(sample), 5000), random_state=42))
+
+        peak = peak_rss_mb()
+        if peak is not None:
+            logger.info(f"Peak RSS ({args.mode} mode): {peak:,.1f} MB")
         logger.info("Training pipeline completed successfully")
     
     except Exception as e: